@@ -93,6 +93,8 @@ LOCAL_APPS = [
     "gouthelper_ninja.medhistorys",
     "gouthelper_ninja.goutdetails",
     "gouthelper_ninja.ults",
+    "gouthelper_ninja.exports",
+    "gouthelper_ninja.benchmarks",
     "gouthelper_ninja.utils.apps.UtilsConfig",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -107,7 +109,7 @@ MIGRATION_MODULES = {"sites": "gouthelper_ninja.contrib.sites.migrations"}
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
 AUTHENTICATION_BACKENDS = [
-    "rules.permissions.ObjectPermissionBackend",
+    "gouthelper_ninja.utils.permissions.CachedObjectPermissionBackend",
     "django.contrib.auth.backends.ModelBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
 ]
@@ -148,6 +150,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "gouthelper_ninja.utils.identitymap.IdentityMapMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -295,3 +298,12 @@ SOCIALACCOUNT_FORMS = {"signup": "gouthelper_ninja.users.forms.UserSocialSignupF
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Seconds to cache rules permission results in the default cache, in addition
+# to the request-scoped cache. 0 caches them only for the request.
+PERMISSION_CACHE_TIMEOUT = env.int("DJANGO_PERMISSION_CACHE_TIMEOUT", default=0)
+# Seconds to cache each Patient's serialized PatientSchema in the default
+# cache. 0 disables the cache.
+PATIENT_SCHEMA_CACHE_TIMEOUT = env.int("DJANGO_PATIENT_SCHEMA_CACHE_TIMEOUT", default=0)
+# Queue that delivers ExportJobs to the run_export_worker command: "redis" uses
+# REDIS_URL, "local" runs each job in-process as soon as it is created.
+EXPORT_QUEUE = env("DJANGO_EXPORT_QUEUE", default="local")
@@ -38,6 +38,12 @@ CACHES = {
     },
 }
 
+# Cache each Patient's serialized PatientSchema in Redis for an hour
+PATIENT_SCHEMA_CACHE_TIMEOUT = env.int(
+    "DJANGO_PATIENT_SCHEMA_CACHE_TIMEOUT",
+    default=60 * 60,
+)
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -214,3 +220,5 @@ sentry_sdk.init(
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Deliver ExportJobs to the exportworker service through Redis
+EXPORT_QUEUE = env("DJANGO_EXPORT_QUEUE", default="redis")
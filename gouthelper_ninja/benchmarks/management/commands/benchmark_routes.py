@@ -0,0 +1,164 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from gouthelper_ninja.benchmarks.routes import ROUTES
+from gouthelper_ninja.benchmarks.runner import BENCHMARK_ITERATIONS
+from gouthelper_ninja.benchmarks.runner import BENCHMARK_PANEL_SIZE
+from gouthelper_ninja.benchmarks.runner import BENCHMARK_SEED
+from gouthelper_ninja.benchmarks.runner import BENCHMARK_SIZES
+from gouthelper_ninja.benchmarks.runner import REGRESSION_THRESHOLD
+from gouthelper_ninja.benchmarks.runner import check_results
+from gouthelper_ninja.benchmarks.runner import load_results
+from gouthelper_ninja.benchmarks.runner import run_benchmarks
+from gouthelper_ninja.benchmarks.runner import write_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every API route and view against generated datasets, "
+        "record their latency, queries, rows read, and memory in a JSON "
+        "baseline, and fail if a route exceeds its query budget or regresses "
+        "from the baseline. The datasets are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=BENCHMARK_SIZES,
+            help="Numbers of Patients in the datasets.",
+        )
+        parser.add_argument(
+            "--panel-size",
+            type=int,
+            default=BENCHMARK_PANEL_SIZE,
+            help="Number of Patients per Provider. Sizes must be multiples of it.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=BENCHMARK_ITERATIONS,
+            help="Number of times to request each route.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=BENCHMARK_SEED,
+            help="Seed for generating the datasets.",
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            dest="routes",
+            help="URL name of a route to benchmark. Can be repeated. "
+            "Benchmarks every route if omitted.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=settings.BASE_DIR / "benchmarks.json",
+            help="JSON file to compare the results with, which is written if "
+            "it doesn't exist.",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write the results to the baseline instead of comparing.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=REGRESSION_THRESHOLD,
+            help="Fraction by which latency, rows, or memory may exceed the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        panel_size = options["panel_size"]
+        if panel_size < 1 or options["iterations"] < 1:
+            msg = "--panel-size and --iterations must be positive."
+            raise CommandError(msg)
+        if any(size < 1 or size % panel_size for size in options["sizes"]):
+            msg = f"--sizes must be positive multiples of {panel_size}."
+            raise CommandError(msg)
+        routes = self._get_routes(options["routes"])
+        meta = {
+            "panel_size": panel_size,
+            "iterations": options["iterations"],
+            "seed": options["seed"],
+        }
+        baseline_path = options["baseline"]
+        baseline_meta, baseline = (
+            load_results(baseline_path) if baseline_path.exists() else ({}, {})
+        )
+        compare = bool(baseline) and not options["update_baseline"]
+        if compare and baseline_meta != meta:
+            msg = (
+                f"The baseline was recorded with {baseline_meta}, not {meta}. "
+                "Use --update-baseline to replace it."
+            )
+            raise CommandError(msg)
+
+        results = run_benchmarks(
+            sizes=options["sizes"],
+            panel_size=panel_size,
+            iterations=options["iterations"],
+            seed=options["seed"],
+            routes=routes,
+        )
+        self._write_results(results, routes)
+        failures = check_results(
+            results,
+            baseline=baseline if compare else None,
+            threshold=options["threshold"],
+            routes=routes,
+        )
+        if failures:
+            for failure in failures:
+                self.stderr.write(failure)
+            msg = f"{len(failures)} benchmark failures."
+            raise CommandError(msg)
+        if compare:
+            self.stdout.write(
+                self.style.SUCCESS(f"No regressions from {baseline_path}."),
+            )
+            return
+        # Keep the baseline of routes and sizes that weren't benchmarked,
+        # unless it was recorded with other options
+        if baseline_meta != meta:
+            baseline = {}
+        for size, measurements in results.items():
+            baseline.setdefault(size, {}).update(measurements)
+        write_results(baseline_path, baseline, **meta)
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote the baseline to {baseline_path}."),
+        )
+
+    def _get_routes(self, names):
+        if not names:
+            routes = ROUTES
+        else:
+            routes = [route for route in ROUTES if route.name in names]
+            if len(routes) != len(set(names)):
+                msg = "Unknown route. Routes are identified by their URL name."
+                raise CommandError(msg)
+        for route in routes:
+            if route.skip:
+                self.stderr.write(f"Skipping {route.name}: {route.skip}")
+        return routes
+
+    def _write_results(self, results, routes):
+        budgets = {route.name: route.max_queries for route in routes}
+        for size, measurements in results.items():
+            self.stdout.write(f"{size} patients")
+            for name, measurement in measurements.items():
+                self.stdout.write(
+                    f"  {name:<45} p50 {measurement.p50_ms:>9.2f}ms  "
+                    f"p95 {measurement.p95_ms:>9.2f}ms  "
+                    f"queries {measurement.queries:>3}/{budgets[name]:<3}  "
+                    f"rows {measurement.rows:>8}  "
+                    f"memory {measurement.memory_kb:>7}KB",
+                )
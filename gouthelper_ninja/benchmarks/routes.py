@@ -0,0 +1,359 @@
+"""Declarations of the routes that the benchmark_routes command measures:
+every django-ninja operation in config.api and every view in the users,
+medhistorys, goutdetails, dateofbirths, genders, and ethnicitys URLconfs.
+Each Route declares its query budget, the most queries it may make with a
+dataset of any size, and builds its URL kwargs and request data from a
+BenchmarkContext of objects in the dataset."""
+
+import json
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db.models import Exists
+from django.db.models import OuterRef
+
+from config.api import api
+from gouthelper_ninja.exports.jobs import run_export_job
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.users.querysets import patient_qs
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from gouthelper_ninja.exports.models import ExportJob
+    from gouthelper_ninja.users.models import Patient
+    from gouthelper_ninja.users.models import User
+
+API_NAMESPACE = api.urls_namespace
+
+# Namespaces of the URLconfs whose views are benchmarked
+VIEW_NAMESPACES = [
+    "users",
+    "medhistorys",
+    "goutdetails",
+    "dateofbirths",
+    "genders",
+    "ethnicitys",
+]
+
+# Number of Patients per page in the get_patients request
+PATIENTS_PAGE_SIZE = 100
+
+# Number of records in the import_provider_patients request body
+IMPORT_SIZE = 10
+
+# Number of values in the stage_batch request body
+STAGE_BATCH_SIZE = 100
+
+
+class BenchmarkContext(NamedTuple):
+    """Objects in the dataset that the routes are requested for. provider is
+    logged in for every request. patient is one of the provider's Patients,
+    a male with CKD who isn't on dialysis, so that it has every related
+    model and can be updated without changing its menopause requirements.
+    patient_without_ckddetail is another of the provider's Patients, which
+    has no CkdDetail. export_job is a COMPLETE ExportJob of the provider's
+    panel. mhtype is an MHType that patient has no MedHistory of."""
+
+    provider: "User"
+    patient: "Patient"
+    patient_without_ckddetail: "Patient"
+    export_job: "ExportJob"
+    mhtype: MHTypes
+
+
+class Route(NamedTuple):
+    """A route to benchmark, identified by its URL name. kwargs and data
+    build the URL kwargs and the query parameters or body of the request.
+    Routes that can't be requested yet are declared with the reason in skip,
+    so that every route is accounted for."""
+
+    name: str
+    max_queries: int
+    method: str = "GET"
+    kwargs: Callable[[BenchmarkContext], dict[str, Any]] | None = None
+    data: Callable[[BenchmarkContext], Any] | None = None
+    content_type: str = "application/json"
+    status: int = HTTPStatus.OK
+    skip: str = ""
+
+
+def get_benchmark_context(provider_id: "UUID") -> BenchmarkContext:
+    """Returns the BenchmarkContext for the provider's panel, creating and
+    running an ExportJob for the provider. Raises Patient.DoesNotExist if the panel has
+    no Patient to use as patient or patient_without_ckddetail."""
+
+    patient_model = apps.get_model("users.Patient")
+    ckddetail_model = apps.get_model("ckddetails.CkdDetail")
+    panel = patient_model.objects.filter(
+        patientprofile__provider_id=provider_id,
+    ).order_by("id")
+    patient = (
+        patient_qs(panel)
+        .select_related("goutdetail", "ckddetail", "baselinecreatinine")
+        .filter(
+            gender__gender=Genders.MALE,
+            ckddetail__dialysis=False,
+            baselinecreatinine__isnull=False,
+        )[:1]
+        .get()
+    )
+    patient_without_ckddetail = (
+        patient_qs(panel)
+        .exclude(
+            Exists(ckddetail_model.objects.filter(patient_id=OuterRef("pk"))),
+        )[:1]
+        .get()
+    )
+    mhtypes = set(patient.medhistory_set.values_list("mhtype", flat=True))
+    export_job = apps.get_model("exports.ExportJob").objects.create(
+        provider_id=provider_id,
+    )
+    return BenchmarkContext(
+        provider=patient.patientprofile.provider,
+        patient=patient,
+        patient_without_ckddetail=patient_without_ckddetail,
+        export_job=run_export_job(export_job.id),
+        mhtype=next(mhtype for mhtype in MHTypes if mhtype not in mhtypes),
+    )
+
+
+def get_patient_data(patient: "Patient") -> dict[str, Any]:
+    """Returns PatientEditSchema data that leaves the Patient unchanged."""
+
+    return {
+        "dateofbirth": {"dateofbirth": patient.dateofbirth.dateofbirth},
+        "ethnicity": {"ethnicity": patient.ethnicity.ethnicity},
+        "gender": {"gender": patient.gender.gender},
+        "gout": {"history_of": True},
+        "goutdetail": {
+            "at_goal": patient.goutdetail.at_goal,
+            "at_goal_long_term": patient.goutdetail.at_goal_long_term,
+            "flaring": patient.goutdetail.flaring,
+            "on_ppx": patient.goutdetail.on_ppx,
+            "on_ult": patient.goutdetail.on_ult,
+            "starting_ult": patient.goutdetail.starting_ult,
+        },
+    }
+
+
+def get_ckddetail_data(patient: "Patient") -> dict[str, Any]:
+    """Returns CkdDetailEditSchema data that leaves the Patient's CkdDetail
+    and BaselineCreatinine unchanged."""
+
+    return {
+        "stage": patient.ckddetail.stage,
+        "dateofbirth": {"dateofbirth": patient.dateofbirth.dateofbirth},
+        "gender": {"gender": patient.gender.gender},
+        "baselinecreatinine": {"value": patient.baselinecreatinine.value},
+    }
+
+
+def get_import_data(patient: "Patient") -> str:
+    """Returns an NDJSON body of IMPORT_SIZE copies of the Patient."""
+
+    line = json.dumps(
+        get_patient_data(patient),
+        default=str,
+    )
+    return "\n".join([line] * IMPORT_SIZE)
+
+
+def _patient(context: BenchmarkContext) -> dict[str, Any]:
+    return {"patient": context.patient.id}
+
+
+def _patient_id(context: BenchmarkContext) -> dict[str, Any]:
+    return {"patient_id": context.patient.id}
+
+
+def _provider_id(context: BenchmarkContext) -> dict[str, Any]:
+    return {"provider_id": context.provider.id}
+
+
+ROUTES = [
+    # config.api
+    Route(
+        name=f"{API_NAMESPACE}:create_ckddetail",
+        max_queries=8,
+        method="POST",
+        kwargs=lambda context: {"patient_id": context.patient_without_ckddetail.id},
+        data=lambda context: {
+            "dialysis": True,
+            "dialysis_duration": 1,
+            "dialysis_type": 1,
+            "stage": 5,
+        },
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:update_ckddetail",
+        max_queries=5,
+        method="POST",
+        kwargs=lambda context: {"ckddetail_id": context.patient.ckddetail.id},
+        data=lambda context: get_ckddetail_data(context.patient),
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:stage_batch",
+        max_queries=4,
+        method="POST",
+        data=lambda context: {
+            "creatinines": [
+                round(0.5 + 4.5 * i / STAGE_BATCH_SIZE, 2)
+                for i in range(STAGE_BATCH_SIZE)
+            ],
+            "ages": [18 + i % 80 for i in range(STAGE_BATCH_SIZE)],
+            "genders": [i % 2 for i in range(STAGE_BATCH_SIZE)],
+        },
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:update_dateofbirth",
+        max_queries=5,
+        method="POST",
+        kwargs=lambda context: {"dateofbirth_id": context.patient.dateofbirth.id},
+        data=lambda context: {"dateofbirth": context.patient.dateofbirth.dateofbirth},
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:update_ethnicity",
+        max_queries=5,
+        method="POST",
+        kwargs=lambda context: {"ethnicity_id": context.patient.ethnicity.id},
+        data=lambda context: {"ethnicity": context.patient.ethnicity.ethnicity},
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:create_export_job",
+        max_queries=5,
+        method="POST",
+        status=HTTPStatus.ACCEPTED,
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:get_export_job",
+        max_queries=5,
+        kwargs=lambda context: {"job_id": context.export_job.id},
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:retry_export_job",
+        max_queries=6,
+        method="POST",
+        kwargs=lambda context: {"job_id": context.export_job.id},
+        status=HTTPStatus.CONFLICT,
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:get_export_file",
+        max_queries=5,
+        kwargs=lambda context: {"job_id": context.export_job.id, "index": 0},
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:update_gender",
+        max_queries=5,
+        method="POST",
+        kwargs=lambda context: {"gender_id": context.patient.gender.id},
+        data=lambda context: {"gender": context.patient.gender.gender},
+    ),
+    # The paginated mode, because the bare list grows with the panel
+    Route(
+        name=f"{API_NAMESPACE}:get_patients",
+        max_queries=6,
+        data=lambda context: {"page_size": PATIENTS_PAGE_SIZE},
+    ),
+    Route(name=f"{API_NAMESPACE}:get_patient_changes", max_queries=6),
+    Route(
+        name=f"{API_NAMESPACE}:export_provider_patients",
+        max_queries=5,
+        data=lambda context: {"format": "ndjson"},
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:create_patient",
+        max_queries=21,
+        method="POST",
+        data=lambda context: get_patient_data(context.patient),
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:create_provider_patient",
+        max_queries=23,
+        method="POST",
+        kwargs=_provider_id,
+        data=lambda context: get_patient_data(context.patient),
+    ),
+    Route(
+        name=f"{API_NAMESPACE}:import_provider_patients",
+        max_queries=24,
+        method="POST",
+        kwargs=_provider_id,
+        data=lambda context: get_import_data(context.patient),
+        content_type="application/x-ndjson",
+    ),
+    Route(name=f"{API_NAMESPACE}:get_patient", max_queries=6, kwargs=_patient_id),
+    Route(
+        name=f"{API_NAMESPACE}:update_patient",
+        max_queries=7,
+        method="POST",
+        kwargs=_patient_id,
+        data=lambda context: get_patient_data(context.patient),
+    ),
+    # users
+    Route(name="users:patient-create", max_queries=4),
+    Route(
+        name="users:provider-patient-create",
+        max_queries=5,
+        kwargs=lambda context: {"provider": context.provider.username},
+    ),
+    Route(
+        name="users:patient-detail",
+        max_queries=6,
+        kwargs=_patient,
+        skip="The users/patient_detail.html template doesn't exist.",
+    ),
+    Route(name="users:patient-update", max_queries=6, kwargs=_patient),
+    Route(name="users:patient-delete", max_queries=5, kwargs=_patient),
+    Route(name="users:delete", max_queries=4),
+    Route(name="users:redirect", max_queries=4, status=HTTPStatus.FOUND),
+    Route(name="users:update", max_queries=4),
+    Route(
+        name="users:detail",
+        max_queries=6,
+        kwargs=lambda context: {"username": context.provider.username},
+    ),
+    # medhistorys
+    Route(
+        name="medhistorys:create",
+        max_queries=6,
+        kwargs=lambda context: {
+            "patient": context.patient.id,
+            "mhtype": context.mhtype,
+        },
+    ),
+    Route(
+        name="medhistorys:update",
+        max_queries=6,
+        kwargs=lambda context: {"pk": context.patient.gout.id},
+    ),
+    # goutdetails
+    Route(
+        name="goutdetails:update",
+        max_queries=6,
+        kwargs=lambda context: {"pk": context.patient.goutdetail.id},
+    ),
+    # dateofbirths
+    Route(
+        name="dateofbirths:update",
+        max_queries=6,
+        kwargs=lambda context: {"pk": context.patient.dateofbirth.id},
+    ),
+    # genders
+    Route(
+        name="genders:update",
+        max_queries=6,
+        kwargs=lambda context: {"pk": context.patient.gender.id},
+    ),
+    # ethnicitys
+    Route(
+        name="ethnicitys:update",
+        max_queries=6,
+        kwargs=lambda context: {"pk": context.patient.ethnicity.id},
+    ),
+]
@@ -0,0 +1,341 @@
+"""Runs the ROUTES against generated datasets and compares the results with
+a baseline. Datasets are generated with users.cohorts.generate_cohort, so
+every run with the same seed measures the same Patients, and the whole run
+is rolled back, so it can be pointed at any database. Files, such as those
+of ExportJobs, are written to a temporary directory that is removed
+afterwards, instead of the default storage. Each request is made
+in a savepoint that is rolled back too, so that every iteration of a route
+that writes does the same work.
+
+For each route and dataset size, a Measurement records the p50 and p95
+latency, the number of queries, the number of table rows the database read
+to answer them, from pg_stat_xact_user_tables, and the peak memory Python
+allocated while handling the request. Latency excludes the savepoint's
+rollback, and memory is measured in a separate request, because tracing
+allocations slows everything down."""
+
+import json
+import logging
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.test import Client
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gouthelper_ninja.benchmarks.routes import ROUTES
+from gouthelper_ninja.benchmarks.routes import BenchmarkContext
+from gouthelper_ninja.benchmarks.routes import Route
+from gouthelper_ninja.benchmarks.routes import get_benchmark_context
+from gouthelper_ninja.users.cohorts import generate_cohort
+from gouthelper_ninja.users.loaders import copy_models
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from django.db.models import Model
+    from django.http import HttpResponse
+
+BENCHMARK_SIZES = [1_000, 10_000, 100_000]
+BENCHMARK_PANEL_SIZE = 1_000
+BENCHMARK_ITERATIONS = 20
+BENCHMARK_SEED = 0
+
+# A route regresses if its latency, rows, or memory exceed the baseline's by
+# more than this fraction, or if it makes more queries than the baseline
+REGRESSION_THRESHOLD = 0.25
+
+# Latencies that regress by less than this many milliseconds are noise
+MIN_LATENCY_REGRESSION_MS = 1.0
+
+logger = logging.getLogger(__name__)
+
+ROWS_READ_SQL = (
+    "SELECT COALESCE(SUM(seq_tup_read + COALESCE(idx_tup_fetch, 0)), 0) "
+    "FROM pg_stat_xact_user_tables"
+)
+
+
+class BenchmarkError(Exception):
+    """Raised if a route doesn't respond with its expected status."""
+
+
+class Measurement(NamedTuple):
+    p50_ms: float
+    p95_ms: float
+    queries: int
+    rows: int
+    memory_kb: int
+
+
+def generate_dataset(
+    patients: int,
+    panel_size: int,
+    seed: int | None,
+) -> list["UUID"]:
+    """Writes a cohort of patients Patients, in panels of panel_size, and
+    returns the ids of their Providers."""
+
+    provider_ids = []
+
+    def batches() -> Iterator[dict[type["Model"], list["Model"]]]:
+        cohort = generate_cohort(
+            providers=patients // panel_size,
+            patients_per_provider=panel_size,
+            seed=seed,
+        )
+        providers = next(cohort)
+        provider_ids.extend(provider.id for provider in next(iter(providers.values())))
+        yield providers
+        yield from cohort
+
+    copy_models(batches())
+    # Update the planner's statistics, so that the routes' queries are
+    # planned as they would be for tables of this size
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return provider_ids
+
+
+def get_rows_read() -> int:
+    """Returns the number of table rows read in the current transaction."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(ROWS_READ_SQL)
+        return int(cursor.fetchone()[0])
+
+
+def request_route(
+    client: Client,
+    route: Route,
+    context: BenchmarkContext,
+) -> "HttpResponse":
+    """Requests the route, consuming the response if it's streamed, and
+    raises BenchmarkError if its status isn't the route's status."""
+
+    path = reverse(
+        route.name,
+        kwargs=route.kwargs(context) if route.kwargs else None,
+    )
+    data = route.data(context) if route.data else None
+    if route.method == "GET":
+        response = client.get(path, data)
+    else:
+        response = getattr(client, route.method.lower())(
+            path,
+            data,
+            content_type=route.content_type,
+        )
+    if response.streaming:
+        b"".join(response.streaming_content)
+    if response.status_code != route.status:
+        msg = (
+            f"{route.method} {path} responded with {response.status_code}, "
+            f"not {route.status}."
+        )
+        raise BenchmarkError(msg)
+    return response
+
+
+def rolled_back(func: Callable[[], Any]) -> Any:
+    """Calls func in a savepoint that is rolled back, and returns its result."""
+
+    with transaction.atomic():
+        result = func()
+        transaction.set_rollback(True)
+    return result
+
+
+def measure_route(
+    client: Client,
+    route: Route,
+    context: BenchmarkContext,
+    iterations: int,
+) -> Measurement:
+    """Requests the route once to warm up caches, iterations times to measure
+    latency, queries, and rows, and once more to measure memory. Queries and
+    rows are the most of any iteration."""
+
+    def timed() -> tuple[float, int, int]:
+        rows = get_rows_read()
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            request_route(client, route, context)
+            elapsed = perf_counter() - start
+        return elapsed, len(queries), get_rows_read() - rows
+
+    def traced() -> int:
+        tracemalloc.start()
+        try:
+            request_route(client, route, context)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    rolled_back(lambda: request_route(client, route, context))
+    times, queries, rows = zip(
+        *(rolled_back(timed) for _ in range(iterations)),
+        strict=True,
+    )
+    p50, p95 = np.percentile(times, [50, 95]) * 1000
+    return Measurement(
+        p50_ms=round(float(p50), 3),
+        p95_ms=round(float(p95), 3),
+        queries=max(queries),
+        rows=max(rows),
+        memory_kb=rolled_back(traced) // 1024,
+    )
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = BENCHMARK_SIZES,
+    panel_size: int = BENCHMARK_PANEL_SIZE,
+    iterations: int = BENCHMARK_ITERATIONS,
+    seed: int | None = BENCHMARK_SEED,
+    routes: Iterable[Route] = ROUTES,
+) -> dict[str, dict[str, Measurement]]:
+    """Measures the routes with datasets of each size, which must be
+    multiples of panel_size, and returns the Measurements by size and route
+    name. Each dataset adds Patients to the previous one, and the routes are
+    requested by the first Provider, whose panel stays the same size, so that
+    the results show how each route scales with the size of the tables. The
+    datasets are rolled back, and the files the routes write are removed,
+    afterwards."""
+
+    results: dict[str, dict[str, Measurement]] = {}
+    client = Client()
+    with (
+        tempfile.TemporaryDirectory() as media_root,
+        override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            MEDIA_ROOT=media_root,
+            STORAGES={
+                **settings.STORAGES,
+                "default": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                },
+            },
+        ),
+        transaction.atomic(),
+    ):
+        patients = 0
+        context = None
+        for size in sorted(sizes):
+            logger.info("Generating %s patients.", size - patients)
+            provider_ids = generate_dataset(
+                size - patients,
+                panel_size,
+                seed=None if seed is None else seed + size,
+            )
+            patients = size
+            if context is None:
+                context = get_benchmark_context(provider_ids[0])
+                client.force_login(context.provider)
+            results[str(size)] = {}
+            for route in routes:
+                if route.skip:
+                    continue
+                measurement = measure_route(client, route, context, iterations)
+                logger.info("%s %s: %s", size, route.name, measurement)
+                results[str(size)][route.name] = measurement
+        transaction.set_rollback(True)
+    return results
+
+
+def check_results(
+    results: dict[str, dict[str, Measurement]],
+    baseline: dict[str, dict[str, Measurement]] | None = None,
+    threshold: float = REGRESSION_THRESHOLD,
+    routes: Iterable[Route] = ROUTES,
+) -> list[str]:
+    """Returns a message for each route that made more queries than its
+    max_queries, and, if there's a baseline, for each that regressed from
+    its baseline Measurement at the same size."""
+
+    budgets = {route.name: route.max_queries for route in routes}
+    failures = []
+    for size, measurements in results.items():
+        for name, measurement in measurements.items():
+            if measurement.queries > budgets[name]:
+                failures.append(
+                    f"{size} {name}: {measurement.queries} queries exceeds the "
+                    f"budget of {budgets[name]}.",
+                )
+            previous = (baseline or {}).get(size, {}).get(name)
+            if previous is None:
+                continue
+            if measurement.queries > previous.queries:
+                failures.append(
+                    f"{size} {name}: {measurement.queries} queries, up from "
+                    f"{previous.queries}.",
+                )
+            for field in Measurement._fields:
+                value = getattr(measurement, field)
+                limit = getattr(previous, field) * (1 + threshold)
+                if field == "queries" or value <= limit:
+                    continue
+                if (
+                    field.endswith("_ms")
+                    and value - getattr(previous, field) < MIN_LATENCY_REGRESSION_MS
+                ):
+                    continue
+                failures.append(
+                    f"{size} {name}: {field} of {value} regressed more than "
+                    f"{threshold:.0%} from {getattr(previous, field)}.",
+                )
+    return failures
+
+
+def load_results(
+    path: Path,
+) -> tuple[dict[str, Any], dict[str, dict[str, Measurement]]]:
+    """Loads the options and results written by write_results."""
+
+    meta = json.loads(path.read_text())
+    results = meta.pop("results")
+    return meta, {
+        size: {
+            name: Measurement(**measurement)
+            for name, measurement in measurements.items()
+        }
+        for size, measurements in results.items()
+    }
+
+
+def write_results(
+    path: Path,
+    results: dict[str, dict[str, Measurement]],
+    **meta: Any,
+) -> None:
+    """Writes the results, with the options they were measured with, as
+    JSON."""
+
+    path.write_text(
+        json.dumps(
+            {
+                **meta,
+                "results": {
+                    size: {
+                        name: measurement._asdict()
+                        for name, measurement in measurements.items()
+                    }
+                    for size, measurements in results.items()
+                },
+            },
+            indent=2,
+        )
+        + "\n",
+    )
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from gouthelper_ninja.benchmarks.runner import load_results
+
+pytestmark = pytest.mark.django_db
+
+OPTIONS = {
+    "sizes": [50, 100],
+    "panel_size": 50,
+    "iterations": 2,
+    "routes": ["users:update", "api-1.0.0:get_patient"],
+}
+
+
+class TestBenchmarkRoutes:
+    def test__writes_and_compares_baseline(self, tmp_path, capsys):
+        baseline = tmp_path / "benchmarks.json"
+
+        call_command("benchmark_routes", baseline=baseline, **OPTIONS)
+
+        assert "Wrote the baseline" in capsys.readouterr().out
+        meta, results = load_results(baseline)
+        assert meta == {"panel_size": 50, "iterations": 2, "seed": 0}
+        assert set(results) == {"50", "100"}
+        assert set(results["100"]) == set(OPTIONS["routes"])
+
+        call_command("benchmark_routes", baseline=baseline, threshold=100, **OPTIONS)
+
+        assert "No regressions" in capsys.readouterr().out
+
+    def test__fails_on_regression(self, tmp_path, capsys):
+        baseline = tmp_path / "benchmarks.json"
+        call_command("benchmark_routes", baseline=baseline, **OPTIONS)
+        data = json.loads(baseline.read_text())
+        data["results"]["100"]["users:update"]["queries"] -= 1
+        baseline.write_text(json.dumps(data))
+
+        with pytest.raises(CommandError, match="1 benchmark failures"):
+            call_command(
+                "benchmark_routes",
+                baseline=baseline,
+                threshold=100,
+                **OPTIONS,
+            )
+
+        assert "users:update: 4 queries, up from 3" in capsys.readouterr().err
+
+    def test__update_baseline_keeps_other_routes(self, tmp_path):
+        baseline = tmp_path / "benchmarks.json"
+        call_command("benchmark_routes", baseline=baseline, **OPTIONS)
+
+        call_command(
+            "benchmark_routes",
+            baseline=baseline,
+            update_baseline=True,
+            **{**OPTIONS, "routes": ["users:redirect"]},
+        )
+
+        assert set(load_results(baseline)[1]["100"]) == {
+            *OPTIONS["routes"],
+            "users:redirect",
+        }
+
+    def test__baseline_with_other_options(self, tmp_path):
+        baseline = tmp_path / "benchmarks.json"
+        call_command("benchmark_routes", baseline=baseline, **OPTIONS)
+
+        with pytest.raises(CommandError, match="Use --update-baseline"):
+            call_command(
+                "benchmark_routes",
+                baseline=baseline,
+                **{**OPTIONS, "seed": 1},
+            )
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            ({"sizes": [75]}, "--sizes must be positive multiples of 50"),
+            ({"iterations": 0}, "--iterations must be positive"),
+            ({"routes": ["users:nope"]}, "Unknown route"),
+        ],
+    )
+    def test__invalid_options(self, tmp_path, options, message):
+        with pytest.raises(CommandError, match=message):
+            call_command(
+                "benchmark_routes",
+                baseline=tmp_path / "benchmarks.json",
+                **{**OPTIONS, **options},
+            )
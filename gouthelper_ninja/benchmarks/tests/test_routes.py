@@ -0,0 +1,63 @@
+import pytest
+from django.urls import get_resolver
+
+from gouthelper_ninja.benchmarks.routes import API_NAMESPACE
+from gouthelper_ninja.benchmarks.routes import ROUTES
+from gouthelper_ninja.benchmarks.routes import VIEW_NAMESPACES
+from gouthelper_ninja.benchmarks.routes import get_benchmark_context
+from gouthelper_ninja.benchmarks.runner import check_results
+from gouthelper_ninja.benchmarks.runner import generate_dataset
+from gouthelper_ninja.benchmarks.runner import run_benchmarks
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.medhistorys.choices import MHTypes
+
+pytestmark = pytest.mark.django_db
+
+# URL names that django-ninja adds for the API's docs
+API_DOCS_URL_NAMES = {"api-root", "openapi-json", "openapi-view"}
+
+
+def test__every_route_is_declared():
+    resolver = get_resolver()
+    url_names = {
+        f"{namespace}:{pattern.name}"
+        for namespace in [API_NAMESPACE, *VIEW_NAMESPACES]
+        for pattern in resolver.namespace_dict[namespace][1].url_patterns
+        if not (namespace == API_NAMESPACE and pattern.name in API_DOCS_URL_NAMES)
+    }
+
+    names = [route.name for route in ROUTES]
+    assert len(names) == len(set(names))
+    assert set(names) == url_names
+
+
+def test__get_benchmark_context(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    provider_id = generate_dataset(100, panel_size=100, seed=0)[0]
+
+    context = get_benchmark_context(provider_id)
+
+    assert context.provider.id == provider_id
+    assert context.patient.patientprofile.provider_id == provider_id
+    assert context.patient.gender.gender == Genders.MALE
+    assert not context.patient.ckddetail.dialysis
+    assert context.patient.baselinecreatinine.value
+    assert not hasattr(context.patient_without_ckddetail, "ckddetail")
+    assert context.patient.get_medhistory(context.mhtype) is None
+    assert context.mhtype != MHTypes.GOUT
+    assert context.export_job.provider_id == provider_id
+    assert context.export_job.files
+
+
+def test__routes_are_within_their_query_budgets(settings, tmp_path):
+    """Every route responds with its status, and the number of queries it
+    makes doesn't depend on the size of the dataset, so exceeding a budget
+    here means it would with a dataset of any size."""
+    settings.MEDIA_ROOT = str(tmp_path)
+
+    results = run_benchmarks(sizes=[100], panel_size=100, iterations=1)
+
+    assert set(results["100"]) == {route.name for route in ROUTES if not route.skip}
+    assert check_results(results) == []
+    # The files the routes wrote were removed with the temporary storage
+    assert not any(tmp_path.iterdir())
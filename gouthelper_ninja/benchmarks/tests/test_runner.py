@@ -0,0 +1,77 @@
+from gouthelper_ninja.benchmarks.routes import Route
+from gouthelper_ninja.benchmarks.runner import Measurement
+from gouthelper_ninja.benchmarks.runner import check_results
+from gouthelper_ninja.benchmarks.runner import load_results
+from gouthelper_ninja.benchmarks.runner import write_results
+
+ROUTES = [Route(name="users:update", max_queries=4)]
+
+BASELINE = {
+    "1000": {
+        "users:update": Measurement(
+            p50_ms=10.0,
+            p95_ms=20.0,
+            queries=4,
+            rows=10,
+            memory_kb=100,
+        ),
+    },
+}
+
+
+def get_results(**kwargs) -> dict[str, dict[str, Measurement]]:
+    return {
+        "1000": {"users:update": BASELINE["1000"]["users:update"]._replace(**kwargs)},
+    }
+
+
+class TestCheckResults:
+    def test__no_failures(self):
+        assert check_results(BASELINE, BASELINE, routes=ROUTES) == []
+        assert check_results(BASELINE, routes=ROUTES) == []
+
+    def test__exceeds_budget(self):
+        results = get_results(queries=5)
+
+        assert check_results(results, routes=ROUTES) == [
+            "1000 users:update: 5 queries exceeds the budget of 4.",
+        ]
+
+    def test__more_queries_than_baseline(self):
+        failures = check_results(
+            get_results(queries=4),
+            get_results(queries=3),
+            routes=ROUTES,
+        )
+
+        assert failures == ["1000 users:update: 4 queries, up from 3."]
+
+    def test__regressions(self):
+        results = get_results(p95_ms=30.0, rows=12, memory_kb=126)
+
+        assert check_results(results, BASELINE, threshold=0.25, routes=ROUTES) == [
+            "1000 users:update: p95_ms of 30.0 regressed more than 25% from 20.0.",
+            "1000 users:update: memory_kb of 126 regressed more than 25% from 100.",
+        ]
+
+    def test__latency_noise_is_ignored(self):
+        baseline = {
+            "1000": {
+                "users:update": BASELINE["1000"]["users:update"]._replace(p50_ms=1.0),
+            },
+        }
+
+        assert check_results(get_results(p50_ms=1.9), baseline, routes=ROUTES) == []
+
+    def test__sizes_and_routes_not_in_baseline_are_ignored(self):
+        results = {"10000": get_results(p95_ms=100.0)["1000"]}
+
+        assert check_results(results, BASELINE, routes=ROUTES) == []
+
+
+def test__write_and_load_results(tmp_path):
+    path = tmp_path / "benchmarks.json"
+
+    write_results(path, BASELINE, seed=1)
+
+    assert load_results(path) == ({"seed": 1}, BASELINE)
@@ -1,17 +1,26 @@
 from uuid import UUID
 
+from django.http import HttpResponse
 from ninja import Router
 from ninja.errors import AuthorizationError
 from ninja.errors import HttpError
+from ninja.security import django_auth
 
 from gouthelper_ninja.ckddetails.models import CkdDetail
 from gouthelper_ninja.ckddetails.schema import CkdDetailEditSchema
 from gouthelper_ninja.ckddetails.schema import CkdDetailSchema
+from gouthelper_ninja.ckddetails.schema import StageBatchResultSchema
+from gouthelper_ninja.ckddetails.schema import StageBatchSchema
+from gouthelper_ninja.labs.helpers import batch_egfr_calculator
+from gouthelper_ninja.labs.helpers import batch_stage_calculator
 from gouthelper_ninja.rules import add_object
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.users.querysets import patient_patientprofile_provider_qs
 from gouthelper_ninja.users.querysets import patient_profile_qs
+from gouthelper_ninja.utils.etags import check_if_match
+from gouthelper_ninja.utils.etags import set_etag
+from gouthelper_ninja.utils.permissions import check_predicate
 
 router = Router()
 
@@ -39,7 +48,7 @@ def create_ckddetail(
             status_code=404,
             message=f"Patient with id {patient_id} does not exist.",
         ) from e
-    if not add_object(request.user, patient):
+    if not check_predicate(add_object, request.user, patient):
         msg = (
             f"{request.user} does not have permission to create a "
             "CkdDetail for this patient."
@@ -61,6 +70,7 @@ def update_ckddetail(
     request,
     ckddetail_id: UUID,
     data: CkdDetailEditSchema,
+    response: HttpResponse,
 ) -> CkdDetail:
     try:
         ckddetail: CkdDetail = patient_patientprofile_provider_qs(
@@ -71,11 +81,39 @@ def update_ckddetail(
             status_code=404,
             message=f"CkdDetail with id {ckddetail_id} does not exist.",
         ) from e
-    if not change_object(request.user, ckddetail):
+    if not check_predicate(change_object, request.user, ckddetail):
         msg = f"{request.user} does not have permission to update this CkdDetail."
         raise AuthorizationError(
             403,
             message=msg,
         )
+    check_if_match(request, ckddetail)
     ckddetail.gh_update(data=data)
+    set_etag(response, ckddetail)
     return ckddetail
+
+
+@router.post(
+    "/stage-batch",
+    response={
+        200: StageBatchResultSchema,
+    },
+    auth=[django_auth],
+)
+def stage_batch(
+    request,
+    data: StageBatchSchema,
+) -> StageBatchResultSchema:
+    """
+    Calculate eGFRs and CKD stages for lists of baseline creatinines,
+    ages, and genders in a single vectorized pass.
+    """
+    egfrs = batch_egfr_calculator(
+        creatinines=data.creatinines,
+        ages=data.ages,
+        genders=data.genders,
+    )
+    return StageBatchResultSchema(
+        egfrs=egfrs.tolist(),
+        stages=batch_stage_calculator(egfrs).tolist(),
+    )
@@ -1,7 +1,10 @@
+from decimal import Decimal
+from typing import Annotated
 from typing import Any
 from typing import Self
 
 from ninja import Schema
+from pydantic import Field
 from pydantic import computed_field
 from pydantic import field_validator
 from pydantic import model_serializer
@@ -11,6 +14,7 @@ from gouthelper_ninja.ckddetails.choices import DialysisChoices
 from gouthelper_ninja.ckddetails.choices import DialysisDurations
 from gouthelper_ninja.ckddetails.choices import Stages
 from gouthelper_ninja.dateofbirths.schema import DateOfBirthEditSchema
+from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.genders.schema import GenderEditSchema
 from gouthelper_ninja.labs.helpers import egfr_calculator
 from gouthelper_ninja.labs.helpers import stage_calculator
@@ -182,3 +186,34 @@ class CkdDetailSchema(PatientIdSchema, CkdDetailEditSchema):
             "id": str(self.patient_id),
             "patient_id": str(self.patient_id),
         }
+
+
+# Maximum number of values in each of a StageBatchSchema's lists
+STAGE_BATCH_MAX_LENGTH = 1000
+
+
+class StageBatchSchema(Schema):
+    """Equal-length lists of baseline creatinines, ages, and genders to
+    calculate eGFRs and CKD stages for."""
+
+    creatinines: list[Annotated[Decimal, Field(gt=0)]] = Field(
+        max_length=STAGE_BATCH_MAX_LENGTH,
+    )
+    ages: list[Annotated[int, Field(ge=0)]] = Field(
+        max_length=STAGE_BATCH_MAX_LENGTH,
+    )
+    genders: list[Genders] = Field(max_length=STAGE_BATCH_MAX_LENGTH)
+
+    @model_validator(mode="after")
+    def lengths_match(self) -> Self:
+        if not len(self.creatinines) == len(self.ages) == len(self.genders):
+            msg = "creatinines, ages, and genders must be the same length."
+            raise ValueError(msg)
+        return self
+
+
+class StageBatchResultSchema(Schema):
+    """eGFRs and CKD stages, in the same order as the StageBatchSchema."""
+
+    egfrs: list[int]
+    stages: list[Stages]
@@ -7,6 +7,7 @@ from django.test import TestCase
 from gouthelper_ninja.ckddetails.choices import DialysisChoices
 from gouthelper_ninja.ckddetails.choices import DialysisDurations
 from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.ckddetails.schema import STAGE_BATCH_MAX_LENGTH
 from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.users.tests.factories import PatientFactory
 from gouthelper_ninja.users.tests.factories import UserFactory
@@ -186,3 +187,62 @@ class TestCkdDetailUpdate(TestCase):
             content_type="application/json",
         )
         assert response.status_code == HTTPStatus.OK
+
+
+class TestStageBatch(TestCase):
+    def setUp(self):
+        self.client.force_login(UserFactory())
+
+    def test__stages(self):
+        response = self.client.post(
+            "/api/ckddetails/stage-batch",
+            data={
+                "creatinines": ["1.2", "1.2", "0.8", "4.5"],
+                "ages": [45, 45, 30, 70],
+                "genders": [Genders.MALE, Genders.FEMALE, Genders.MALE, Genders.MALE],
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "egfrs": [76, 57, 122, 13],
+            "stages": [Stages.TWO, Stages.THREE, Stages.ONE, Stages.FIVE],
+        }
+
+    def test__mismatched_lengths(self):
+        response = self.client.post(
+            "/api/ckddetails/stage-batch",
+            data={
+                "creatinines": ["1.2", "1.2"],
+                "ages": [45],
+                "genders": [Genders.MALE, Genders.FEMALE],
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    def test__too_many_values(self):
+        length = STAGE_BATCH_MAX_LENGTH + 1
+        response = self.client.post(
+            "/api/ckddetails/stage-batch",
+            data={
+                "creatinines": ["1.2"] * length,
+                "ages": [45] * length,
+                "genders": [Genders.MALE] * length,
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    def test__requires_login(self):
+        self.client.logout()
+        response = self.client.post(
+            "/api/ckddetails/stage-batch",
+            data={"creatinines": ["1.2"], "ages": [45], "genders": [Genders.MALE]},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
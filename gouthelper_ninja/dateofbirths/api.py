@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from django.http import HttpResponse
 from ninja import Router
 from ninja.errors import AuthorizationError
 from ninja.errors import HttpError
@@ -9,6 +10,9 @@ from gouthelper_ninja.dateofbirths.schema import DateOfBirthEditSchema
 from gouthelper_ninja.dateofbirths.schema import DateOfBirthSchema
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.users.querysets import patient_patientprofile_provider_qs
+from gouthelper_ninja.utils.etags import check_if_match
+from gouthelper_ninja.utils.etags import set_etag
+from gouthelper_ninja.utils.permissions import check_predicate
 
 router = Router()
 
@@ -23,6 +27,7 @@ def update_dateofbirth(
     request,
     dateofbirth_id: UUID,
     data: DateOfBirthEditSchema,
+    response: HttpResponse,
 ) -> DateOfBirth:
     try:
         dob: DateOfBirth = patient_patientprofile_provider_qs(
@@ -33,11 +38,13 @@ def update_dateofbirth(
             status_code=404,
             message=f"DateOfBirth with id {dateofbirth_id} does not exist.",
         ) from e
-    if not change_object(request.user, dob):
+    if not check_predicate(change_object, request.user, dob):
         msg = f"{request.user} does not have permission to update this DateOfBirth."
         raise AuthorizationError(
             403,
             message=msg,
         )
+    check_if_match(request, dob)
     dob.gh_update(data=data)
+    set_etag(response, dob)
     return dob
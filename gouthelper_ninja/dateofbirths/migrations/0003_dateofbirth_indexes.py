@@ -0,0 +1,23 @@
+# Generated by Django 5.1.9 on 2026-10-17 23:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dateofbirths', '0002_alter_dateofbirth_dateofbirth_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dateofbirth',
+            index=models.Index(fields=['dateofbirth'], name='dateofbirth_dob_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dateofbirth',
+            index=models.Index(fields=['patient', 'dateofbirth'], name='dateofbirth_patient_dob_idx'),
+        ),
+    ]
@@ -47,6 +47,14 @@ class DateOfBirth(
                 name="dateofbirth_valid",
             ),
         ]
+        # Support age_range_filter, which filters on ranges of dateofbirth
+        indexes = [
+            models.Index(fields=["dateofbirth"], name="dateofbirth_dob_idx"),
+            models.Index(
+                fields=["patient", "dateofbirth"],
+                name="dateofbirth_patient_dob_idx",
+            ),
+        ]
         rules_permissions = {
             "add": add_object,
             "change": change_object,
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from django.db.models import F
@@ -6,7 +7,11 @@ from django.db.models import IntegerField
 from django.db.models import Value
 from django.utils import timezone
 
+from gouthelper_ninja.utils.helpers import yearsago_date
+
 if TYPE_CHECKING:
+    from datetime import date
+
     from django.db.models import QuerySet
 
 
@@ -26,3 +31,40 @@ def annotate_patient_queryset_with_age(qs: "QuerySet") -> "QuerySet":
             output_field=IntegerField(),
         ),
     )
+
+
+def dateofbirth_range(
+    min_age: int | None = None,
+    max_age: int | None = None,
+) -> tuple["date | None", "date | None"]:
+    """Returns the (earliest, latest) dates of birth, both inclusive, of
+    someone whose age today is between min_age and max_age, inclusive.
+    Either bound is None if the corresponding age is None."""
+
+    # Someone max_age years old was born after the day they would have
+    # turned max_age + 1, and someone min_age years old was born on or
+    # before the day they turned min_age
+    earliest = (
+        yearsago_date(max_age + 1) + timedelta(days=1) if max_age is not None else None
+    )
+    latest = yearsago_date(min_age) if min_age is not None else None
+    return earliest, latest
+
+
+def age_range_filter(
+    qs: "QuerySet",
+    min_age: int | None = None,
+    max_age: int | None = None,
+    field: str = "dateofbirth__dateofbirth",
+) -> "QuerySet":
+    """Filters a queryset to rows whose date of birth, at the field lookup,
+    corresponds to an age between min_age and max_age, inclusive. The ages
+    are converted into a date range so that the filter can use the index on
+    DateOfBirth.dateofbirth, rather than calculating each row's age."""
+
+    earliest, latest = dateofbirth_range(min_age=min_age, max_age=max_age)
+    if earliest is not None:
+        qs = qs.filter(**{f"{field}__gte": earliest})
+    if latest is not None:
+        qs = qs.filter(**{f"{field}__lte": latest})
+    return qs
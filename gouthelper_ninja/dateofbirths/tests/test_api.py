@@ -3,6 +3,7 @@ from http import HTTPStatus
 from uuid import uuid4
 
 import pytest
+from django.http import HttpResponse
 from django.test import RequestFactory
 from django.test import TestCase
 from django.urls import reverse
@@ -36,6 +37,7 @@ class TestUpdateDateOfBirth(TestCase):
             request=request,
             dateofbirth_id=self.patient.dateofbirth.id,
             data=DateOfBirthEditSchema(**self.new_dob),
+            response=HttpResponse(),
         )
 
         assert isinstance(response, DateOfBirth)
@@ -1,9 +1,17 @@
+from datetime import date
+from datetime import timedelta
+
 import pytest
 from django.contrib.auth import get_user_model
+from freezegun import freeze_time
 
+from gouthelper_ninja.dateofbirths.models import DateOfBirth
+from gouthelper_ninja.dateofbirths.querysets import age_range_filter
 from gouthelper_ninja.dateofbirths.querysets import annotate_patient_queryset_with_age
 from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.tests.factories import PatientFactory
 from gouthelper_ninja.utils.helpers import age_calc
+from gouthelper_ninja.utils.helpers import yearsago_date
 
 User = get_user_model()
 pytestmark = pytest.mark.django_db
@@ -17,3 +25,51 @@ def test__annotate_with_age(patient: "Patient"):
     assert hasattr(annotated_patient, "age")
     assert isinstance(annotated_patient.age, int)
     assert annotated_patient.age == age_calc(annotated_patient.dateofbirth.dateofbirth)
+
+
+@pytest.mark.parametrize(
+    "today",
+    ["2024-02-28", "2024-02-29", "2024-03-01", "2023-02-28", "2023-03-01"],
+)
+def test__age_range_filter_matches_age_annotation(today):
+    """Test that age_range_filter returns the same Patients as filtering on
+    the database-calculated age, including around birthdays and leap days."""
+
+    with freeze_time(today):
+        current = date.fromisoformat(today)
+        dateofbirths = {
+            date(2000, 2, 28),
+            date(2000, 2, 29),
+            date(2000, 3, 1),
+            date(1999, 2, 28),
+            date(1999, 3, 1),
+        }
+        for years in (22, 23, 24, 25):
+            birthday = yearsago_date(years, current)
+            dateofbirths.update(
+                {birthday - timedelta(days=1), birthday, birthday + timedelta(days=1)},
+            )
+        patients = [PatientFactory(menopause=False) for _ in dateofbirths]
+        for patient, dateofbirth in zip(patients, sorted(dateofbirths), strict=True):
+            DateOfBirth.objects.filter(patient=patient).update(dateofbirth=dateofbirth)
+
+        annotated = annotate_patient_queryset_with_age(Patient.objects.all())
+        for min_age, max_age in [(23, 23), (22, 24), (None, 23), (24, None)]:
+            expected = annotated
+            if min_age is not None:
+                expected = expected.filter(age__gte=min_age)
+            if max_age is not None:
+                expected = expected.filter(age__lte=max_age)
+            assert set(
+                age_range_filter(Patient.objects.all(), min_age, max_age),
+            ) == set(expected)
+
+
+def test__age_range_filter_dateofbirth_queryset(patient: "Patient"):
+    age = age_calc(patient.dateofbirth.dateofbirth)
+    qs = DateOfBirth.objects.all()
+
+    assert list(age_range_filter(qs, age, age, field="dateofbirth")) == [
+        patient.dateofbirth,
+    ]
+    assert not age_range_filter(qs, age + 1, field="dateofbirth").exists()
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from django.http import HttpResponse
 from ninja import Router
 from ninja.errors import AuthorizationError
 from ninja.errors import HttpError
@@ -9,6 +10,9 @@ from gouthelper_ninja.ethnicitys.schema import EthnicityEditSchema
 from gouthelper_ninja.ethnicitys.schema import EthnicitySchema
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.users.querysets import patient_patientprofile_provider_qs
+from gouthelper_ninja.utils.etags import check_if_match
+from gouthelper_ninja.utils.etags import set_etag
+from gouthelper_ninja.utils.permissions import check_predicate
 
 router = Router()
 
@@ -23,6 +27,7 @@ def update_ethnicity(
     request,
     ethnicity_id: UUID,
     data: EthnicityEditSchema,
+    response: HttpResponse,
 ) -> Ethnicity:
     try:
         ethnicity: Ethnicity = patient_patientprofile_provider_qs(
@@ -33,11 +38,13 @@ def update_ethnicity(
             status_code=404,
             message=f"Ethnicity with id {ethnicity_id} does not exist.",
         ) from e
-    if not change_object(request.user, ethnicity):
+    if not check_predicate(change_object, request.user, ethnicity):
         msg = f"{request.user} does not have permission to update this Ethnicity."
         raise AuthorizationError(
             403,
             message=msg,
         )
+    check_if_match(request, ethnicity)
     ethnicity.gh_update(data=data)
+    set_etag(response, ethnicity)
     return ethnicity
@@ -5,6 +5,7 @@ from uuid import UUID
 from uuid import uuid4
 
 import pytest
+from django.http import HttpResponse
 from django.test import RequestFactory
 from django.test import TestCase
 from django.urls import reverse
@@ -70,6 +71,7 @@ class TestUpdateEthnicity(TestCase):
             request=request,
             ethnicity_id=ethnicity_obj.id,
             data=self.payload_schema,
+            response=HttpResponse(),
         )
 
         assert isinstance(response_ethnicity, Ethnicity)
@@ -121,6 +123,7 @@ class TestUpdateEthnicity(TestCase):
                 request=request,
                 ethnicity_id=target_ethnicity_id,
                 data=data_schema,
+                response=HttpResponse(),
             )
 
         # Admin can update any patient's Ethnicity
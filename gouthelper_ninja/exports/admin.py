@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from gouthelper_ninja.exports.models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "provider",
+        "status",
+        "created",
+        "finished",
+        "pk",
+    )
+    list_filter = ("status",)
+    readonly_fields = ("progress", "error", "started", "finished")
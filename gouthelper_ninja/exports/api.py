@@ -0,0 +1,72 @@
+from pathlib import PurePosixPath
+from uuid import UUID
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from ninja import Router
+from ninja.errors import HttpError
+from ninja.security import django_auth
+
+from gouthelper_ninja.exports.jobs import reset_failed_export_job
+from gouthelper_ninja.exports.models import ExportJob
+from gouthelper_ninja.exports.queues import enqueue_export_job
+from gouthelper_ninja.exports.schema import ExportJobSchema
+
+router = Router()
+
+
+@router.post("/exports", response={202: ExportJobSchema}, auth=[django_auth])
+def create_export_job(request) -> tuple[int, ExportJob]:
+    """Starts a background export of the request user's Patients. Poll the
+    job with get_export_job until its status is COMPLETE, then download
+    its files."""
+    job = ExportJob.objects.create(provider=request.user)
+    enqueue_export_job(job)
+    return 202, job
+
+
+@router.get(
+    "/exports/{uuid:job_id}",
+    response=ExportJobSchema,
+    auth=[django_auth],
+)
+def get_export_job(request, job_id: UUID) -> ExportJob:
+    return _get_export_job(request, job_id)
+
+
+@router.post(
+    "/exports/{uuid:job_id}/retry",
+    response={202: ExportJobSchema},
+    auth=[django_auth],
+)
+def retry_export_job(request, job_id: UUID) -> tuple[int, ExportJob]:
+    """Runs a FAILED job again, resuming after the last file it wrote.
+    Responds with 409 if the job hasn't failed."""
+    job = reset_failed_export_job(_get_export_job(request, job_id).id)
+    if job is None:
+        raise HttpError(409, f"Export job {job_id} hasn't failed.")
+    enqueue_export_job(job)
+    return 202, job
+
+
+@router.get("/exports/{uuid:job_id}/files/{int:index}", auth=[django_auth])
+def get_export_file(request, job_id: UUID, index: int) -> FileResponse:
+    """Downloads the job's file at index in its files. Only the job's
+    provider can download them."""
+    files = _get_export_job(request, job_id).files
+    if index >= len(files):
+        raise HttpError(404, f"Export job {job_id} has no file {index}.")
+    name = files[index][1]
+    return FileResponse(
+        default_storage.open(name),
+        as_attachment=True,
+        filename=PurePosixPath(name).name,
+        content_type="application/gzip",
+    )
+
+
+def _get_export_job(request, job_id: UUID) -> ExportJob:
+    try:
+        return ExportJob.objects.get(id=job_id, provider_id=request.user.id)
+    except ExportJob.DoesNotExist as e:
+        raise HttpError(404, f"Export job with id: {job_id} not found.") from e
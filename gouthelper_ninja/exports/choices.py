@@ -0,0 +1,16 @@
+from django.db.models import TextChoices
+from django.utils.translation import gettext_lazy as _
+
+
+class ExportResources(TextChoices):
+    PATIENTS = "patients", _("Patients")
+    MEDHISTORYS = "medhistorys", _("MedHistorys")
+    CKDDETAILS = "ckddetails", _("CkdDetails")
+    GOUTDETAILS = "goutdetails", _("GoutDetails")
+
+
+class ExportStatuses(TextChoices):
+    PENDING = "PENDING", _("Pending")
+    RUNNING = "RUNNING", _("Running")
+    COMPLETE = "COMPLETE", _("Complete")
+    FAILED = "FAILED", _("Failed")
@@ -0,0 +1,222 @@
+"""Writes ExportJobs' files. Each resource is read in keyset order of id,
+chunk_size rows at a time, and each chunk is written to its own file before
+the job's progress is saved, so a job that stops part way through, because
+its worker died or it failed, resumes from the last file written."""
+
+import gzip
+import json
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from gouthelper_ninja.exports.choices import ExportResources
+from gouthelper_ninja.exports.choices import ExportStatuses
+from gouthelper_ninja.exports.models import ExportJob
+from gouthelper_ninja.goutdetails.schema import GoutDetailEditSchema
+from gouthelper_ninja.users.exporters import nest_row
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from uuid import UUID
+
+    from django.db.models import QuerySet
+
+# A RUNNING job whose progress hasn't been saved for this long is presumed to
+# have been abandoned by a worker that died, and can be claimed again
+EXPORT_JOB_STALE_AFTER = timedelta(minutes=10)
+
+
+def _patients(provider_id: "UUID") -> "QuerySet":
+    return (
+        apps.get_model("users.Patient")
+        .objects.filter(provider_id=provider_id)
+        .values(
+            "id",
+            "created",
+            "modified",
+            "dateofbirth__dateofbirth",
+            "ethnicity__ethnicity",
+            "gender__gender",
+        )
+    )
+
+
+def _medhistorys(provider_id: "UUID") -> "QuerySet":
+    return (
+        apps.get_model("medhistorys.MedHistory")
+        .objects.filter(patient__provider_id=provider_id)
+        .values("id", "patient_id", "mhtype", "history_of", "created", "modified")
+    )
+
+
+def _ckddetails(provider_id: "UUID") -> "QuerySet":
+    return (
+        apps.get_model("ckddetails.CkdDetail")
+        .objects.filter(patient__provider_id=provider_id)
+        .values(
+            "id",
+            "patient_id",
+            "dialysis",
+            "dialysis_duration",
+            "dialysis_type",
+            "stage",
+            "created",
+            "modified",
+        )
+    )
+
+
+def _goutdetails(provider_id: "UUID") -> "QuerySet":
+    return (
+        apps.get_model("goutdetails.GoutDetail")
+        .objects.filter(patient__provider_id=provider_id)
+        .values(
+            "id",
+            "patient_id",
+            *GoutDetailEditSchema.model_fields,
+            "created",
+            "modified",
+        )
+    )
+
+
+# The rows of each resource for a provider, as a QuerySet.values()
+EXPORT_RESOURCE_QUERYSETS: dict[ExportResources, "Callable[[UUID], QuerySet]"] = {
+    ExportResources.PATIENTS: _patients,
+    ExportResources.MEDHISTORYS: _medhistorys,
+    ExportResources.CKDDETAILS: _ckddetails,
+    ExportResources.GOUTDETAILS: _goutdetails,
+}
+
+
+def get_export_file_name(job: ExportJob, resource: ExportResources, n: int) -> str:
+    return f"exports/{job.id}/{resource}-{n:05d}.ndjson.gz"
+
+
+def write_export_file(name: str, rows: list[dict[str, Any]]) -> str:
+    """Writes the rows to the default storage as gzip-compressed NDJSON.
+    A file of the same name, left by an earlier attempt, is replaced."""
+
+    content = b"".join(
+        json.dumps(nest_row(row, sep="__"), cls=DjangoJSONEncoder).encode() + b"\n"
+        for row in rows
+    )
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(gzip.compress(content)))
+
+
+def write_export_resource(job: ExportJob, resource: ExportResources) -> None:
+    """Writes the resource's remaining rows to files, saving the job's
+    progress after each one."""
+
+    progress = job.get_resource_progress(resource)
+    if progress["done"]:
+        return
+    qs = EXPORT_RESOURCE_QUERYSETS[resource](job.provider_id).order_by("id")
+    while True:
+        chunk_qs = (
+            qs
+            if progress["cursor"] is None
+            else qs.filter(
+                id__gt=progress["cursor"],
+            )
+        )
+        rows = list(chunk_qs[: job.chunk_size])
+        if rows:
+            progress["files"].append(
+                write_export_file(
+                    get_export_file_name(job, resource, len(progress["files"])),
+                    rows,
+                ),
+            )
+            progress["cursor"] = str(rows[-1]["id"])
+        progress["done"] = len(rows) < job.chunk_size
+        job.save(update_fields=["progress", "modified"])
+        if progress["done"]:
+            return
+
+
+def claim_export_job(job_id: "UUID") -> ExportJob | None:
+    """Marks the job RUNNING and returns it if it's PENDING, or RUNNING but
+    stale, otherwise returns None. The status is checked and set in one
+    UPDATE, so a job that is delivered to several workers only runs once."""
+
+    now = timezone.now()
+    claimed = (
+        ExportJob.objects.filter(pk=job_id)
+        .filter(
+            Q(status=ExportStatuses.PENDING)
+            | Q(
+                status=ExportStatuses.RUNNING,
+                modified__lt=now - EXPORT_JOB_STALE_AFTER,
+            ),
+        )
+        .update(
+            status=ExportStatuses.RUNNING,
+            started=Coalesce("started", Value(now)),
+            modified=now,
+        )
+    )
+    return ExportJob.objects.get(pk=job_id) if claimed else None
+
+
+def reset_failed_export_job(job_id: "UUID") -> ExportJob | None:
+    """Marks the job PENDING, clearing its error, and returns it if it's
+    FAILED, otherwise returns None. Its progress is kept, so when it runs
+    again it resumes after the last file written."""
+
+    retried = ExportJob.objects.filter(
+        pk=job_id,
+        status=ExportStatuses.FAILED,
+    ).update(
+        status=ExportStatuses.PENDING,
+        error="",
+        modified=timezone.now(),
+    )
+    return ExportJob.objects.get(pk=job_id) if retried else None
+
+
+def run_export_job(job_id: "UUID") -> ExportJob | None:
+    """Claims the job and writes the files of each of the ExportResources
+    that aren't done. Returns the job, or None if it couldn't be claimed.
+    If writing fails, the job is marked FAILED with the error, which is
+    re-raised."""
+
+    job = claim_export_job(job_id)
+    if job is None:
+        return None
+    try:
+        for resource in ExportResources:
+            write_export_resource(job, resource)
+    except Exception as e:
+        job.status = ExportStatuses.FAILED
+        job.error = str(e)
+        job.save(update_fields=["status", "error", "modified"])
+        raise
+    job.status = ExportStatuses.COMPLETE
+    job.finished = timezone.now()
+    job.save(update_fields=["status", "finished", "modified"])
+    return job
+
+
+def get_unfinished_export_job_ids() -> "QuerySet":
+    """Returns the ids of the jobs that can be claimed, which includes jobs
+    that were never delivered to a worker and jobs whose worker died."""
+
+    return ExportJob.objects.filter(
+        Q(status=ExportStatuses.PENDING)
+        | Q(
+            status=ExportStatuses.RUNNING,
+            modified__lt=timezone.now() - EXPORT_JOB_STALE_AFTER,
+        ),
+    ).values_list("id", flat=True)
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from gouthelper_ninja.exports.jobs import get_unfinished_export_job_ids
+from gouthelper_ninja.exports.queues import get_export_queue
+from gouthelper_ninja.exports.queues import run_queued_export_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run ExportJobs from the export queue. Whenever the queue is empty, "
+        "jobs that were never delivered or whose worker died are enqueued "
+        "again, and resume from their last file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=30,
+            help="Seconds to wait for a job before checking for unfinished jobs.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for jobs.",
+        )
+
+    def handle(self, *args, **options):
+        queue = get_export_queue()
+        self._requeue(queue)
+        while True:
+            job_id = queue.dequeue(options["timeout"])
+            if job_id is None:
+                if options["burst"]:
+                    return
+                self._requeue(queue)
+                continue
+            close_old_connections()
+            self.stdout.write(f"Running ExportJob {job_id}.")
+            run_queued_export_job(job_id)
+
+    def _requeue(self, queue):
+        close_old_connections()
+        for job_id in get_unfinished_export_job_ids():
+            queue.enqueue(job_id)
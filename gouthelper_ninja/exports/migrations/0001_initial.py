@@ -0,0 +1,40 @@
+# Generated by Django 5.1.9 on 2026-10-18 00:51
+
+import django.db.models.deletion
+import django_extensions.db.fields
+import rules.contrib.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETE', 'Complete'), ('FAILED', 'Failed')], default='PENDING', max_length=20, verbose_name='Status')),
+                ('chunk_size', models.PositiveIntegerField(default=5000, help_text='Number of rows in each file.', verbose_name='Chunk size')),
+                ('progress', models.JSONField(default=dict, editable=False)),
+                ('error', models.TextField(blank=True, editable=False)),
+                ('started', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('finished', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('provider', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+                'constraints': [models.CheckConstraint(condition=models.Q(('status__in', ['PENDING', 'RUNNING', 'COMPLETE', 'FAILED'])), name='exports_exportjob_status_valid')],
+            },
+            bases=(rules.contrib.models.RulesModelMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db.models import CASCADE
+from django.db.models import CharField
+from django.db.models import CheckConstraint
+from django.db.models import DateTimeField
+from django.db.models import ForeignKey
+from django.db.models import JSONField
+from django.db.models import PositiveIntegerField
+from django.db.models import Q
+from django.db.models import TextField
+from django.utils.translation import gettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+
+from gouthelper_ninja.exports.choices import ExportResources
+from gouthelper_ninja.exports.choices import ExportStatuses
+from gouthelper_ninja.utils.models import GoutHelperModel
+
+EXPORT_JOB_CHUNK_SIZE = 5000
+
+
+class ExportJob(
+    GoutHelperModel,
+    TimeStampedModel,
+):
+    """Background export of a provider's Patients to gzip-compressed NDJSON
+    files in the default storage, chunk_size rows per file, with one set of
+    files for each of the ExportResources. progress records, for each
+    resource, the files written so far and the id of the last row in them,
+    so that a job that was interrupted resumes after the last file."""
+
+    class Meta(GoutHelperModel.Meta):
+        constraints = [
+            CheckConstraint(
+                name="%(app_label)s_%(class)s_status_valid",
+                condition=Q(status__in=ExportStatuses.values),
+            ),
+        ]
+
+    ExportStatuses = ExportStatuses
+
+    provider = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="export_jobs",
+        editable=False,
+    )
+    status = CharField(
+        _("Status"),
+        max_length=20,
+        choices=ExportStatuses.choices,
+        default=ExportStatuses.PENDING,
+    )
+    chunk_size = PositiveIntegerField(
+        _("Chunk size"),
+        help_text=_("Number of rows in each file."),
+        default=EXPORT_JOB_CHUNK_SIZE,
+    )
+    progress = JSONField(default=dict, editable=False)
+    error = TextField(blank=True, editable=False)
+    started = DateTimeField(null=True, blank=True, editable=False)
+    finished = DateTimeField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return f"ExportJob {self.id} ({self.get_status_display()})"
+
+    def get_resource_progress(self, resource: ExportResources) -> dict:
+        """Returns the progress of the resource, which is updated in place:
+        "files", the names of the files written, "cursor", the id of the last
+        row written, and "done"."""
+
+        return self.progress.setdefault(
+            resource,
+            {"files": [], "cursor": None, "done": False},
+        )
+
+    @property
+    def files(self) -> list[tuple[ExportResources, str]]:
+        """(resource, file name) of each file written so far."""
+
+        return [
+            (resource, name)
+            for resource in ExportResources
+            for name in self.progress.get(resource, {}).get("files", [])
+        ]
@@ -0,0 +1,75 @@
+"""Queues that deliver ExportJobs to a worker. RedisExportQueue is a list in
+the Redis at settings.REDIS_URL that the run_export_worker command pops from.
+LocalExportQueue runs jobs in-process as soon as they are enqueued, for tests
+and local development without Redis. settings.EXPORT_QUEUE picks one."""
+
+import logging
+from functools import partial
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+from redis import Redis
+
+from gouthelper_ninja.exports.jobs import run_export_job
+
+if TYPE_CHECKING:
+    from gouthelper_ninja.exports.models import ExportJob
+
+EXPORT_QUEUE_KEY = "exports:queue"
+
+logger = logging.getLogger(__name__)
+
+
+def run_queued_export_job(job_id: UUID) -> None:
+    """Runs the job, logging rather than raising if it fails, because its
+    status and error are reported to the client that polls it."""
+
+    try:
+        run_export_job(job_id)
+    except Exception:
+        logger.exception("ExportJob %s failed.", job_id)
+
+
+class LocalExportQueue:
+    """Runs each job as soon as it is enqueued. Nothing is ever dequeued."""
+
+    def enqueue(self, job_id: UUID) -> None:
+        run_queued_export_job(job_id)
+
+    def dequeue(self, timeout: int) -> UUID | None:
+        return None
+
+
+class RedisExportQueue:
+    """FIFO of job ids in a Redis list. Jobs are claimed in the database
+    when they run, so a job that is enqueued more than once only runs once."""
+
+    def __init__(self, url: str | None = None):
+        self.client = Redis.from_url(url or settings.REDIS_URL)
+
+    def enqueue(self, job_id: UUID) -> None:
+        self.client.lpush(EXPORT_QUEUE_KEY, str(job_id))
+
+    def dequeue(self, timeout: int) -> UUID | None:
+        """Blocks for up to timeout seconds for a job and returns its id, or
+        None if none was enqueued."""
+
+        item = self.client.brpop([EXPORT_QUEUE_KEY], timeout=timeout)
+        return UUID(item[1].decode()) if item else None
+
+
+def get_export_queue() -> LocalExportQueue | RedisExportQueue:
+    """Returns the queue configured by settings.EXPORT_QUEUE."""
+
+    if settings.EXPORT_QUEUE == "redis":
+        return RedisExportQueue()
+    return LocalExportQueue()
+
+
+def enqueue_export_job(job: "ExportJob") -> None:
+    """Enqueues the job once the current transaction commits, so that the
+    worker can't look for it before it exists."""
+
+    transaction.on_commit(partial(get_export_queue().enqueue, job.id))
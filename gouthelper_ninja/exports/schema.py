@@ -0,0 +1,44 @@
+from datetime import datetime
+from uuid import UUID
+
+from django.urls import reverse
+from ninja import Schema
+
+from gouthelper_ninja.exports.choices import ExportResources
+from gouthelper_ninja.exports.choices import ExportStatuses
+from gouthelper_ninja.exports.models import ExportJob
+
+
+class ExportFileSchema(Schema):
+    resource: ExportResources
+    name: str
+    url: str
+
+
+class ExportJobSchema(Schema):
+    id: UUID
+    status: ExportStatuses
+    created: datetime
+    started: datetime | None
+    finished: datetime | None
+    error: str
+    files: list[ExportFileSchema]
+
+    @staticmethod
+    def resolve_files(obj: ExportJob, context) -> list[dict[str, str]]:
+        """Links each file to get_export_file, which checks that the request
+        user is the job's provider, rather than to the storage, whose URLs
+        aren't authenticated."""
+
+        namespace = context["request"].resolver_match.namespace
+        return [
+            {
+                "resource": resource,
+                "name": name,
+                "url": reverse(
+                    f"{namespace}:get_export_file",
+                    kwargs={"job_id": obj.id, "index": index},
+                ),
+            }
+            for index, (resource, name) in enumerate(obj.files)
+        ]
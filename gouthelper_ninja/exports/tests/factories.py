@@ -0,0 +1,11 @@
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from gouthelper_ninja.exports.models import ExportJob
+
+
+class ExportJobFactory(DjangoModelFactory):
+    class Meta:
+        model = ExportJob
+
+    provider = SubFactory("gouthelper_ninja.users.tests.factories.UserFactory")
@@ -0,0 +1,172 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from gouthelper_ninja.exports.choices import ExportResources
+from gouthelper_ninja.exports.choices import ExportStatuses
+from gouthelper_ninja.exports.jobs import run_export_job
+from gouthelper_ninja.exports.models import ExportJob
+from gouthelper_ninja.exports.tests.factories import ExportJobFactory
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCreateExportJob:
+    url = reverse("api-1.0.0:create_export_job")
+
+    def test__auth_required(self, client):
+        assert client.post(self.url).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test__runs_job(self, client, django_capture_on_commit_callbacks):
+        provider = UserFactory()
+        PatientFactory(provider=provider)
+        client.force_login(provider)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(self.url)
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        job = ExportJob.objects.get(id=response.json()["id"])
+        assert job.provider == provider
+        assert job.status == ExportStatuses.COMPLETE
+
+
+class TestGetExportJob:
+    def test__api(self, client):
+        job = ExportJobFactory()
+        client.force_login(job.provider)
+
+        response = client.get(
+            reverse("api-1.0.0:get_export_job", kwargs={"job_id": job.id}),
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["status"] == ExportStatuses.PENDING
+        assert response.json()["files"] == []
+
+    def test__other_providers_job(self, client):
+        job = ExportJobFactory()
+        client.force_login(UserFactory())
+
+        response = client.get(
+            reverse("api-1.0.0:get_export_job", kwargs={"job_id": job.id}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test__files_link_to_get_export_file(self, client):
+        job = ExportJobFactory()
+        PatientFactory(provider=job.provider)
+        run_export_job(job.id)
+        client.force_login(job.provider)
+
+        response = client.get(
+            reverse("api-1.0.0:get_export_job", kwargs={"job_id": job.id}),
+        )
+
+        files = response.json()["files"]
+        assert files[0]["resource"] == ExportResources.PATIENTS
+        assert files[0]["url"] == reverse(
+            "api-1.0.0:get_export_file",
+            kwargs={"job_id": job.id, "index": 0},
+        )
+
+
+class TestRetryExportJob:
+    def test__runs_failed_job(self, client, django_capture_on_commit_callbacks):
+        job = ExportJobFactory(status=ExportStatuses.FAILED, error="Failed")
+        PatientFactory(provider=job.provider)
+        client.force_login(job.provider)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                reverse("api-1.0.0:retry_export_job", kwargs={"job_id": job.id}),
+            )
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.json()["status"] == ExportStatuses.PENDING
+        job.refresh_from_db()
+        assert job.status == ExportStatuses.COMPLETE
+        assert job.error == ""
+
+    def test__job_not_failed(self, client):
+        job = ExportJobFactory(status=ExportStatuses.COMPLETE)
+        client.force_login(job.provider)
+
+        response = client.post(
+            reverse("api-1.0.0:retry_export_job", kwargs={"job_id": job.id}),
+        )
+
+        assert response.status_code == HTTPStatus.CONFLICT
+
+    def test__other_providers_job(self, client):
+        job = ExportJobFactory(status=ExportStatuses.FAILED)
+        client.force_login(UserFactory())
+
+        response = client.post(
+            reverse("api-1.0.0:retry_export_job", kwargs={"job_id": job.id}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        job.refresh_from_db()
+        assert job.status == ExportStatuses.FAILED
+
+
+class TestGetExportFile:
+    @pytest.fixture
+    def job(self):
+        job = ExportJobFactory()
+        PatientFactory(provider=job.provider)
+        return run_export_job(job.id)
+
+    def test__api(self, client, job):
+        client.force_login(job.provider)
+
+        response = client.get(
+            reverse("api-1.0.0:get_export_file", kwargs={"job_id": job.id, "index": 0}),
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Disposition"].startswith("attachment")
+        records = [
+            json.loads(line)
+            for line in gzip.decompress(b"".join(response.streaming_content))
+            .decode()
+            .splitlines()
+        ]
+        assert [record["id"] for record in records] == [
+            str(job.provider.pseudopatient_profiles.get().user_id),
+        ]
+
+    def test__other_providers_job(self, client, job):
+        client.force_login(UserFactory())
+
+        response = client.get(
+            reverse("api-1.0.0:get_export_file", kwargs={"job_id": job.id, "index": 0}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test__no_such_file(self, client, job):
+        client.force_login(job.provider)
+
+        response = client.get(
+            reverse(
+                "api-1.0.0:get_export_file",
+                kwargs={"job_id": job.id, "index": len(job.files)},
+            ),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test__auth_required(self, client, job):
+        response = client.get(
+            reverse("api-1.0.0:get_export_file", kwargs={"job_id": job.id, "index": 0}),
+        )
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,19 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from gouthelper_ninja.exports.choices import ExportStatuses
+from gouthelper_ninja.exports.tests.factories import ExportJobFactory
+
+# The worker closes obsolete connections, which a test transaction would be
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test__run_export_worker_runs_unfinished_jobs():
+    job = ExportJobFactory()
+
+    call_command("run_export_worker", burst=True, stdout=StringIO())
+
+    job.refresh_from_db()
+    assert job.status == ExportStatuses.COMPLETE
@@ -0,0 +1,139 @@
+import gzip
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.ckddetails.tests.factories import CkdDetailFactory
+from gouthelper_ninja.exports.choices import ExportResources
+from gouthelper_ninja.exports.choices import ExportStatuses
+from gouthelper_ninja.exports.jobs import claim_export_job
+from gouthelper_ninja.exports.jobs import get_unfinished_export_job_ids
+from gouthelper_ninja.exports.jobs import reset_failed_export_job
+from gouthelper_ninja.exports.jobs import run_export_job
+from gouthelper_ninja.exports.jobs import write_export_file
+from gouthelper_ninja.exports.models import ExportJob
+from gouthelper_ninja.exports.tests.factories import ExportJobFactory
+from gouthelper_ninja.medhistorys.models import MedHistory
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def read_export_file(name: str) -> list[dict]:
+    with default_storage.open(name) as f:
+        return [json.loads(line) for line in gzip.decompress(f.read()).splitlines()]
+
+
+def read_export_resource(job: ExportJob, resource: ExportResources) -> list[dict]:
+    return [
+        record
+        for file_resource, name in job.files
+        if file_resource == resource
+        for record in read_export_file(name)
+    ]
+
+
+@pytest.fixture
+def provider():
+    return UserFactory()
+
+
+class TestRunExportJob:
+    def test__writes_each_resource(self, provider):
+        patients = PatientFactory.create_batch(3, provider=provider)
+        CkdDetailFactory(patient=patients[0], stage=Stages.THREE)
+        PatientFactory(provider=UserFactory())
+        job = ExportJobFactory(provider=provider, chunk_size=2)
+
+        job = run_export_job(job.id)
+
+        assert job.status == ExportStatuses.COMPLETE
+        assert job.finished is not None
+        records = read_export_resource(job, ExportResources.PATIENTS)
+        assert sorted(record["id"] for record in records) == sorted(
+            str(patient.id) for patient in patients
+        )
+        assert records[0]["dateofbirth"]["dateofbirth"]
+        assert len(job.progress[ExportResources.PATIENTS]["files"]) == 2  # noqa: PLR2004
+        assert len(read_export_resource(job, ExportResources.MEDHISTORYS)) == (
+            MedHistory.objects.filter(patient__in=patients).count()
+        )
+        assert [
+            record["patient_id"]
+            for record in read_export_resource(job, ExportResources.CKDDETAILS)
+        ] == [str(patients[0].id)]
+        assert len(read_export_resource(job, ExportResources.GOUTDETAILS)) == 3  # noqa: PLR2004
+
+    def test__resumes_after_failure(self, provider):
+        PatientFactory.create_batch(3, provider=provider)
+        job = ExportJobFactory(provider=provider, chunk_size=1)
+        calls = []
+
+        def fail_on_third_file(name, rows):
+            calls.append(name)
+            if len(calls) == 3:  # noqa: PLR2004
+                msg = "Storage unavailable"
+                raise OSError(msg)
+            return write_export_file(name, rows)
+
+        with (
+            patch(
+                "gouthelper_ninja.exports.jobs.write_export_file",
+                side_effect=fail_on_third_file,
+            ),
+            pytest.raises(OSError, match="Storage unavailable"),
+        ):
+            run_export_job(job.id)
+        job.refresh_from_db()
+        assert job.status == ExportStatuses.FAILED
+        assert job.error == "Storage unavailable"
+        assert len(job.progress[ExportResources.PATIENTS]["files"]) == 2  # noqa: PLR2004
+
+        assert reset_failed_export_job(job.id).error == ""
+        job = run_export_job(job.id)
+        assert job.status == ExportStatuses.COMPLETE
+        assert len(read_export_resource(job, ExportResources.PATIENTS)) == 3  # noqa: PLR2004
+
+    def test__not_claimed(self, provider):
+        job = ExportJobFactory(provider=provider, status=ExportStatuses.COMPLETE)
+        assert run_export_job(job.id) is None
+
+
+class TestClaimExportJob:
+    def test__running_job_is_not_claimed(self):
+        job = ExportJobFactory()
+        assert claim_export_job(job.id).status == ExportStatuses.RUNNING
+        assert claim_export_job(job.id) is None
+        assert job.id not in get_unfinished_export_job_ids()
+
+    def test__stale_job_is_claimed(self):
+        job = ExportJobFactory(status=ExportStatuses.RUNNING)
+        ExportJob.objects.filter(id=job.id).update(
+            modified=timezone.now() - timedelta(hours=1),
+        )
+        assert job.id in get_unfinished_export_job_ids()
+        assert claim_export_job(job.id) is not None
+
+
+class TestResetFailedExportJob:
+    def test__failed_job_is_reset(self):
+        job = ExportJobFactory(status=ExportStatuses.FAILED, error="Failed")
+        job = reset_failed_export_job(job.id)
+        assert job.status == ExportStatuses.PENDING
+        assert job.id in get_unfinished_export_job_ids()
+
+    @pytest.mark.parametrize(
+        "status",
+        [ExportStatuses.PENDING, ExportStatuses.RUNNING, ExportStatuses.COMPLETE],
+    )
+    def test__other_jobs_are_not_reset(self, status):
+        job = ExportJobFactory(status=status)
+        assert reset_failed_export_job(job.id) is None
+        job.refresh_from_db()
+        assert job.status == status
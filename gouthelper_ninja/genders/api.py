@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from django.http import HttpResponse
 from ninja import Router
 from ninja.errors import AuthorizationError
 from ninja.errors import HttpError
@@ -9,6 +10,9 @@ from gouthelper_ninja.genders.schema import GenderEditSchema
 from gouthelper_ninja.genders.schema import GenderSchema
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.users.querysets import patient_patientprofile_provider_qs
+from gouthelper_ninja.utils.etags import check_if_match
+from gouthelper_ninja.utils.etags import set_etag
+from gouthelper_ninja.utils.permissions import check_predicate
 
 router = Router()
 
@@ -23,6 +27,7 @@ def update_gender(
     request,
     gender_id: UUID,
     data: GenderEditSchema,
+    response: HttpResponse,
 ) -> Gender:
     try:
         gender: Gender = patient_patientprofile_provider_qs(
@@ -33,11 +38,13 @@ def update_gender(
             status_code=404,
             message=f"Gender with id {gender_id} does not exist.",
         ) from e
-    if not change_object(request.user, gender):
+    if not check_predicate(change_object, request.user, gender):
         msg = f"{request.user} does not have permission to update this Gender."
         raise AuthorizationError(
             403,
             message=msg,
         )
+    check_if_match(request, gender)
     gender.gh_update(data=data)
+    set_etag(response, gender)
     return gender
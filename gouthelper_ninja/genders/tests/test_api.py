@@ -5,6 +5,7 @@ from uuid import UUID
 from uuid import uuid4
 
 import pytest
+from django.http import HttpResponse
 from django.test import RequestFactory
 from django.test import TestCase
 from django.urls import reverse
@@ -74,6 +75,7 @@ class TestUpdateGender(TestCase):
             request=request,
             gender_id=gender_obj.id,
             data=self.payload_schema,
+            response=HttpResponse(),
         )
 
         assert isinstance(response_gender, Gender)
@@ -122,6 +124,7 @@ class TestUpdateGender(TestCase):
                 request=request,
                 gender_id=target_gender_id,
                 data=data_schema,
+                response=HttpResponse(),
             )
 
         # Admin can update any patient's Gender
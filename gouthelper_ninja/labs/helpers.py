@@ -1,12 +1,19 @@
 import random
+from collections.abc import Sequence
 from decimal import Decimal
 
+import numpy as np
+
 from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.constants import MAX_BASELINECREATININE
 from gouthelper_ninja.constants import CkdEgfrCutoffs
 from gouthelper_ninja.constants import EgfrAlphas
 from gouthelper_ninja.constants import EgfrKappas
 from gouthelper_ninja.constants import EgfrSexModifiers
 from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.labs.tables import EGFR_TABLE_AGES
+from gouthelper_ninja.labs.tables import EGFR_TABLE_CREATININES
+from gouthelper_ninja.labs.tables import get_egfr_table
 from gouthelper_ninja.utils.helpers import round_decimal
 
 
@@ -19,28 +26,28 @@ class BaselineCreatinineCalc:
         stage: Stages,
         age: int,
         gender: Genders,
+        seed: int | None = None,
     ):
         self.stage = stage
         self.age = age
         self.gender = gender
         self.min_egfr, self.max_egfr = egfr_range_for_stage(stage)
-        self.creat = Decimal(random.uniform(0, 5))  # noqa: S311
+        self.min_creat, self.max_creat = creatinine_range_for_stage(
+            stage,
+            age,
+            gender,
+        )
+        self.random = random.Random(seed)  # noqa: S311
 
     def calculate(self) -> Decimal:
-        """Method that recursively derives a baseline creatinine value for the
-        given CKD stage and patient age and gender."""
-        egfr = egfr_calculator(self.creat, self.age, self.gender)
-        while egfr < self.min_egfr or egfr > self.max_egfr:
-            if egfr < self.min_egfr:
-                self.creat = Decimal(
-                    random.uniform(0, float(self.creat)),  # noqa: S311
-                )
-                return self.calculate()
-            self.creat = Decimal(
-                random.uniform(float(self.creat), 5),  # noqa: S311
-            )
-            return self.calculate()
-        return round_decimal(self.creat, 2)
+        """Method that picks a baseline creatinine value, to 2 decimal places,
+        uniformly from those compatible with the given CKD stage and patient
+        age and gender. Repeatable if the class was given a seed."""
+        hundredths = self.random.randint(
+            int(self.min_creat * 100),
+            int(self.max_creat * 100),
+        )
+        return round_decimal(Decimal(hundredths) / 100, 2)
 
 
 def egfr_range_for_stage(
@@ -59,10 +66,139 @@ def egfr_range_for_stage(
     return 0, 14
 
 
+# Bounds of the baseline creatinines, in mg/dL, that the inverse eGFR
+# calculations search for a stage's creatinine range
+BASELINE_CREATININE_MIN = Decimal("0.01")
+BASELINE_CREATININE_MAX = MAX_BASELINECREATININE
+
+
+def creatinine_for_egfr(
+    egfrs: Sequence[float],
+    ages: Sequence[int],
+    genders: Sequence[Genders],
+) -> np.ndarray:
+    """Closed-form inverse of the CKD-EPI equation in egfr_calculator. Returns
+    an array of the unrounded creatinines at which the equation gives each of
+    the eGFRs for the corresponding age and gender."""
+
+    egfr = np.asarray(egfrs, dtype=np.float64)
+    age = np.asarray(ages, dtype=np.float64)
+    male = np.asarray(genders) == Genders.MALE
+
+    sex_modifier = np.where(
+        male,
+        float(EgfrSexModifiers.MALE.value),
+        float(EgfrSexModifiers.FEMALE.value),
+    )
+    alpha = np.where(male, float(EgfrAlphas.MALE.value), float(EgfrAlphas.FEMALE.value))
+    kappa = np.where(male, float(EgfrKappas.MALE.value), float(EgfrKappas.FEMALE.value))
+
+    # eGFR when creatinine equals kappa, above which the equation's exponent
+    # changes from alpha to -1.200
+    knee = 142 * 0.9938**age * sex_modifier
+    exponent = np.where(egfr >= knee, alpha, -1.2)
+    return kappa * (egfr / knee) ** (1 / exponent)
+
+
+def batch_creatinine_range_for_stage(
+    stages: Sequence[Stages],
+    ages: Sequence[int],
+    genders: Sequence[Genders],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized creatinine_range_for_stage. Returns arrays of the lowest and
+    highest creatinines, to 2 decimal places, for each stage, age, and gender.
+    Where no creatinine within BASELINE_CREATININE_MIN and _MAX gives an eGFR
+    in the stage's range, the lowest creatinine is greater than the highest."""
+
+    egfr_ranges = np.array(
+        [egfr_range_for_stage(stage) for stage in stages],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    min_egfr, max_egfr = egfr_ranges[:, 0], egfr_ranges[:, 1]
+    minimum = int(BASELINE_CREATININE_MIN * 100)
+    maximum = int(BASELINE_CREATININE_MAX * 100)
+
+    def egfr(hundredths: np.ndarray) -> np.ndarray:
+        return batch_egfr_calculator(hundredths / 100, ages, genders)
+
+    # eGFR falls as creatinine rises, and rounded eGFRs within the stage's
+    # range come from unrounded eGFRs within half of it, so the highest eGFR
+    # gives the lowest creatinine. Work in hundredths of a mg/dL to keep the
+    # 2 decimal place values exact.
+    low = np.ceil(creatinine_for_egfr(max_egfr + 0.5, ages, genders) * 100)
+    low = np.clip(low, minimum, maximum).astype(np.int64)
+    with np.errstate(divide="ignore"):
+        high = np.floor(
+            creatinine_for_egfr(np.maximum(min_egfr - 0.5, 0), ages, genders) * 100,
+        )
+    high = np.clip(np.nan_to_num(high, posinf=maximum), minimum, maximum)
+    high = high.astype(np.int64)
+
+    # Correct for float error and the rounding at the edges of the stage's
+    # range by checking the bounds and their neighbors with egfr_calculator
+    low = np.where(egfr(low) > max_egfr, low + 1, low)
+    below_low = np.maximum(low - 1, minimum)
+    low = np.where((low > minimum) & (egfr(below_low) <= max_egfr), below_low, low)
+    high = np.where(egfr(high) < min_egfr, high - 1, high)
+    above_high = np.minimum(high + 1, maximum)
+    high = np.where(
+        (high < maximum) & (egfr(above_high) >= min_egfr),
+        above_high,
+        high,
+    )
+    return np.round(low / 100, 2), np.round(high / 100, 2)
+
+
+def creatinine_range_for_stage(
+    stage: Stages,
+    age: int,
+    gender: Genders,
+) -> tuple[Decimal, Decimal]:
+    """Returns the lowest and highest creatinines, to 2 decimal places, for
+    which egfr_calculator gives an eGFR in the stage's range for the age and
+    gender. Raises a ValueError if there are none within
+    BASELINE_CREATININE_MIN and BASELINE_CREATININE_MAX."""
+
+    (low,), (high,) = batch_creatinine_range_for_stage([stage], [age], [gender])
+    if low > high:
+        msg = (
+            f"No creatinine between {BASELINE_CREATININE_MIN} and "
+            f"{BASELINE_CREATININE_MAX} gives a stage {stage} eGFR for a "
+            f"{age} year old {Genders(gender).label}."
+        )
+        raise ValueError(msg)
+    return round_decimal(Decimal(str(low)), 2), round_decimal(Decimal(str(high)), 2)
+
+
+def batch_baseline_creatinines(
+    stages: Sequence[Stages],
+    ages: Sequence[int],
+    genders: Sequence[Genders],
+    seed: int | None = None,
+) -> np.ndarray:
+    """Vectorized BaselineCreatinineCalc. Returns an array of baseline
+    creatinines, to 2 decimal places, each picked uniformly from those
+    compatible with the corresponding stage, age, and gender. Repeatable
+    for a given seed."""
+
+    low, high = batch_creatinine_range_for_stage(stages, ages, genders)
+    if np.any(low > high):
+        msg = "Some stages have no compatible creatinine for their age and gender."
+        raise ValueError(msg)
+    hundredths = np.random.default_rng(seed).integers(
+        np.rint(low * 100).astype(np.int64),
+        np.rint(high * 100).astype(np.int64),
+        endpoint=True,
+    )
+    return np.round(hundredths / 100, 2)
+
+
 def egfr_calculator(
     creatinine: Decimal,  # TODO: creatinine can be Creatinine when implemented
     age: int,
     gender: Genders,
+    *,
+    use_table: bool = True,
 ) -> Decimal:
     """
     Calculates eGFR from Creatinine value.
@@ -73,10 +209,19 @@ def egfr_calculator(
         creatinine: Decimal value
         age (int): age of patient in years
         gender (Genders enum = int): Genders (MALE or FEMALE)
+        use_table (bool): look the eGFR up in the precomputed eGFR table,
+            if it's within the table, rather than calculating it
 
     returns: eGFR (decimal) rounded to 0 decimal points
     """
 
+    if use_table and isinstance(creatinine, Decimal) and isinstance(age, int):
+        table = get_egfr_table()
+        if table is not None:
+            egfr = table.egfr(creatinine, age, gender)
+            if egfr is not None:
+                return Decimal(egfr)
+
     # Set gender-based variables for CKD-EPI Creatinine Equation
     sex_modifier, alpha, kappa = get_sex_modifier_alpha_kappa(
         gender,
@@ -128,6 +273,12 @@ def stage_calculator(egfr: Decimal) -> Stages:
     Returns:
         Stages enum object: CKD stage
     """
+    if isinstance(egfr, Decimal):
+        table = get_egfr_table()
+        if table is not None:
+            stage = table.stage(egfr)
+            if stage is not None:
+                return stage
     # Use eGFR to determine CKD stage and return
     return (
         Stages.ONE
@@ -140,3 +291,92 @@ def stage_calculator(egfr: Decimal) -> Stages:
         if CkdEgfrCutoffs.THREE.value > egfr >= CkdEgfrCutoffs.FOUR.value
         else Stages.FIVE
     )
+
+
+# eGFRs calculated with floats whose fractional part is this close to .5 are
+# recalculated with Decimals, where float error could change their rounding
+BATCH_EGFR_ROUNDING_TOLERANCE = 1e-9
+
+
+def batch_egfr_calculator(
+    creatinines: Sequence[Decimal | float],
+    ages: Sequence[int],
+    genders: Sequence[Genders],
+) -> np.ndarray:
+    """Vectorized egfr_calculator for equal-length sequences of creatinine
+    values, ages, and genders. Calculates with NumPy float64 arrays and
+    returns an int64 array of eGFRs rounded exactly as egfr_calculator
+    rounds them."""
+
+    creatinine = np.asarray(creatinines, dtype=np.float64)
+    age = np.asarray(ages, dtype=np.float64)
+    male = np.asarray(genders) == Genders.MALE
+    if not creatinine.shape == age.shape == male.shape:
+        msg = "creatinines, ages, and genders must be the same length."
+        raise ValueError(msg)
+
+    sex_modifier = np.where(
+        male,
+        float(EgfrSexModifiers.MALE.value),
+        float(EgfrSexModifiers.FEMALE.value),
+    )
+    alpha = np.where(male, float(EgfrAlphas.MALE.value), float(EgfrAlphas.FEMALE.value))
+    kappa = np.where(male, float(EgfrKappas.MALE.value), float(EgfrKappas.FEMALE.value))
+
+    egfr = (
+        142
+        * np.minimum(creatinine / kappa, 1.0) ** alpha
+        * np.maximum(creatinine / kappa, 1.0) ** -1.2
+        * 0.9938**age
+        * sex_modifier
+    )
+    # np.rint rounds half to even, as does round_decimal
+    rounded = np.rint(egfr)
+    near_half = np.abs(egfr - np.floor(egfr) - 0.5) < BATCH_EGFR_ROUNDING_TOLERANCE
+    for i in np.flatnonzero(near_half):
+        rounded[i] = egfr_calculator(
+            creatinine=(
+                creatinines[i]
+                if isinstance(creatinines[i], Decimal)
+                else Decimal(str(creatinines[i]))
+            ),
+            age=int(ages[i]),
+            gender=Genders(genders[i]),
+            use_table=False,
+        )
+    return rounded.astype(np.int64)
+
+
+def batch_stage_calculator(egfrs: Sequence[Decimal | float]) -> np.ndarray:
+    """Vectorized stage_calculator. Returns an int64 array of Stages
+    values for a sequence of eGFRs."""
+
+    cutoffs = sorted(cutoff.value for cutoff in CkdEgfrCutoffs)
+    return Stages.FIVE - np.searchsorted(
+        cutoffs,
+        np.asarray(egfrs, dtype=np.float64),
+        side="right",
+    )
+
+
+def generate_egfr_table() -> tuple[np.ndarray, np.ndarray]:
+    """Calculates the eGFR table's arrays: the eGFR for every creatinine, age,
+    and gender in the table's domain, indexed [gender, age, creatinine], and
+    the Stage for every integer eGFR up to the highest of those."""
+
+    genders, ages, creatinines = np.meshgrid(
+        Genders.values,
+        EGFR_TABLE_AGES,
+        EGFR_TABLE_CREATININES,
+        indexing="ij",
+    )
+    egfrs = batch_egfr_calculator(
+        creatinines.ravel() / 100,
+        ages.ravel(),
+        genders.ravel(),
+    ).reshape(creatinines.shape)
+    if egfrs.max() > np.iinfo(np.uint8).max:
+        msg = "eGFRs in the table's domain no longer fit in 8 bits."
+        raise ValueError(msg)
+    stages = batch_stage_calculator(np.arange(egfrs.max() + 1))
+    return egfrs.astype(np.uint8), stages.astype(np.uint8)
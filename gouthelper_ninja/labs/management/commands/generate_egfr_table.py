@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from gouthelper_ninja.labs.helpers import generate_egfr_table
+from gouthelper_ninja.labs.tables import EGFR_TABLE_PATH
+from gouthelper_ninja.labs.tables import save_egfr_table
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate the precomputed eGFR table used by egfr_calculator and "
+        "stage_calculator. Run whenever the eGFR constants change."
+    )
+
+    def handle(self, *args, **options):
+        egfrs, stages = generate_egfr_table()
+        save_egfr_table(egfrs, stages)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {egfrs.size} eGFRs to {EGFR_TABLE_PATH}.",
+            ),
+        )
@@ -0,0 +1,103 @@
+import hashlib
+from decimal import Decimal
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.constants import CkdEgfrCutoffs
+from gouthelper_ninja.constants import EgfrAlphas
+from gouthelper_ninja.constants import EgfrKappas
+from gouthelper_ninja.constants import EgfrSexModifiers
+from gouthelper_ninja.genders.choices import Genders
+
+EGFR_TABLE_PATH = Path(__file__).resolve().parent / "data" / "egfr_table.npz"
+
+# Domain of the eGFR table. Creatinines are in hundredths of a mg/dL.
+EGFR_TABLE_CREATININES = range(50, 501)
+EGFR_TABLE_AGES = range(18, 121)
+
+
+def egfr_constants_fingerprint() -> str:
+    """Returns a hash of the constants that the eGFR and stage calculations
+    depend on, which is stored with the table to detect when it's stale."""
+
+    constants = [
+        (enum.__name__, member.name, str(member.value))
+        for enum in (CkdEgfrCutoffs, EgfrAlphas, EgfrKappas, EgfrSexModifiers)
+        for member in enum
+    ]
+    return hashlib.sha256(repr(constants).encode()).hexdigest()
+
+
+class EgfrTable:
+    """Precomputed eGFRs for every creatinine, age, and gender in the table's
+    domain, indexed [gender, age, creatinine], and the Stage for every eGFR
+    up to the table's highest."""
+
+    def __init__(self, egfrs: np.ndarray, stages: np.ndarray):
+        self.egfrs = egfrs
+        self.stages = stages
+
+    def egfr(self, creatinine: Decimal, age: int, gender: Genders) -> int | None:
+        """Returns the eGFR for the creatinine, age, and gender, or None if
+        they're outside of the table."""
+
+        hundredths = creatinine * 100
+        if (
+            hundredths != hundredths.to_integral_value()
+            or int(hundredths) not in EGFR_TABLE_CREATININES
+            or age not in EGFR_TABLE_AGES
+            or gender not in Genders.values
+        ):
+            return None
+        return int(
+            self.egfrs[
+                gender,
+                age - EGFR_TABLE_AGES.start,
+                int(hundredths) - EGFR_TABLE_CREATININES.start,
+            ],
+        )
+
+    def stage(self, egfr: Decimal) -> Stages | None:
+        """Returns the Stage for an integer eGFR, or None if it's outside of
+        the table."""
+
+        if egfr != egfr.to_integral_value() or not 0 <= egfr < len(self.stages):
+            return None
+        return Stages(self.stages[int(egfr)])
+
+
+def save_egfr_table(
+    egfrs: np.ndarray,
+    stages: np.ndarray,
+    path: Path = EGFR_TABLE_PATH,
+) -> None:
+    """Writes the eGFR table, with the fingerprint of the current
+    constants, to path."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        np.savez_compressed(
+            f,
+            egfrs=egfrs,
+            stages=stages,
+            fingerprint=np.array(egfr_constants_fingerprint()),
+        )
+    get_egfr_table.cache_clear()
+
+
+@cache
+def get_egfr_table(path: Path = EGFR_TABLE_PATH) -> EgfrTable | None:
+    """Loads the eGFR table the first time it's needed. Returns None if the
+    table doesn't exist or was generated from different constants, in which
+    case callers should calculate eGFRs with the formula."""
+
+    try:
+        with np.load(path) as data:
+            if str(data["fingerprint"]) != egfr_constants_fingerprint():
+                return None
+            return EgfrTable(egfrs=data["egfrs"], stages=data["stages"])
+    except FileNotFoundError:
+        return None
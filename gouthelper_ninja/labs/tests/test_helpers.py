@@ -1,16 +1,30 @@
 from decimal import Decimal
 
+import numpy as np
+import pytest
+
 from gouthelper_ninja.ckddetails.choices import Stages
 from gouthelper_ninja.constants import CkdEgfrCutoffs
 from gouthelper_ninja.constants import EgfrAlphas
 from gouthelper_ninja.constants import EgfrKappas
 from gouthelper_ninja.constants import EgfrSexModifiers
 from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.labs.helpers import BASELINE_CREATININE_MAX
+from gouthelper_ninja.labs.helpers import BASELINE_CREATININE_MIN
 from gouthelper_ninja.labs.helpers import BaselineCreatinineCalc
+from gouthelper_ninja.labs.helpers import batch_baseline_creatinines
+from gouthelper_ninja.labs.helpers import batch_creatinine_range_for_stage
+from gouthelper_ninja.labs.helpers import batch_egfr_calculator
+from gouthelper_ninja.labs.helpers import batch_stage_calculator
+from gouthelper_ninja.labs.helpers import creatinine_for_egfr
+from gouthelper_ninja.labs.helpers import creatinine_range_for_stage
 from gouthelper_ninja.labs.helpers import egfr_calculator
 from gouthelper_ninja.labs.helpers import egfr_range_for_stage
+from gouthelper_ninja.labs.helpers import generate_egfr_table
 from gouthelper_ninja.labs.helpers import get_sex_modifier_alpha_kappa
 from gouthelper_ninja.labs.helpers import stage_calculator
+from gouthelper_ninja.labs.tables import get_egfr_table
+from gouthelper_ninja.labs.tables import save_egfr_table
 
 
 class TestEgfrCalculator:
@@ -44,6 +58,63 @@ class TestEgfrCalculator:
         assert egfr == Decimal("57")
 
 
+class TestBatchEgfrCalculator:
+    """Checks that the vectorized calculators give exactly the same results
+    as egfr_calculator and stage_calculator."""
+
+    def test__matches_egfr_calculator(self):
+        creatinines = [Decimal(value) / 100 for value in range(50, 501)]
+        inputs = [
+            (creatinine, age, gender)
+            for gender in Genders
+            for age in range(18, 121, 9)
+            for creatinine in creatinines
+        ]
+        creatinines, ages, genders = zip(*inputs, strict=True)
+
+        egfrs = batch_egfr_calculator(creatinines, ages, genders)
+        stages = batch_stage_calculator(egfrs)
+
+        for (creatinine, age, gender), egfr, stage in zip(
+            inputs,
+            egfrs,
+            stages,
+            strict=True,
+        ):
+            expected = egfr_calculator(creatinine, age, gender, use_table=False)
+            assert egfr == expected, (creatinine, age, gender)
+            assert stage == stage_calculator(expected)
+
+    def test__accepts_floats(self):
+        egfrs = batch_egfr_calculator([1.2, 1.2], [45, 45], [0, 1])
+        assert egfrs.tolist() == [76, 57]
+
+    def test__near_half_falls_back_to_decimal(self, monkeypatch):
+        # With a tolerance of 0.5 every eGFR is recalculated with Decimals
+        monkeypatch.setattr(
+            "gouthelper_ninja.labs.helpers.BATCH_EGFR_ROUNDING_TOLERANCE",
+            0.5,
+        )
+        egfrs = batch_egfr_calculator(
+            [Decimal("1.2"), Decimal("0.8")],
+            [45, 30],
+            [Genders.FEMALE, Genders.MALE],
+        )
+        assert egfrs.tolist() == [57, 122]
+
+    def test__mismatched_lengths(self):
+        with pytest.raises(ValueError, match="same length"):
+            batch_egfr_calculator([Decimal("1.2")], [45, 50], [Genders.MALE])
+
+
+class TestBatchStageCalculator:
+    def test__cutoffs(self):
+        egfrs = [120, 90, 89, 60, 59, 30, 29, 15, 14, 0]
+        assert batch_stage_calculator(egfrs).tolist() == [
+            stage_calculator(Decimal(egfr)) for egfr in egfrs
+        ]
+
+
 class TestGetSexModifierAlphaKappa:
     def test_get_sex_modifier_alpha_kappa(self):
         # Test male constants
@@ -111,7 +182,8 @@ class TestBaselineCreatinineCalc:
         expected_max_egfr = 59
         assert calc.min_egfr == expected_min_egfr
         assert calc.max_egfr == expected_max_egfr
-        assert isinstance(calc.creat, Decimal)
+        assert isinstance(calc.min_creat, Decimal)
+        assert isinstance(calc.max_creat, Decimal)
 
     def test_baseline_creatinine_calc_sets_egfr_range(self):
         # Test that min_egfr and max_egfr are set from egfr_range_for_stage
@@ -175,3 +247,161 @@ class TestBaselineCreatinineCalc:
             result = calc.calculate()
             assert isinstance(result, Decimal)
             assert result > 0
+
+    def test_baseline_creatinine_calc_seed(self):
+        # Test that a seeded calculation is repeatable
+        results = {
+            BaselineCreatinineCalc(Stages.THREE, 45, Genders.MALE, seed=1).calculate()
+            for _ in range(3)
+        }
+        assert len(results) == 1
+        (result,) = results
+        calc = BaselineCreatinineCalc(Stages.THREE, 45, Genders.MALE)
+        assert calc.min_creat <= result <= calc.max_creat
+
+
+class TestCreatinineForEgfr:
+    def test__inverts_the_ckd_epi_equation(self):
+        # Creatinines either side of both kappas
+        creatinines = [Decimal("0.55"), Decimal("0.85"), Decimal("1.50"), Decimal("4")]
+        for gender in Genders:
+            for creatinine in creatinines:
+                sex_modifier, alpha, kappa = get_sex_modifier_alpha_kappa(gender)
+                egfr = (
+                    Decimal(142)
+                    * min(creatinine / kappa, Decimal("1.00")) ** alpha
+                    * max(creatinine / kappa, Decimal("1.00")) ** Decimal("-1.200")
+                    * Decimal("0.9938") ** 60
+                    * sex_modifier
+                )
+                (result,) = creatinine_for_egfr([float(egfr)], [60], [gender])
+                assert result == pytest.approx(float(creatinine))
+
+
+class TestCreatinineRangeForStage:
+    def test__matches_egfr_calculator(self):
+        """Test that every 2 decimal place creatinine within the range, and
+        none outside it, gives an eGFR in the stage's range."""
+        creatinines = [
+            Decimal(value) / 100
+            for value in range(
+                int(BASELINE_CREATININE_MIN * 100),
+                int(BASELINE_CREATININE_MAX * 100) + 1,
+            )
+        ]
+        for gender in Genders:
+            for age in (25, 60, 95):
+                egfrs = batch_egfr_calculator(
+                    creatinines,
+                    [age] * len(creatinines),
+                    [gender] * len(creatinines),
+                )
+                for stage in Stages.values:
+                    min_egfr, max_egfr = egfr_range_for_stage(stage)
+                    expected = [
+                        creatinine
+                        for creatinine, egfr in zip(creatinines, egfrs, strict=True)
+                        if min_egfr <= egfr <= max_egfr
+                    ]
+                    if not expected:
+                        with pytest.raises(ValueError, match="No creatinine"):
+                            creatinine_range_for_stage(stage, age, gender)
+                        continue
+                    assert creatinine_range_for_stage(stage, age, gender) == (
+                        expected[0],
+                        expected[-1],
+                    )
+
+    def test__batch_matches_scalar(self):
+        stages = [Stages.ONE, Stages.THREE, Stages.FIVE]
+        ages = [30, 45, 80]
+        genders = [Genders.MALE, Genders.FEMALE, Genders.MALE]
+        lows, highs = batch_creatinine_range_for_stage(stages, ages, genders)
+        for stage, age, gender, low, high in zip(
+            stages,
+            ages,
+            genders,
+            lows,
+            highs,
+            strict=True,
+        ):
+            assert creatinine_range_for_stage(stage, age, gender) == (
+                Decimal(str(low)),
+                Decimal(str(high)),
+            )
+
+
+class TestBatchBaselineCreatinines:
+    def test__within_stage_and_seeded(self):
+        stages = [Stages.TWO, Stages.THREE, Stages.FOUR] * 100
+        ages = list(range(30, 90, 2)) * 10
+        genders = [Genders.MALE, Genders.FEMALE] * 150
+
+        creatinines = batch_baseline_creatinines(stages, ages, genders, seed=42)
+
+        assert (
+            batch_stage_calculator(
+                batch_egfr_calculator(creatinines, ages, genders),
+            ).tolist()
+            == stages
+        )
+        assert (
+            creatinines == batch_baseline_creatinines(stages, ages, genders, seed=42)
+        ).all()
+
+
+class TestEgfrTable:
+    def test__table_is_current(self):
+        """Test that the committed eGFR table was generated from the current
+        constants. If this fails, run manage.py generate_egfr_table."""
+        table = get_egfr_table()
+        assert table is not None
+        egfrs, stages = generate_egfr_table()
+        assert np.array_equal(table.egfrs, egfrs)
+        assert np.array_equal(table.stages, stages)
+
+    def test__lookups_match_formula(self):
+        for gender in Genders:
+            for age in (18, 47, 120):
+                for creatinine in (Decimal("0.50"), Decimal("1.37"), Decimal("5")):
+                    egfr = egfr_calculator(creatinine, age, gender)
+                    assert egfr == egfr_calculator(
+                        creatinine,
+                        age,
+                        gender,
+                        use_table=False,
+                    )
+                    assert get_egfr_table().egfr(creatinine, age, gender) == egfr
+                    assert get_egfr_table().stage(egfr) == stage_calculator(egfr)
+
+    def test__out_of_table_inputs(self):
+        table = get_egfr_table()
+        for creatinine, age in [
+            (Decimal("0.49"), 45),
+            (Decimal("5.01"), 45),
+            (Decimal("1.234"), 45),
+            (Decimal("1.23"), 17),
+            (Decimal("1.23"), 121),
+        ]:
+            assert table.egfr(creatinine, age, Genders.MALE) is None
+            assert egfr_calculator(creatinine, age, Genders.MALE) == (
+                egfr_calculator(creatinine, age, Genders.MALE, use_table=False)
+            )
+        assert table.stage(Decimal("75.5")) is None
+        assert table.stage(Decimal(1000)) is None
+        assert stage_calculator(Decimal(1000)) == Stages.ONE
+
+    def test__stale_table_falls_back_to_formula(self, tmp_path, monkeypatch):
+        path = tmp_path / "egfr_table.npz"
+        egfrs, stages = generate_egfr_table()
+        save_egfr_table(np.zeros_like(egfrs), stages, path=path)
+        assert get_egfr_table(path) is not None
+
+        monkeypatch.setattr(
+            "gouthelper_ninja.labs.tables.egfr_constants_fingerprint",
+            lambda: "changed",
+        )
+        get_egfr_table.cache_clear()
+        assert get_egfr_table(path) is None
+        assert get_egfr_table(tmp_path / "missing.npz") is None
+        get_egfr_table.cache_clear()
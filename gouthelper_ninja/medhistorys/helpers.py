@@ -1,15 +1,20 @@
 from typing import TYPE_CHECKING
 from typing import Union
 
+from django.apps import apps
+
 from gouthelper_ninja.constants import MAX_MENOPAUSE_AGE
 from gouthelper_ninja.constants import MIN_MENOPAUSE_AGE
 from gouthelper_ninja.genders.choices import Genders
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from django.db.models import QuerySet
 
     from gouthelper_ninja.medhistorys.choices import MHTypes
     from gouthelper_ninja.medhistorys.models import MedHistory
+    from gouthelper_ninja.users.models import Patient
 
 
 def menopause_required(
@@ -42,3 +47,33 @@ def search_medhistorys_by_mhtype(
         if medhistorys
         else None
     )
+
+
+def index_medhistorys_by_mhtype(
+    medhistorys: Union["Iterable[MedHistory]", "QuerySet[MedHistory]"],
+) -> dict["MHTypes", "MedHistory"]:
+    """Returns a dict of MedHistory instances keyed by their mhtype. If there
+    is more than one of a type, the first one is kept, as with
+    search_medhistorys_by_mhtype."""
+
+    index = {}
+    for medhistory in medhistorys:
+        index.setdefault(medhistory.mhtype, medhistory)
+    return index
+
+
+def attach_medhistorys_by_mhtype(patients: "Iterable[Patient]") -> list["Patient"]:
+    """Fetches the MedHistorys of all the patients in a single query and sets
+    each Patient's medhistorys_by_mhtype index, so that get_medhistory
+    doesn't query the database. Returns the patients as a list."""
+
+    patients = list(patients)
+    indexes = {patient.id: {} for patient in patients}
+    for medhistory in apps.get_model("medhistorys.MedHistory").objects.filter(
+        patient_id__in=indexes,
+    ):
+        indexes[medhistory.patient_id].setdefault(medhistory.mhtype, medhistory)
+    for patient in patients:
+        # Populate the cached_property
+        patient.__dict__["medhistorys_by_mhtype"] = indexes[patient.id]
+    return patients
@@ -1,5 +1,52 @@
+from collections.abc import Iterable
+
 from .choices import MHTypes
 
+# Bit of each MHType in a Patient's medhistorys_mask. The bits are stored in the
+# database, so they must never change: add new MHTypes at the end.
+MHTYPE_BITS: dict[MHTypes, int] = {
+    mhtype: 1 << bit
+    for bit, mhtype in enumerate(
+        [
+            MHTypes.ANGINA,
+            MHTypes.ANTICOAGULATION,
+            MHTypes.BLEED,
+            MHTypes.CAD,
+            MHTypes.CHF,
+            MHTypes.CKD,
+            MHTypes.COLCHICINEINTERACTION,
+            MHTypes.DIABETES,
+            MHTypes.EROSIONS,
+            MHTypes.GASTRICBYPASS,
+            MHTypes.GOUT,
+            MHTypes.HEARTATTACK,
+            MHTypes.HEPATITIS,
+            MHTypes.HYPERTENSION,
+            MHTypes.HYPERURICEMIA,
+            MHTypes.IBD,
+            MHTypes.MENOPAUSE,
+            MHTypes.ORGANTRANSPLANT,
+            MHTypes.OSTEOPOROSIS,
+            MHTypes.PUD,
+            MHTypes.PAD,
+            MHTypes.STROKE,
+            MHTypes.TOPHI,
+            MHTypes.URATESTONES,
+            MHTypes.XOIINTERACTION,
+        ],
+    )
+}
+
+
+def mhtypes_mask(mhtypes: Iterable[MHTypes]) -> int:
+    """Returns the bitmask with the bit of each of the mhtypes set."""
+
+    mask = 0
+    for mhtype in mhtypes:
+        mask |= MHTYPE_BITS[mhtype]
+    return mask
+
+
 CV_DISEASES = [
     MHTypes.ANGINA,  # Angina
     MHTypes.CAD,  # Coronary Artery Disease
@@ -100,3 +147,10 @@ ULTAID_MEDHISTORYS: list[MHTypes] = [
     MHTypes.URATESTONES,  # Urate Stones
     MHTypes.XOIINTERACTION,  # XOI Interaction
 ]
+
+# Bitmasks of the lists, to check against a Patient's medhistorys_mask
+CV_DISEASES_MASK = mhtypes_mask(CV_DISEASES)
+FLAREAID_MEDHISTORYS_MASK = mhtypes_mask(FLAREAID_MEDHISTORYS)
+OTHER_NSAID_CONTRAS_MASK = mhtypes_mask(OTHER_NSAID_CONTRAS)
+PPXAID_MEDHISTORYS_MASK = mhtypes_mask(PPXAID_MEDHISTORYS)
+ULTAID_MEDHISTORYS_MASK = mhtypes_mask(ULTAID_MEDHISTORYS)
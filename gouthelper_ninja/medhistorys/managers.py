@@ -1,13 +1,121 @@
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
+from django.apps import apps
+from django.db import connection
+from django.db import transaction
+from django.db.models import F
 from django.db.models import Manager
+from django.utils import timezone
 
 from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
 from gouthelper_ninja.medhistorys.schema import MedHistoryEditSchema
+from gouthelper_ninja.users.helpers import get_patient_change_values
+from gouthelper_ninja.users.helpers import set_patient_changed
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from gouthelper_ninja.medhistorys.models import MedHistory
+    from gouthelper_ninja.users.models import Patient
+
+
+class MedHistoryManager(Manager):
+    def bulk_upsert(
+        self,
+        patient: "Patient",
+        histories: dict[MHTypes, bool],
+    ) -> list["MedHistory"]:
+        """Sets the history_of of each of the Patient's MedHistorys in
+        histories, creating those that don't exist, with a single
+        INSERT ... ON CONFLICT DO UPDATE on the unique (patient, mhtype)
+        constraint. Rows whose history_of is unchanged aren't updated. The
+        HistoricalMedHistory rows for the created and changed MedHistorys are
+        inserted in one batch, and the changed MedHistorys are returned."""
+
+        if not histories:
+            return []
+        opts = self.model._meta  # noqa: SLF001
+        table = connection.ops.quote_name(opts.db_table)
+        now = timezone.now()
+        # Sorting the mhtypes makes concurrent upserts lock rows in the same
+        # order, so they can't deadlock
+        rows = [
+            (uuid4(), now, now, mhtype, history_of, patient.id)
+            for mhtype, history_of in sorted(histories.items())
+        ]
+        new_ids = {row[0] for row in rows}
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows))
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} "  # noqa: S608
+                    "(id, created, modified, mhtype, history_of, patient_id) "
+                    f"VALUES {placeholders} "
+                    "ON CONFLICT (patient_id, mhtype) DO UPDATE SET "
+                    "history_of = EXCLUDED.history_of, "
+                    "modified = EXCLUDED.modified "
+                    f"WHERE {table}.history_of IS DISTINCT FROM EXCLUDED.history_of "
+                    "RETURNING id, created, modified, mhtype, history_of",
+                    [param for row in rows for param in row],
+                )
+                changed = [
+                    self.model(
+                        id=id_,
+                        created=created,
+                        modified=modified,
+                        mhtype=mhtype,
+                        history_of=history_of,
+                        patient=patient,
+                    )
+                    for id_, created, modified, mhtype, history_of in cursor.fetchall()
+                ]
+            if not changed:
+                return []
+
+            history_model = self.model.history.model
+            history_model.objects.bulk_create(
+                [
+                    history_model(
+                        history_date=now,
+                        history_user=history_model.get_default_history_user(
+                            medhistory,
+                        ),
+                        history_type="+" if medhistory.id in new_ids else "~",
+                        **{
+                            field.attname: getattr(medhistory, field.attname)
+                            for field in history_model.tracked_fields
+                        },
+                    )
+                    for medhistory in changed
+                ],
+            )
+
+            set_bits = clear_bits = 0
+            for medhistory in changed:
+                if medhistory.history_of:
+                    set_bits |= MHTYPE_BITS[medhistory.mhtype]
+                else:
+                    clear_bits |= MHTYPE_BITS[medhistory.mhtype]
+            change_values = get_patient_change_values()
+            apps.get_model("users.User").objects.filter(id=patient.id).update(
+                medhistorys_mask=F("medhistorys_mask")
+                .bitor(set_bits)
+                .bitand(
+                    ~clear_bits,
+                ),
+                **change_values,
+            )
+
+        patient.medhistorys_mask = (patient.medhistorys_mask | set_bits) & ~clear_bits
+        set_patient_changed(patient, change_values)
+        patient.__dict__.pop("medhistorys_by_mhtype", None)
+        # Swap the classes to the proxy models, as MedHistory.save does
+        for medhistory in changed:
+            medhistory.__class__ = apps.get_model(f"medhistorys.{medhistory.mhtype}")
+        return changed
+
 
 class AnginaManager(Manager):
     def get_queryset(self):
@@ -1,12 +1,15 @@
 from django.apps import apps
 from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.db.models import F
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from simple_history.models import HistoricalRecords
 
 from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
 from gouthelper_ninja.medhistorys.managers import AnginaManager
 from gouthelper_ninja.medhistorys.managers import AnticoagulationManager
 from gouthelper_ninja.medhistorys.managers import BleedManager
@@ -23,6 +26,7 @@ from gouthelper_ninja.medhistorys.managers import HepatitisManager
 from gouthelper_ninja.medhistorys.managers import HypertensionManager
 from gouthelper_ninja.medhistorys.managers import HyperuricemiaManager
 from gouthelper_ninja.medhistorys.managers import IbdManager
+from gouthelper_ninja.medhistorys.managers import MedHistoryManager
 from gouthelper_ninja.medhistorys.managers import MenopauseManager
 from gouthelper_ninja.medhistorys.managers import OrgantransplantManager
 from gouthelper_ninja.medhistorys.managers import OsteoporosisManager
@@ -37,6 +41,8 @@ from gouthelper_ninja.rules import add_object
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.rules import delete_object
 from gouthelper_ninja.rules import view_object
+from gouthelper_ninja.users.helpers import get_patient_change_values
+from gouthelper_ninja.users.helpers import set_patient_changed
 from gouthelper_ninja.utils.helpers import get_user_change
 from gouthelper_ninja.utils.models import GoutHelperModel
 
@@ -89,7 +95,7 @@ class MedHistory(
         editable=False,
     )
     history = HistoricalRecords(get_user=get_user_change)
-    objects = models.Manager()
+    objects = MedHistoryManager()
 
     edit_schema = MedHistoryEditSchema
 
@@ -97,6 +103,37 @@ class MedHistory(
         """Returns a string representation of the MedHistory object."""
         return f"{self.patient} - {self.get_mhtype_display()}: {self.history_of}"
 
+    def clear_patient_medhistorys_index(self) -> None:
+        """Clears the medhistorys_by_mhtype index of the Patient, if it's
+        cached on this instance, so that it's rebuilt on next access."""
+        patient = self._state.fields_cache.get("patient")
+        if patient is not None:
+            patient.__dict__.pop("medhistorys_by_mhtype", None)
+
+    def update_patient_medhistorys_mask(self, *, history_of: bool) -> None:
+        """Sets or clears this MedHistory's bit in the Patient's
+        medhistorys_mask, in the database and on the cached Patient, and
+        records the change to the Patient (see
+        users.helpers.get_patient_change_values) in the same query."""
+        bit = MHTYPE_BITS[self.mhtype]
+        values = get_patient_change_values()
+        apps.get_model("users.User").objects.filter(id=self.patient_id).update(
+            medhistorys_mask=(
+                F("medhistorys_mask").bitor(bit)
+                if history_of
+                else F("medhistorys_mask").bitand(~bit)
+            ),
+            **values,
+        )
+        patient = self._state.fields_cache.get("patient")
+        if patient is not None:
+            patient.medhistorys_mask = (
+                patient.medhistorys_mask | bit
+                if history_of
+                else patient.medhistorys_mask & ~bit
+            )
+            set_patient_changed(patient, values)
+
     def delete(
         self,
         *args,
@@ -104,9 +141,13 @@ class MedHistory(
     ):
         """Overwritten to change class before and after calling super().save()
         so Django-Simple-History updates the HistoricalMedHistory table."""
-        self.__class__ = MedHistory
-        super().delete(*args, **kwargs)
-        self.__class__ = apps.get_model(f"medhistorys.{self.mhtype}")
+        # The row and the Patient's medhistorys_mask are updated together
+        with transaction.atomic(savepoint=False):
+            self.__class__ = MedHistory
+            super().delete(*args, **kwargs)
+            self.__class__ = apps.get_model(f"medhistorys.{self.mhtype}")
+            self.update_patient_medhistorys_mask(history_of=False)
+        self.clear_patient_medhistorys_index()
 
     def get_absolute_url(self):
         return reverse("users:patient-detail", kwargs={"patient": self.patient.id})
@@ -118,9 +159,13 @@ class MedHistory(
     ):
         """Overwritten to change class before and after calling super().save()
         so Django-Simple-History updates the HistoricalMedHistory table."""
-        self.__class__ = MedHistory
-        super().save(*args, **kwargs)
-        self.__class__ = apps.get_model(f"medhistorys.{self.mhtype}")
+        # The row and the Patient's medhistorys_mask are updated together
+        with transaction.atomic(savepoint=False):
+            self.__class__ = MedHistory
+            super().save(*args, **kwargs)
+            self.__class__ = apps.get_model(f"medhistorys.{self.mhtype}")
+            self.update_patient_medhistorys_mask(history_of=self.history_of)
+        self.clear_patient_medhistorys_index()
 
 
 class Angina(MedHistory):
@@ -2,7 +2,12 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.helpers import attach_medhistorys_by_mhtype
+from gouthelper_ninja.medhistorys.helpers import index_medhistorys_by_mhtype
 from gouthelper_ninja.medhistorys.helpers import search_medhistorys_by_mhtype
+from gouthelper_ninja.medhistorys.tests.factories import MedHistoryFactory
+from gouthelper_ninja.users.tests.factories import PatientFactory
 
 
 class DummyMedHistory:
@@ -48,3 +53,31 @@ def test_search_medhistorys_by_mhtype_works_with_queryset_like(medhistory_types)
     queryset.__iter__.return_value = iter([mh1, mh2])
     result = search_medhistorys_by_mhtype(queryset, medhistory_types.TYPE_A)
     assert result is mh2
+
+
+def test_index_medhistorys_by_mhtype_keeps_first_of_each_type(medhistory_types):
+    mh1 = DummyMedHistory(medhistory_types.TYPE_A)
+    mh2 = DummyMedHistory(medhistory_types.TYPE_B)
+    mh3 = DummyMedHistory(medhistory_types.TYPE_A)
+    result = index_medhistorys_by_mhtype([mh2, mh1, mh3])
+    assert result == {medhistory_types.TYPE_A: mh1, medhistory_types.TYPE_B: mh2}
+
+
+def test_index_medhistorys_by_mhtype_returns_empty_dict_if_empty():
+    assert index_medhistorys_by_mhtype([]) == {}
+
+
+@pytest.mark.django_db
+def test_attach_medhistorys_by_mhtype(django_assert_num_queries):
+    patients = [PatientFactory() for _ in range(3)]
+    diabetes = MedHistoryFactory(patient=patients[0], mhtype=MHTypes.DIABETES)
+    for patient in patients:
+        patient.__dict__.pop("medhistorys_by_mhtype", None)
+
+    with django_assert_num_queries(1):
+        result = attach_medhistorys_by_mhtype(patients)
+        assert result == patients
+        assert patients[0].get_medhistory(MHTypes.DIABETES) == diabetes
+        for patient in patients:
+            assert patient.get_medhistory(MHTypes.GOUT) is not None
+            assert patient.get_medhistory(MHTypes.CKD) is None
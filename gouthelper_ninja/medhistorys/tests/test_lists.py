@@ -1,13 +1,16 @@
 from gouthelper_ninja.medhistorys.choices import MHTypes
 from gouthelper_ninja.medhistorys.lists import CV_DISEASES
+from gouthelper_ninja.medhistorys.lists import CV_DISEASES_MASK
 from gouthelper_ninja.medhistorys.lists import FLARE_MEDHISTORYS
 from gouthelper_ninja.medhistorys.lists import FLAREAID_MEDHISTORYS
 from gouthelper_ninja.medhistorys.lists import GOALURATE_MEDHISTORYS
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
 from gouthelper_ninja.medhistorys.lists import OTHER_NSAID_CONTRAS
 from gouthelper_ninja.medhistorys.lists import PPX_MEDHISTORYS
 from gouthelper_ninja.medhistorys.lists import PPXAID_MEDHISTORYS
 from gouthelper_ninja.medhistorys.lists import ULT_MEDHISTORYS
 from gouthelper_ninja.medhistorys.lists import ULTAID_MEDHISTORYS
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
 
 
 def test_cv_diseases_contents() -> None:
@@ -92,3 +95,17 @@ def test_ultaid_medhistorys_contents():
     assert MHTypes.HEPATITIS in ULTAID_MEDHISTORYS
     assert MHTypes.XOIINTERACTION in ULTAID_MEDHISTORYS
     assert MHTypes.GOUT not in ULTAID_MEDHISTORYS
+
+
+def test_mhtype_bits():
+    assert set(MHTYPE_BITS) == set(MHTypes)
+    assert sorted(MHTYPE_BITS.values()) == [1 << bit for bit in range(len(MHTypes))]
+    assert MHTYPE_BITS[MHTypes.ANGINA] == 1
+    assert MHTYPE_BITS[MHTypes.XOIINTERACTION] == 1 << 24
+
+
+def test_mhtypes_mask():
+    assert mhtypes_mask([]) == 0
+    assert mhtypes_mask([MHTypes.ANGINA, MHTypes.BLEED]) == 0b101  # noqa: PLR2004
+    for mhtype in MHTypes:
+        assert bool(CV_DISEASES_MASK & MHTYPE_BITS[mhtype]) == (mhtype in CV_DISEASES)
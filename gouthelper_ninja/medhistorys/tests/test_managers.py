@@ -1,6 +1,10 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import FLAREAID_MEDHISTORYS
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
 from gouthelper_ninja.medhistorys.models import Angina
 from gouthelper_ninja.medhistorys.models import Anticoagulation
 from gouthelper_ninja.medhistorys.models import Bleed
@@ -17,6 +21,7 @@ from gouthelper_ninja.medhistorys.models import Hepatitis
 from gouthelper_ninja.medhistorys.models import Hypertension
 from gouthelper_ninja.medhistorys.models import Hyperuricemia
 from gouthelper_ninja.medhistorys.models import Ibd
+from gouthelper_ninja.medhistorys.models import MedHistory
 from gouthelper_ninja.medhistorys.models import Menopause
 from gouthelper_ninja.medhistorys.models import Organtransplant
 from gouthelper_ninja.medhistorys.models import Osteoporosis
@@ -134,3 +139,72 @@ def test_manager_queryset_and_gh_create(model, factory, mhtype):
     created = model.objects.gh_create(data=schema, patient_id=patient.id)
     assert created.mhtype == mhtype
     assert model.objects.filter(pk=created.pk).exists()
+
+
+@pytest.mark.django_db
+class TestMedHistoryManagerBulkUpsert:
+    def test__creates_and_updates(self):
+        patient = PatientFactory(menopause="OMIT", diabetes=False)
+        diabetes = patient.diabetes
+        assert patient.get_medhistory(MHTypes.STROKE) is None
+
+        changed = MedHistory.objects.bulk_upsert(
+            patient,
+            {MHTypes.DIABETES: True, MHTypes.STROKE: True, MHTypes.GOUT: True},
+        )
+
+        # Gout was already True, so it isn't touched
+        assert {medhistory.mhtype for medhistory in changed} == {
+            MHTypes.DIABETES,
+            MHTypes.STROKE,
+        }
+        assert all(isinstance(medhistory, (Diabetes, Stroke)) for medhistory in changed)
+        assert MedHistory.objects.get(id=diabetes.id).history_of is True
+        stroke = patient.get_medhistory(MHTypes.STROKE)
+        assert stroke.history_of is True
+        assert list(
+            stroke.history.values_list("history_type", flat=True),
+        ) == ["+"]
+        assert list(
+            diabetes.history.order_by("history_date").values_list(
+                "history_type",
+                "history_of",
+            ),
+        ) == [("+", False), ("~", True)]
+        assert patient.gout.history.count() == 1
+        patient.refresh_from_db()
+        assert patient.medhistorys_mask == mhtypes_mask(
+            [MHTypes.DIABETES, MHTypes.GOUT, MHTypes.STROKE],
+        )
+
+    def test__clears_mask(self):
+        patient = PatientFactory(menopause="OMIT", stroke=True)
+
+        MedHistory.objects.bulk_upsert(patient, {MHTypes.STROKE: False})
+
+        assert patient.medhistorys_mask == mhtypes_mask([MHTypes.GOUT])
+        patient.refresh_from_db()
+        assert patient.medhistorys_mask == mhtypes_mask([MHTypes.GOUT])
+
+    def test__unchanged(self):
+        patient = PatientFactory(menopause="OMIT")
+        with CaptureQueriesContext(connection) as queries:
+            changed = MedHistory.objects.bulk_upsert(patient, {MHTypes.GOUT: True})
+        assert changed == []
+        # Only the INSERT, besides the transaction's SAVEPOINT and RELEASE
+        assert [
+            query["sql"] for query in queries if "SAVEPOINT" not in query["sql"]
+        ] == [queries[1]["sql"]]
+        assert queries[1]["sql"].startswith("INSERT")
+        assert patient.gout.history.count() == 1
+
+    def test__num_queries_does_not_scale(self):
+        patient = PatientFactory(menopause="OMIT")
+        with CaptureQueriesContext(connection) as single:
+            MedHistory.objects.bulk_upsert(patient, {MHTypes.ANGINA: True})
+        with CaptureQueriesContext(connection) as many:
+            MedHistory.objects.bulk_upsert(
+                patient,
+                dict.fromkeys(FLAREAID_MEDHISTORYS, True),
+            )
+        assert len(many) == len(single)
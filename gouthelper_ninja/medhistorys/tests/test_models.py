@@ -1,6 +1,12 @@
+from unittest.mock import patch
+
 import pytest
+from django.db import DatabaseError
 from django.db import IntegrityError
 
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
+from gouthelper_ninja.medhistorys.lists import OTHER_NSAID_CONTRAS_MASK
 from gouthelper_ninja.medhistorys.models import MedHistory
 from gouthelper_ninja.medhistorys.tests.factories import AnginaFactory
 from gouthelper_ninja.medhistorys.tests.factories import AnticoagulationFactory
@@ -88,3 +94,63 @@ def test_proxy_models_str():
         assert obj.patient.username in s
         assert str(obj.get_mhtype_display()) in s
         assert str(obj.history_of) in s
+
+
+@pytest.mark.django_db
+def test_save_and_delete_update_patient_medhistorys_mask():
+    patient = PatientFactory(menopause="OMIT")
+    gout_bit = MHTYPE_BITS[MHTypes.GOUT]
+    assert patient.medhistorys_mask == gout_bit
+    assert not patient.has_any_medhistorys(OTHER_NSAID_CONTRAS_MASK)
+
+    bleed = MedHistoryFactory(patient=patient, mhtype=MHTypes.BLEED, history_of=True)
+    bleed_bit = MHTYPE_BITS[MHTypes.BLEED]
+    assert patient.medhistorys_mask == gout_bit | bleed_bit
+    assert patient.has_any_medhistorys(OTHER_NSAID_CONTRAS_MASK)
+
+    bleed.history_of = False
+    bleed.save()
+    patient.refresh_from_db()
+    assert patient.medhistorys_mask == gout_bit
+
+    bleed.history_of = True
+    bleed.save()
+    bleed.delete()
+    patient.refresh_from_db()
+    assert patient.medhistorys_mask == gout_bit
+
+
+@pytest.mark.django_db(transaction=True)
+def test_save_and_delete_roll_back_with_medhistorys_mask():
+    """Outside of a request's transaction, a failed medhistorys_mask update
+    rolls back the MedHistory's save or delete too."""
+    patient = PatientFactory(menopause="OMIT")
+    bleed = MedHistoryFactory(patient=patient, mhtype=MHTypes.BLEED, history_of=True)
+
+    with patch.object(
+        MedHistory,
+        "update_patient_medhistorys_mask",
+        side_effect=DatabaseError,
+    ):
+        bleed.history_of = False
+        with pytest.raises(DatabaseError):
+            bleed.save()
+        assert MedHistory.objects.get(id=bleed.id).history_of is True
+
+        bleed_id = bleed.id
+        with pytest.raises(DatabaseError):
+            bleed.delete()
+        assert MedHistory.objects.filter(id=bleed_id).exists()
+
+
+@pytest.mark.django_db
+def test_patient_save_does_not_overwrite_medhistorys_mask():
+    patient = PatientFactory(menopause="OMIT")
+    stale = type(patient).objects.get(id=patient.id)
+    MedHistoryFactory(patient=patient, mhtype=MHTypes.BLEED, history_of=True)
+
+    stale.save()
+
+    stale.refresh_from_db()
+    assert stale.medhistorys_mask == patient.medhistorys_mask
+    assert stale.medhistorys_mask & MHTYPE_BITS[MHTypes.BLEED]
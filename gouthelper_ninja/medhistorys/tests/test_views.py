@@ -51,8 +51,9 @@ class TestMedHistoryCreateView(TestCase):
         response = self.client.post(url, data)
         assert response.status_code == HTTPStatus.FOUND
 
-        # Delete the diabetes cached_property
+        # Delete the diabetes and medhistorys_by_mhtype cached_propertys
         delattr(self.patient, "diabetes")
+        delattr(self.patient, "medhistorys_by_mhtype")
 
         assert self.patient.diabetes
         assert self.patient.diabetes.history_of is True
@@ -74,8 +75,9 @@ class TestMedHistoryCreateView(TestCase):
         assert isinstance(response, HttpResponseClientRefresh)
         assert response.status_code == HTTPStatus.OK
 
-        # Delete the diabetes cached_property
+        # Delete the diabetes and medhistorys_by_mhtype cached_propertys
         delattr(self.patient, "diabetes")
+        delattr(self.patient, "medhistorys_by_mhtype")
 
         assert self.patient.diabetes
         assert self.patient.diabetes.history_of is True
@@ -176,8 +178,9 @@ class TestMedHistoryUpdateView(TestCase):
         response = self.client.post(url, data)
         assert response.status_code == HTTPStatus.FOUND
 
-        # Delete the diabetes cached_property
+        # Delete the diabetes and medhistorys_by_mhtype cached_propertys
         delattr(self.patient, "diabetes")
+        delattr(self.patient, "medhistorys_by_mhtype")
 
         assert not self.patient.diabetes.history_of
 
@@ -198,8 +201,9 @@ class TestMedHistoryUpdateView(TestCase):
         assert isinstance(response, HttpResponseClientRefresh)
         assert response.status_code == HTTPStatus.OK
 
-        # Delete the diabetes cached_property
+        # Delete the diabetes and medhistorys_by_mhtype cached_propertys
         delattr(self.patient, "diabetes")
+        delattr(self.patient, "medhistorys_by_mhtype")
 
         assert not self.patient.diabetes.history_of
 
@@ -20,4 +20,5 @@ class PatientProfileAdmin(admin.ModelAdmin):
     list_display = (
         "user",
         "provider",
+        "creator",
     )
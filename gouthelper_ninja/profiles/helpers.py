@@ -1,12 +1,10 @@
+from collections import Counter
 from typing import TYPE_CHECKING
 
 from django.apps import apps
 from django.urls import reverse
 from django.utils import timezone
 
-from gouthelper_ninja.dateofbirths.querysets import annotate_patient_queryset_with_age
-from gouthelper_ninja.users.querysets import age_gender_filter
-
 if TYPE_CHECKING:
     from uuid import UUID
 
@@ -22,27 +20,41 @@ def get_provider_alias(
     age: int,
     gender: "Genders",
 ) -> int | None:
-    queryset = annotate_patient_queryset_with_age(
-        qs=apps.get_model("users.Patient")
-        .objects.select_related(
-            "dateofbirth",
-            "gender",
-            "patientprofile__provider",
-        )
-        .filter(
-            patientprofile__provider_id=provider_id,
-            created__date=timezone.localdate(),
-        ),
+    (alias,) = get_provider_aliases(
+        provider_id=provider_id,
+        ages_genders=[(age, gender)],
     )
+    return alias
+
 
-    # Count of related patients with the same age, gender, and created date
-    alias_conflicts = age_gender_filter(
-        qs=queryset,
-        age=age,
-        gender=gender,
-    ).count()
+def get_provider_aliases(
+    provider_id: "UUID",
+    ages_genders: list[tuple[int, "Genders"]],
+) -> list[int]:
+    """Allocates a provider_alias for each (age, gender) pair, in order, for
+    a batch of Patients being created for the provider today. Aliases come
+    from ProviderAliasCounter rows, which are incremented with a single
+    upsert, so concurrent creates never receive the same alias and Patients
+    within the batch with the same age and gender get consecutive aliases."""
+
+    increments = Counter(ages_genders)
+    counts = apps.get_model("profiles.ProviderAliasCounter").objects.increment(
+        provider_id=provider_id,
+        date=timezone.localdate(),
+        increments=increments,
+    )
 
-    return alias_conflicts + 1
+    # Each key's new count is its last alias, so hand out aliases in order
+    # starting from the count before this batch
+    next_aliases = {
+        age_gender: counts[age_gender] - increment + 1
+        for age_gender, increment in increments.items()
+    }
+    aliases = []
+    for age_gender in ages_genders:
+        aliases.append(next_aliases[age_gender])
+        next_aliases[age_gender] += 1
+    return aliases
 
 
 def get_user_change(instance, request, **kwargs):  # pylint:disable=W0613
@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING
+
+from django.db import connection
+from django.db.models import Manager
+
+if TYPE_CHECKING:
+    from datetime import date
+    from uuid import UUID
+
+    from gouthelper_ninja.genders.choices import Genders
+
+
+class ProviderAliasCounterManager(Manager):
+    def increment(
+        self,
+        provider_id: "UUID",
+        date: "date",
+        increments: dict[tuple[int, "Genders"], int],
+    ) -> dict[tuple[int, "Genders"], int]:
+        """Atomically adds each (age, gender) key's increment to the
+        provider's counter for the date and returns the new counts. Uses a
+        single INSERT ... ON CONFLICT DO UPDATE, so concurrent callers are
+        serialized on the counter rows and never receive the same count."""
+
+        if not increments:
+            return {}
+        table = connection.ops.quote_name(self.model._meta.db_table)  # noqa: SLF001
+        # Sorting the keys makes concurrent upserts lock rows in the same
+        # order, so they can't deadlock
+        keys = sorted(increments)
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(keys))
+        params = [
+            param
+            for age, gender in keys
+            for param in (provider_id, date, age, gender, increments[(age, gender)])
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (provider_id, date, age, gender, count) "  # noqa: S608
+                f"VALUES {values} "
+                "ON CONFLICT (provider_id, date, age, gender) "
+                f"DO UPDATE SET count = {table}.count + EXCLUDED.count "
+                "RETURNING age, gender, count",
+                params,
+            )
+            return {(age, gender): count for age, gender, count in cursor.fetchall()}
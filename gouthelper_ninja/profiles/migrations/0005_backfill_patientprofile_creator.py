@@ -0,0 +1,31 @@
+# Generated by Django 5.1.9 on 2026-10-17 23:45
+
+from django.db import migrations
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+
+def backfill_creator(apps, schema_editor):
+    """Sets each PatientProfile's creator to the history_user of its
+    User's first HistoricalUser record."""
+    HistoricalUser = apps.get_model("users", "HistoricalUser")
+    PatientProfile = apps.get_model("profiles", "PatientProfile")
+    PatientProfile.objects.filter(creator__isnull=True).update(
+        creator_id=Subquery(
+            HistoricalUser.objects.filter(id=OuterRef("user_id"))
+            .order_by("history_date")
+            .values("history_user_id")[:1],
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_patientprofile_creator'),
+        ('users', '0003_remove_historicalpatient_history_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_creator, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.9 on 2026-10-17 23:54
+
+from django.db import migrations
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import IntegerField
+from django.db.models import Max
+from django.db.models import Value
+from django.db.models.functions import TruncDate
+
+
+def backfill_provideraliascounter(apps, schema_editor):
+    """Creates a ProviderAliasCounter for each provider, created date, age
+    and gender of the existing provider Patients, set to the highest
+    provider_alias handed out for that key."""
+    PatientProfile = apps.get_model("profiles", "PatientProfile")
+    ProviderAliasCounter = apps.get_model("profiles", "ProviderAliasCounter")
+    rows = (
+        PatientProfile.objects.filter(
+            provider__isnull=False,
+            provider_alias__isnull=False,
+            user__dateofbirth__isnull=False,
+            user__gender__isnull=False,
+        )
+        .annotate(
+            date=TruncDate("user__created"),
+            # Age of the Patient on the day it was created
+            age=Func(
+                Value("year"),
+                Func(
+                    F("date"),
+                    F("user__dateofbirth__dateofbirth"),
+                    function="age",
+                ),
+                function="date_part",
+                output_field=IntegerField(),
+            ),
+            gender=F("user__gender__gender"),
+        )
+        .values("provider_id", "date", "age", "gender")
+        .annotate(count=Max("provider_alias"))
+        .order_by()
+    )
+    ProviderAliasCounter.objects.bulk_create(
+        [ProviderAliasCounter(**row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0006_provideraliascounter'),
+        ('dateofbirths', '0002_alter_dateofbirth_dateofbirth_and_more'),
+        ('genders', '0002_alter_gender_gender_alter_historicalgender_gender'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_provideraliascounter,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -4,7 +4,9 @@ from django.urls import reverse
 from django_extensions.db.models import TimeStampedModel
 from simple_history.models import HistoricalRecords
 
+from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.profiles.helpers import get_user_change
+from gouthelper_ninja.profiles.managers import ProviderAliasCounterManager
 from gouthelper_ninja.rules import add_object
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.rules import delete_object
@@ -55,6 +57,16 @@ class PatientProfile(Profile):
         blank=True,
         default=None,
     )
+    # The User who created the Patient, recorded once at creation so that
+    # permission checks don't have to search the Patient's history
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="created_patient_profiles",
+        null=True,
+        blank=True,
+        default=None,
+    )
     history = HistoricalRecords(get_user=get_user_change)
 
     class Meta(Profile.Meta):
@@ -75,6 +87,35 @@ class PatientProfile(Profile):
         }
 
 
+class ProviderAliasCounter(models.Model):
+    """Number of provider_aliases handed out for a provider's Patients
+    created on a date with a given age and gender. Incremented atomically
+    by the manager's increment method when Patients are created."""
+
+    provider = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    date = models.DateField()
+    age = models.IntegerField()
+    gender = models.IntegerField(choices=Genders.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = ProviderAliasCounterManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["provider", "date", "age", "gender"],
+                name="%(app_label)s_%(class)s_unique_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.provider_id} {self.date} {self.age} {self.gender}: {self.count}"
+
+
 class ProviderProfile(Profile):
     """Provider User Profile.
     Meant for providers who want to keep track of their patients GoutHelper data.
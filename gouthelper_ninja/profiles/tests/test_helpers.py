@@ -5,6 +5,7 @@ from freezegun import freeze_time
 
 from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.profiles.helpers import get_provider_alias
+from gouthelper_ninja.profiles.helpers import get_provider_aliases
 from gouthelper_ninja.users.tests.factories import PatientFactory
 from gouthelper_ninja.users.tests.factories import UserFactory
 
@@ -153,3 +154,35 @@ class TestGetProviderAlias:
         assert alias == 1, (
             "Alias should be 1 if the provider has no patients today matching criteria"
         )
+
+
+class TestGetProviderAliases:
+    @freeze_time("2023-10-26 12:00:00")
+    def test__numbers_batch_on_top_of_existing_patients(self):
+        provider = UserFactory()
+        PatientFactory(
+            provider=provider,
+            dateofbirth__dateofbirth=30,
+            gender__gender=Genders.MALE,
+        )
+
+        aliases = get_provider_aliases(
+            provider_id=provider.id,
+            ages_genders=[
+                (30, Genders.MALE),
+                (30, Genders.FEMALE),
+                (30, Genders.MALE),
+                (45, Genders.MALE),
+            ],
+        )
+        assert aliases == [2, 1, 3, 1]
+
+    @freeze_time("2023-10-26 12:00:00")
+    def test__single_query(self, django_assert_num_queries):
+        provider = UserFactory()
+
+        with django_assert_num_queries(1):
+            get_provider_aliases(
+                provider_id=provider.id,
+                ages_genders=[(age, Genders.MALE) for age in range(20, 40)],
+            )
@@ -0,0 +1,54 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.utils import timezone
+
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.profiles.models import PatientProfile
+from gouthelper_ninja.profiles.models import ProviderAliasCounter
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+backfill_migration = import_module(
+    "gouthelper_ninja.profiles.migrations.0005_backfill_patientprofile_creator",
+)
+counter_migration = import_module(
+    "gouthelper_ninja.profiles.migrations.0007_backfill_provideraliascounter",
+)
+
+
+def test__backfill_creator():
+    creator = UserFactory()
+    patient = PatientFactory(creator=creator)
+    patient_without_creator = PatientFactory()
+    PatientProfile.objects.update(creator=None)
+
+    backfill_migration.backfill_creator(apps, None)
+
+    assert PatientProfile.objects.get(user=patient).creator == creator
+    assert PatientProfile.objects.get(user=patient_without_creator).creator is None
+
+
+def test__backfill_provideraliascounter():
+    provider = UserFactory()
+    for _ in range(2):
+        PatientFactory(
+            provider=provider,
+            dateofbirth__dateofbirth=40,
+            gender__gender=Genders.MALE,
+        )
+    PatientFactory(provider=provider, dateofbirth__dateofbirth=50)
+    PatientFactory()
+    ProviderAliasCounter.objects.all().delete()
+
+    counter_migration.backfill_provideraliascounter(apps, None)
+
+    counter = ProviderAliasCounter.objects.get(provider=provider, age=40)
+    assert counter.gender == Genders.MALE
+    assert counter.date == timezone.localdate()
+    assert counter.count == 2  # noqa: PLR2004
+    assert ProviderAliasCounter.objects.get(provider=provider, age=50).count == 1
+    assert ProviderAliasCounter.objects.count() == 2  # noqa: PLR2004
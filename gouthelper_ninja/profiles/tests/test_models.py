@@ -1,9 +1,12 @@
 import pytest
 from django.db import IntegrityError
 from django.urls import reverse
+from django.utils import timezone
 
+from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.profiles.models import AdminProfile
 from gouthelper_ninja.profiles.models import PatientProfile
+from gouthelper_ninja.profiles.models import ProviderAliasCounter
 from gouthelper_ninja.profiles.models import ProviderProfile
 from gouthelper_ninja.users.tests.factories import UserFactory
 
@@ -139,3 +142,35 @@ class TestProviderProfile:
         provider_profile.save()
         expected_history_count = 2
         assert provider_profile.history.count() == expected_history_count
+
+
+class TestProviderAliasCounter:
+    def test_increment(self):
+        provider = UserFactory()
+        today = timezone.localdate()
+
+        counts = ProviderAliasCounter.objects.increment(
+            provider_id=provider.id,
+            date=today,
+            increments={(30, Genders.MALE): 2, (30, Genders.FEMALE): 1},
+        )
+        assert counts == {(30, Genders.MALE): 2, (30, Genders.FEMALE): 1}
+
+        counts = ProviderAliasCounter.objects.increment(
+            provider_id=provider.id,
+            date=today,
+            increments={(30, Genders.MALE): 1},
+        )
+        assert counts == {(30, Genders.MALE): 3}
+        assert ProviderAliasCounter.objects.count() == 2  # noqa: PLR2004
+
+    def test_increment_empty(self, django_assert_num_queries):
+        provider = UserFactory()
+
+        with django_assert_num_queries(0):
+            counts = ProviderAliasCounter.objects.increment(
+                provider_id=provider.id,
+                date=timezone.localdate(),
+                increments={},
+            )
+        assert counts == {}
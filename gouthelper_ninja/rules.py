@@ -18,6 +18,13 @@ if TYPE_CHECKING:
     from gouthelper_ninja.users.models import User
 
 
+def get_creator_id(patient: "User") -> UUID | None:
+    """Returns the id of the User who created the Patient, which is stored
+    on the Patient's PatientProfile, or None if there isn't one."""
+    profile = getattr(patient, "patientprofile", None)
+    return profile.creator_id if profile else None
+
+
 @rules.predicate
 def obj_not_none(_, obj: "Model") -> bool:
     """Returns True if the object is not None."""
@@ -33,13 +40,13 @@ def obj_patient_without_provider(_, obj: "Model"):
 @rules.predicate
 def obj_patient_without_creator(_, obj: "Model"):
     """Returns True if the object's Patient does not have a creator."""
-    return obj.patient.creator is None
+    return get_creator_id(obj.patient) is None
 
 
 @rules.predicate
 def obj_without_creator(_, obj: "Model"):
     """Returns True if the object does not have a creator."""
-    return obj.creator is None
+    return get_creator_id(obj) is None
 
 
 @rules.predicate
@@ -74,7 +81,8 @@ def user_is_obj_patients_provider(user: "User", obj: "Model"):
 
 @rules.predicate
 def user_is_obj_patients_creator(user: "User", obj: "Model"):
-    return obj.patient.creator == user
+    creator_id = get_creator_id(obj.patient)
+    return creator_id is not None and creator_id == user.id
 
 
 @rules.predicate
@@ -101,8 +109,8 @@ def user_is_obj_creator(user: "User", obj: "User") -> bool:
     """Returns True if the creator of the object (Patient) is the user.
     Need to ensure that the object is a Patient first."""
 
-    creator = getattr(obj, "creator", None)
-    return creator is not None and creator.id == user.id
+    creator_id = get_creator_id(obj)
+    return creator_id is not None and creator_id == user.id
 
 
 @rules.predicate
@@ -1,29 +1,111 @@
+from typing import Annotated
+from typing import Any
 from uuid import UUID
 
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse
+from django.http import HttpResponseNotModified
+from django.http import StreamingHttpResponse
+from ninja import Query
 from ninja import Router
+from ninja.conf import settings as ninja_settings
 from ninja.errors import AuthorizationError
 from ninja.errors import HttpError
 from ninja.security import django_auth
 
+from gouthelper_ninja.users.caches import get_cached_patient_schema
+from gouthelper_ninja.users.caches import set_cached_patient_schema
+from gouthelper_ninja.users.changes import get_patient_changes as get_changes
+from gouthelper_ninja.users.exporters import ExportFormat
+from gouthelper_ninja.users.exporters import export_patients
+from gouthelper_ninja.users.exporters import export_patients_qs
+from gouthelper_ninja.users.importers import import_patients
 from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.users.models import User
+from gouthelper_ninja.users.querysets import patient_medhistorys_prefetch
 from gouthelper_ninja.users.querysets import patient_qs
+from gouthelper_ninja.users.querysets import patient_schema_qs
 from gouthelper_ninja.users.rules import add_provider_patient
 from gouthelper_ninja.users.rules import change_patient
 from gouthelper_ninja.users.rules import view_patient
+from gouthelper_ninja.users.schema import PatientChangesSchema
 from gouthelper_ninja.users.schema import PatientEditSchema
+from gouthelper_ninja.users.schema import PatientImportSchema
+from gouthelper_ninja.users.schema import PatientPageSchema
 from gouthelper_ninja.users.schema import PatientSchema
+from gouthelper_ninja.utils.etags import check_if_match
+from gouthelper_ninja.utils.etags import get_not_modified
+from gouthelper_ninja.utils.etags import set_etag
+from gouthelper_ninja.utils.pagination import CursorPagination
+from gouthelper_ninja.utils.permissions import check_predicate
 
 router = Router()
 
 
-@router.get("/patients", response=list[PatientSchema], auth=[django_auth])
-def get_patients(request) -> list[Patient]:
-    return list(
-        patient_qs(
-            Patient.objects.filter(patientprofile__provider_id=request.user.id).all(),
+@router.get(
+    "/patients",
+    response=list[PatientSchema] | PatientPageSchema,
+    auth=[django_auth],
+)
+def get_patients(
+    request,
+    pagination: Query[CursorPagination.Input],
+) -> list[Patient] | dict[str, Any]:
+    """Returns the request user's Patients. If a cursor or page_size is
+    passed, a page of them is returned instead, with opaque next and previous
+    cursors. Either way, the Patients are loaded in a fixed number of
+    queries."""
+    patients = patient_schema_qs(
+        Patient.objects.filter(provider_id=request.user.id),
+    )
+    if pagination.cursor is None and pagination.page_size is None:
+        return list(patients.order_by(*CursorPagination.ordering))
+    return CursorPagination().paginate_queryset(patients, pagination)
+
+
+@router.get(
+    "/patients/changes",
+    response=PatientChangesSchema,
+    auth=[django_auth],
+)
+def get_patient_changes(
+    request,
+    since: str | None = None,
+    page_size: int | None = Query(None, ge=1),
+) -> dict[str, Any]:
+    """Returns the request user's Patients that changed since the cursor from
+    the previous response, and the ids of those that were removed from their
+    panel, so that clients can sync without re-fetching every Patient. A
+    request without a cursor returns all of the Patients."""
+    return get_changes(
+        provider_id=request.user.id,
+        cursor=since,
+        page_size=min(
+            page_size or ninja_settings.PAGINATION_PER_PAGE,
+            ninja_settings.PAGINATION_MAX_PER_PAGE_SIZE,
+        ),
+    )
+
+
+@router.get("/patients/export", auth=[django_auth])
+def export_provider_patients(
+    request,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+) -> StreamingHttpResponse:
+    """Streams the request user's Patients as NDJSON or CSV, with their
+    related models flattened. The Patients are read from the database in
+    chunks, so the response can be of any size."""
+    response = StreamingHttpResponse(
+        export_patients(
+            export_patients_qs(request.user.id),
+            export_format=export_format,
         ),
+        content_type="text/csv" if export_format == "csv" else "application/x-ndjson",
     )
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="patients.{export_format}"'
+    )
+    return response
 
 
 @router.post("/patients/create", response={200: PatientSchema})
@@ -46,7 +128,7 @@ def create_provider_patient(
     """
     if not User.objects.filter(id=provider_id).exists():
         raise HttpError(404, f"Provider with id: {provider_id} not found.")
-    if not add_provider_patient(request.user, provider_id):
+    if not check_predicate(add_provider_patient, request.user, provider_id):
         msg = (
             f"{request.user} does not have permission to create a "
             "patient for this provider."
@@ -58,29 +140,84 @@ def create_provider_patient(
     return Patient.objects.gh_create(data=data, provider_id=provider_id)
 
 
+@router.post(
+    "/patients/provider-import/{uuid:provider_id}",
+    response=PatientImportSchema,
+    auth=django_auth,
+)
+def import_provider_patients(request, provider_id: UUID) -> PatientImportSchema:
+    """
+    Create patients for a provider from an NDJSON (application/x-ndjson) or
+    CSV (text/csv) request body of PatientEditSchema records. The body is read
+    line by line and inserted in chunks. Rows that fail validation are
+    returned in errors with their row number, the rest are created.
+    """
+    if not User.objects.filter(id=provider_id).exists():
+        raise HttpError(404, f"Provider with id: {provider_id} not found.")
+    if not check_predicate(add_provider_patient, request.user, provider_id):
+        msg = (
+            f"{request.user} does not have permission to create "
+            "patients for this provider."
+        )
+        raise AuthorizationError(
+            403,
+            msg,
+        )
+    return import_patients(
+        request,
+        import_format="csv" if request.content_type == "text/csv" else "ndjson",
+        provider_id=provider_id,
+    )
+
+
 @router.get("/patients/{uuid:patient_id}", response={200: PatientSchema})
-def get_patient(request, patient_id: UUID) -> Patient:
+def get_patient(
+    request,
+    patient_id: UUID,
+    response: HttpResponse,
+) -> dict[str, Any] | HttpResponseNotModified:
+    """Returns the Patient's PatientSchema from the cache if possible, in which
+    case the MedHistorys aren't loaded. Returns 304 Not Modified if the
+    request's If-None-Match header matches the Patient's ETag."""
     try:
-        patient = patient_qs(Patient.objects.filter(id=patient_id)).get()
+        patient = patient_qs(Patient.objects.select_related("goutdetail")).get(
+            id=patient_id,
+        )
     except Patient.DoesNotExist as e:
         raise HttpError(404, f"Patient with id: {patient_id} not found") from e
-    if not view_patient(request.user, patient):
+    if not check_predicate(view_patient, request.user, patient):
         raise AuthorizationError(
             403,
             f"{request.user} does not have permission to view this patient.",
         )
-    return patient
+    not_modified = get_not_modified(request, patient)
+    if not_modified is not None:
+        return not_modified
+    data = get_cached_patient_schema(patient)
+    if data is None:
+        # Loaded with the same related models as patient_schema_qs
+        prefetch_related_objects([patient], patient_medhistorys_prefetch())
+        data = set_cached_patient_schema(patient)
+    set_etag(response, patient)
+    return data
 
 
 @router.post("/patients/update/{str:patient_id}", response=PatientSchema)
-def update_patient(request, patient_id: str, data: PatientEditSchema) -> Patient:
+def update_patient(
+    request,
+    patient_id: str,
+    data: PatientEditSchema,
+    response: HttpResponse,
+) -> Patient:
     patient: Patient = patient_qs(Patient.objects.filter(id=patient_id)).get()
     if not patient:
         raise HttpError(404, f"Patient with ID {patient_id} does not exist.")
-    if not change_patient(request.user, patient):
+    if not check_predicate(change_patient, request.user, patient):
         raise AuthorizationError(
             403,
             f"{request.user} does not have permission to edit this patient.",
         )
+    check_if_match(request, patient)
     patient.gh_update(data=data)
+    set_etag(response, patient)
     return patient
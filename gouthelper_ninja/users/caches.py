@@ -0,0 +1,78 @@
+"""Read-through cache of serialized PatientSchema payloads. The key of a
+Patient's payload includes the Patient's version, which every write to the
+Patient or its related models increments, so a payload is never served
+after the Patient changes and concurrent requests that miss the cache for
+the same version store identical payloads. Disabled unless
+settings.PATIENT_SCHEMA_CACHE_TIMEOUT is set."""
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from gouthelper_ninja.users.schema import PatientSchema
+
+if TYPE_CHECKING:
+    from gouthelper_ninja.users.models import Patient
+
+HITS_KEY = "patient-schema:hits"
+MISSES_KEY = "patient-schema:misses"
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_patient_schema_key(patient: "Patient") -> str:
+    """Returns the key of the payload for the Patient's current version."""
+
+    return f"patient-schema:{patient.id}:{patient.version}"
+
+
+def get_cached_patient_schema(patient: "Patient") -> dict[str, Any] | None:
+    """Returns the Patient's cached payload, or None if it isn't cached or
+    the cache is disabled. Only the Patient's version is needed, so the
+    Patient doesn't have to be loaded with its related models."""
+
+    if not settings.PATIENT_SCHEMA_CACHE_TIMEOUT:
+        return None
+    data = cache.get(get_patient_schema_key(patient))
+    _count(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_cached_patient_schema(patient: "Patient") -> dict[str, Any]:
+    """Serializes the Patient, which should be loaded with patient_schema_qs,
+    and caches the payload, unless the cache is disabled."""
+
+    data = PatientSchema.from_orm(patient).model_dump(mode="json")
+    if settings.PATIENT_SCHEMA_CACHE_TIMEOUT:
+        cache.add(
+            get_patient_schema_key(patient),
+            data,
+            settings.PATIENT_SCHEMA_CACHE_TIMEOUT,
+        )
+    return data
+
+
+def get_patient_schema_data(patient: "Patient") -> dict[str, Any]:
+    """Returns the Patient's serialized PatientSchema, from the cache if
+    possible."""
+
+    data = get_cached_patient_schema(patient)
+    return data if data is not None else set_cached_patient_schema(patient)
+
+
+def get_patient_schema_cache_stats() -> dict[str, int]:
+    """Returns the number of hits and misses of the cache."""
+
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {
+        "hits": counts.get(HITS_KEY, 0),
+        "misses": counts.get(MISSES_KEY, 0),
+    }
@@ -0,0 +1,109 @@
+"""Incremental sync of a provider's Patients. Every write to a Patient or one
+of its related models sets the Patient's modified timestamp (see
+users.helpers.get_patient_change_values), so the Patients that changed
+since a cursor are found with a range query on it, and the Patients that
+left the provider's panel are found in the PatientProfile history."""
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from typing import Any
+from uuid import UUID
+
+from django.apps import apps
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.utils import timezone
+
+from gouthelper_ninja.users.querysets import patient_schema_qs
+from gouthelper_ninja.utils.pagination import Cursor
+from gouthelper_ninja.utils.pagination import decode_cursor
+from gouthelper_ninja.utils.pagination import encode_cursor
+
+if TYPE_CHECKING:
+    from gouthelper_ninja.users.models import Patient
+
+# Writes are timestamped before they commit, so a cursor never advances past
+# this long ago, in case a slow transaction commits an earlier timestamp.
+# Patients changed within the overlap may be returned twice.
+CHANGES_OVERLAP = timedelta(minutes=1)
+
+
+def get_removed_patient_ids(provider_id: UUID, since: Cursor) -> list[UUID]:
+    """Returns the ids of the Patients that were the provider's at the
+    cursor, or became the provider's after it, but have since been deleted
+    or moved to another provider."""
+
+    profile_model = apps.get_model("profiles.PatientProfile")
+    history_model = profile_model.history.model
+    changed = history_model.objects.filter(history_date__gt=since.created)
+    # The date of each Patient's last PatientProfile history at the cursor
+    last_date_at_cursor = Subquery(
+        history_model.objects.filter(
+            user_id=OuterRef("user_id"),
+            history_date__lte=since.created,
+        )
+        .order_by("-history_date")
+        .values("history_date")[:1],
+    )
+    return list(
+        history_model.objects.filter(provider_id=provider_id)
+        .filter(
+            Q(history_date__gt=since.created)
+            | Q(
+                user_id__in=changed.values("user_id"),
+                history_date=last_date_at_cursor,
+            ),
+        )
+        .exclude(
+            user_id__in=profile_model.objects.filter(
+                provider_id=provider_id,
+            ).values("user_id"),
+        )
+        # Clear the history's default ordering, which would defeat distinct()
+        .order_by()
+        .values_list("user_id", flat=True)
+        .distinct(),
+    )
+
+
+def get_patient_changes(
+    provider_id: UUID,
+    cursor: str | None,
+    page_size: int,
+) -> dict[str, Any]:
+    """Returns up to page_size of the provider's Patients that changed after
+    the cursor, ordered by (modified, id), the Patients removed from the
+    provider's panel, and the cursor for the next request. Without a cursor,
+    every Patient is returned. has_more indicates that the next request
+    should be made right away."""
+
+    started = timezone.now()
+    since = decode_cursor(cursor) if cursor else None
+    patient_model = apps.get_model("users.Patient")
+    patients = patient_schema_qs(
+        patient_model.objects.filter(provider_id=provider_id),
+    )
+    if since is not None:
+        patients = patients.filter(
+            Q(modified__gt=since.created) | Q(modified=since.created, id__gt=since.id),
+        )
+    # Fetch one extra row to find out if there are more changes
+    page: list[Patient] = list(patients.order_by("modified", "id")[: page_size + 1])
+    has_more = len(page) > page_size
+    page = page[:page_size]
+
+    if has_more:
+        next_cursor = Cursor(created=page[-1].modified, id=page[-1].id)
+    else:
+        next_cursor = Cursor(created=started - CHANGES_OVERLAP, id=UUID(int=0))
+        if since is not None and (since.created, since.id) > next_cursor[:2]:
+            next_cursor = since
+    return {
+        "patients": page,
+        "removed": (
+            get_removed_patient_ids(provider_id, since) if since is not None else []
+        ),
+        "cursor": encode_cursor(next_cursor),
+        "has_more": has_more,
+    }
@@ -0,0 +1,453 @@
+"""Synthetic cohorts of Providers and their Patients for capacity testing.
+Each batch of Patients is drawn with NumPy from a single seeded Generator, so
+a cohort is reproducible from its seed, ids included, and the objects are
+built without querying the database, except to allocate provider_aliases.
+The batches are meant to be written with users.loaders.copy_models.
+
+The distributions are rough approximations of a gout clinic's panel, not
+epidemiological estimates. Within each Patient the graph is consistent:
+females 40 to 59 have a Menopause MedHistory as PatientEditSchema requires,
+every CKD MedHistory has a CkdDetail, dialysis is only for stage V, and each
+BaselineCreatinine gives an eGFR in its CkdDetail's stage."""
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import numpy as np
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+
+from gouthelper_ninja.ckddetails.choices import DialysisChoices
+from gouthelper_ninja.ckddetails.choices import DialysisDurations
+from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.constants import MAX_MENOPAUSE_AGE
+from gouthelper_ninja.constants import MIN_MENOPAUSE_AGE
+from gouthelper_ninja.dateofbirths.querysets import dateofbirth_range
+from gouthelper_ninja.ethnicitys.choices import Ethnicitys
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.labs.helpers import batch_creatinine_range_for_stage
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
+from gouthelper_ninja.profiles.helpers import get_provider_aliases
+from gouthelper_ninja.users.choices import Roles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db.models import Model
+
+COHORT_BATCH_SIZE = 5000
+
+AGE_MEAN = 60
+AGE_SD = 14
+AGE_MIN = 18
+AGE_MAX = 100
+
+# Gout is about three times as common in men
+MALE_PROPORTION = 0.75
+
+ETHNICITY_WEIGHTS: dict[Ethnicitys, float] = {
+    Ethnicitys.AFRICANAMERICAN: 0.13,
+    Ethnicitys.CAUCASIAN: 0.55,
+    Ethnicitys.EASTAFRICAN: 0.01,
+    Ethnicitys.HANCHINESE: 0.05,
+    Ethnicitys.HISPANIC: 0.12,
+    Ethnicitys.HMONG: 0.01,
+    Ethnicitys.KOREAN: 0.02,
+    Ethnicitys.NATIVEAMERICAN: 0.01,
+    Ethnicitys.OTHER: 0.03,
+    Ethnicitys.PACIFICISLANDER: 0.02,
+    Ethnicitys.THAI: 0.01,
+    Ethnicitys.PREFERNOTTOANSWER: 0.04,
+}
+
+# Proportion of Patients of AGE_MEAN with a history of each MHType. Every
+# Patient has gout, and menopause depends on age and gender, so neither is
+# drawn from here.
+MHTYPE_PREVALENCES: dict[MHTypes, float] = {
+    MHTypes.ANGINA: 0.05,
+    MHTypes.ANTICOAGULATION: 0.08,
+    MHTypes.BLEED: 0.03,
+    MHTypes.CAD: 0.15,
+    MHTypes.CHF: 0.10,
+    MHTypes.CKD: 0.25,
+    MHTypes.COLCHICINEINTERACTION: 0.05,
+    MHTypes.DIABETES: 0.25,
+    MHTypes.EROSIONS: 0.08,
+    MHTypes.GASTRICBYPASS: 0.01,
+    MHTypes.HEARTATTACK: 0.10,
+    MHTypes.HEPATITIS: 0.03,
+    MHTypes.HYPERTENSION: 0.70,
+    MHTypes.HYPERURICEMIA: 0.10,
+    MHTypes.IBD: 0.01,
+    MHTypes.ORGANTRANSPLANT: 0.01,
+    MHTypes.OSTEOPOROSIS: 0.07,
+    MHTypes.PUD: 0.05,
+    MHTypes.PAD: 0.04,
+    MHTypes.STROKE: 0.08,
+    MHTypes.TOPHI: 0.12,
+    MHTypes.URATESTONES: 0.10,
+    MHTypes.XOIINTERACTION: 0.01,
+}
+
+# MHTypes whose prevalence scales with age / AGE_MEAN
+AGE_DEPENDENT_MHTYPES = {
+    MHTypes.ANGINA,
+    MHTypes.CAD,
+    MHTypes.CHF,
+    MHTypes.CKD,
+    MHTypes.DIABETES,
+    MHTypes.HEARTATTACK,
+    MHTypes.HYPERTENSION,
+    MHTypes.OSTEOPOROSIS,
+    MHTypes.PAD,
+    MHTypes.STROKE,
+}
+
+CKD_STAGE_WEIGHTS: dict[Stages, float] = {
+    Stages.ONE: 0.05,
+    Stages.TWO: 0.15,
+    Stages.THREE: 0.55,
+    Stages.FOUR: 0.15,
+    Stages.FIVE: 0.10,
+}
+
+# Proportion of stage V CkdDetails on dialysis
+DIALYSIS_PROPORTION = 0.5
+
+
+def generate_uuids(rng: np.random.Generator, n: int) -> list[UUID]:
+    """Returns n version 4 UUIDs drawn from rng."""
+
+    data = rng.bytes(16 * n)
+    return [UUID(bytes=data[i * 16 : (i + 1) * 16], version=4) for i in range(n)]
+
+
+def generate_dateofbirths(rng: np.random.Generator, ages: np.ndarray) -> list:
+    """Returns a date of birth, uniformly distributed over the year, for
+    someone of each age today."""
+
+    ranges = {age: dateofbirth_range(age, age) for age in np.unique(ages).tolist()}
+    fractions = rng.random(len(ages))
+    return [
+        earliest + (latest - earliest) * fraction
+        for (earliest, latest), fraction in zip(
+            (ranges[age] for age in ages.tolist()),
+            fractions.tolist(),
+            strict=True,
+        )
+    ]
+
+
+def generate_creatinines(
+    rng: np.random.Generator,
+    stages: np.ndarray,
+    ages: np.ndarray,
+    genders: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns a baseline creatinine, in hundredths of a mg/dL, for each
+    stage, age, and gender, and the stages. A stage that no creatinine gives
+    for the age and gender, such as stage V for a young man, is replaced by
+    the nearest one that some creatinine does."""
+
+    stages = stages.copy()
+    low, high = batch_creatinine_range_for_stage(stages, ages, genders)
+    for offset in (-1, 1, -2, 2, -3, 3, -4, 4):
+        infeasible = np.flatnonzero(low > high)
+        if not infeasible.size:
+            break
+        candidates = stages[infeasible] + offset
+        valid = (candidates >= Stages.ONE) & (candidates <= Stages.FIVE)
+        infeasible, candidates = infeasible[valid], candidates[valid]
+        candidate_low, candidate_high = batch_creatinine_range_for_stage(
+            candidates,
+            ages[infeasible],
+            genders[infeasible],
+        )
+        feasible = candidate_low <= candidate_high
+        stages[infeasible[feasible]] = candidates[feasible]
+        low[infeasible[feasible]] = candidate_low[feasible]
+        high[infeasible[feasible]] = candidate_high[feasible]
+    hundredths = rng.integers(
+        np.rint(low * 100).astype(np.int64),
+        np.rint(high * 100).astype(np.int64),
+        endpoint=True,
+    )
+    return hundredths, stages
+
+
+def generate_medhistorys(
+    rng: np.random.Generator,
+    ages: np.ndarray,
+    genders: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns a boolean array with a row for each age and gender and a column
+    for each MHType in MHTYPE_PREVALENCES, which is True where the Patient has
+    a history of the MHType, and boolean arrays of the Patients who need a
+    Menopause MedHistory and of those who are post-menopausal."""
+
+    age_factors = np.where(
+        [mhtype in AGE_DEPENDENT_MHTYPES for mhtype in MHTYPE_PREVALENCES],
+        ages[:, np.newaxis] / AGE_MEAN,
+        1.0,
+    )
+    histories = rng.random((len(ages), len(MHTYPE_PREVALENCES))) < np.minimum(
+        np.array(list(MHTYPE_PREVALENCES.values())) * age_factors,
+        0.95,
+    )
+    # Females 40 to 59 are asked about menopause, and become more likely to
+    # be post-menopausal with age. Older females are assumed to be.
+    menopause = (genders == Genders.FEMALE) & (ages >= MIN_MENOPAUSE_AGE)
+    postmenopausal = menopause & (
+        (ages >= MAX_MENOPAUSE_AGE)
+        | (
+            rng.random(len(ages))
+            < (ages - MIN_MENOPAUSE_AGE) / (MAX_MENOPAUSE_AGE - MIN_MENOPAUSE_AGE)
+        )
+    )
+    return histories, menopause, postmenopausal
+
+
+def generate_ckddetails(
+    rng: np.random.Generator,
+    ages: np.ndarray,
+    genders: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns arrays of the CkdDetail stage, dialysis, dialysis_type, and
+    dialysis_duration, and of the baseline creatinine in hundredths of a
+    mg/dL, for Patients with CKD of each age and gender. The type, duration,
+    and creatinine are only meaningful where dialysis is, respectively
+    isn't, True."""
+
+    size = len(ages)
+    stages = rng.choice(
+        list(CKD_STAGE_WEIGHTS),
+        size=size,
+        p=list(CKD_STAGE_WEIGHTS.values()),
+    )
+    dialysis = (stages == Stages.FIVE) & (rng.random(size) < DIALYSIS_PROPORTION)
+    dialysis_types = rng.choice(DialysisChoices.values, size=size)
+    dialysis_durations = rng.choice(DialysisDurations.values, size=size)
+    creatinines = np.zeros(size, dtype=np.int64)
+    creatinines[~dialysis], stages[~dialysis] = generate_creatinines(
+        rng,
+        stages[~dialysis],
+        ages[~dialysis],
+        genders[~dialysis],
+    )
+    return stages, dialysis, dialysis_types, dialysis_durations, creatinines
+
+
+def generate_patient_batch(
+    rng: np.random.Generator,
+    provider_id: UUID,
+    size: int,
+) -> dict[type["Model"], list["Model"]]:
+    """Draws size Patients for the provider, with their PatientProfiles and
+    related models, and returns the unsaved objects by model, in the order
+    that they must be written."""
+
+    user_model = apps.get_model("users.User")
+    profile_model = apps.get_model("profiles.PatientProfile")
+    dateofbirth_model = apps.get_model("dateofbirths.DateOfBirth")
+    ethnicity_model = apps.get_model("ethnicitys.Ethnicity")
+    gender_model = apps.get_model("genders.Gender")
+    medhistory_model = apps.get_model("medhistorys.MedHistory")
+    goutdetail_model = apps.get_model("goutdetails.GoutDetail")
+    ckddetail_model = apps.get_model("ckddetails.CkdDetail")
+    baselinecreatinine_model = apps.get_model("labs.BaselineCreatinine")
+
+    # Demographics
+    ages = np.clip(np.rint(rng.normal(AGE_MEAN, AGE_SD, size)), AGE_MIN, AGE_MAX)
+    ages = ages.astype(np.int64)
+    genders = np.where(
+        rng.random(size) < MALE_PROPORTION,
+        Genders.MALE,
+        Genders.FEMALE,
+    )
+    ethnicitys = rng.choice(
+        list(ETHNICITY_WEIGHTS),
+        size=size,
+        p=list(ETHNICITY_WEIGHTS.values()),
+    )
+    dateofbirths = generate_dateofbirths(rng, ages)
+
+    # MedHistorys, one column per MHType in MHTYPE_PREVALENCES
+    mhtypes = list(MHTYPE_PREVALENCES)
+    histories, menopause, postmenopausal = generate_medhistorys(rng, ages, genders)
+    masks = (
+        histories @ np.array([MHTYPE_BITS[mhtype] for mhtype in mhtypes])
+        | MHTYPE_BITS[MHTypes.GOUT]
+        | np.where(postmenopausal, MHTYPE_BITS[MHTypes.MENOPAUSE], 0)
+    )
+
+    # CkdDetails and BaselineCreatinines for the Patients with CKD
+    ckd = np.flatnonzero(histories[:, mhtypes.index(MHTypes.CKD)])
+    stages, dialysis, dialysis_types, dialysis_durations, creatinines = (
+        generate_ckddetails(rng, ages[ckd], genders[ckd])
+    )
+
+    # GoutDetails
+    on_ult = rng.random(size) < 0.45  # noqa: PLR2004
+    starting_ult = on_ult & (rng.random(size) < 0.3)  # noqa: PLR2004
+    on_ppx = starting_ult | (on_ult & (rng.random(size) < 0.2))  # noqa: PLR2004
+    at_goal_draws = rng.random(size)
+    at_goal_long_term = rng.random(size) < 0.5  # noqa: PLR2004
+    flaring_draws = rng.random(size)
+
+    patient_ids = generate_uuids(rng, size)
+    aliases = get_provider_aliases(
+        provider_id=provider_id,
+        ages_genders=list(zip(ages.tolist(), genders.tolist(), strict=True)),
+    )
+
+    batch: dict[type[Model], list[Model]] = {
+        model: []
+        for model in (
+            user_model,
+            profile_model,
+            dateofbirth_model,
+            ethnicity_model,
+            gender_model,
+            medhistory_model,
+            goutdetail_model,
+            ckddetail_model,
+            baselinecreatinine_model,
+        )
+    }
+    for i, patient_id in enumerate(patient_ids):
+        batch[user_model].append(
+            user_model(
+                id=patient_id,
+                role=Roles.PSEUDOPATIENT,
+                username=patient_id.hex[:30],
+                medhistorys_mask=int(masks[i]),
+                provider_id=provider_id,
+            ),
+        )
+        batch[profile_model].append(
+            profile_model(
+                user_id=patient_id,
+                provider_id=provider_id,
+                provider_alias=aliases[i],
+                creator_id=provider_id,
+            ),
+        )
+        batch[dateofbirth_model].append(
+            dateofbirth_model(patient_id=patient_id, dateofbirth=dateofbirths[i]),
+        )
+        batch[ethnicity_model].append(
+            ethnicity_model(patient_id=patient_id, ethnicity=str(ethnicitys[i])),
+        )
+        batch[gender_model].append(
+            gender_model(patient_id=patient_id, gender=int(genders[i])),
+        )
+        batch[medhistory_model].append(
+            medhistory_model(
+                patient_id=patient_id,
+                mhtype=MHTypes.GOUT,
+                history_of=True,
+            ),
+        )
+        batch[medhistory_model].extend(
+            medhistory_model(patient_id=patient_id, mhtype=mhtype, history_of=True)
+            for mhtype in np.array(mhtypes)[histories[i]]
+        )
+        if menopause[i]:
+            batch[medhistory_model].append(
+                medhistory_model(
+                    patient_id=patient_id,
+                    mhtype=MHTypes.MENOPAUSE,
+                    history_of=bool(postmenopausal[i]),
+                ),
+            )
+        at_goal = (
+            bool(at_goal_draws[i] < 0.5)  # noqa: PLR2004
+            if on_ult[i]
+            else (False if at_goal_draws[i] < 0.5 else None)  # noqa: PLR2004
+        )
+        batch[goutdetail_model].append(
+            goutdetail_model(
+                patient_id=patient_id,
+                at_goal=at_goal,
+                at_goal_long_term=bool(at_goal and at_goal_long_term[i]),
+                flaring=(
+                    None
+                    if flaring_draws[i] < 0.1  # noqa: PLR2004
+                    else bool(flaring_draws[i] < 0.4)  # noqa: PLR2004
+                ),
+                on_ppx=bool(on_ppx[i]),
+                on_ult=bool(on_ult[i]),
+                starting_ult=bool(starting_ult[i]),
+            ),
+        )
+    for j, i in enumerate(ckd.tolist()):
+        batch[ckddetail_model].append(
+            ckddetail_model(
+                patient_id=patient_ids[i],
+                stage=int(stages[j]),
+                dialysis=bool(dialysis[j]),
+                dialysis_type=int(dialysis_types[j]) if dialysis[j] else None,
+                dialysis_duration=int(dialysis_durations[j]) if dialysis[j] else None,
+            ),
+        )
+        if not dialysis[j]:
+            batch[baselinecreatinine_model].append(
+                baselinecreatinine_model(
+                    patient_id=patient_ids[i],
+                    value=Decimal(int(creatinines[j])).scaleb(-2),
+                ),
+            )
+
+    # Draw the ids of the related objects last, so that adding a model
+    # doesn't change the ids of the others
+    for model, objs in batch.items():
+        if model is not user_model:
+            for obj, obj_id in zip(objs, generate_uuids(rng, len(objs)), strict=True):
+                obj.id = obj_id
+    return batch
+
+
+def generate_cohort(
+    providers: int,
+    patients_per_provider: int,
+    seed: int | None = None,
+    batch_size: int = COHORT_BATCH_SIZE,
+) -> "Iterator[dict[type[Model], list[Model]]]":
+    """Yields the Providers, with their ProviderProfiles, and then batches of
+    at most batch_size of each Provider's Patients. Batches are generated
+    as they are consumed, so a cohort of any size can be written in constant
+    memory. The Providers' passwords are unusable."""
+
+    rng = np.random.default_rng(seed)
+    user_model = apps.get_model("users.User")
+    profile_model = apps.get_model("profiles.ProviderProfile")
+
+    provider_ids = generate_uuids(rng, providers)
+    yield {
+        user_model: [
+            user_model(
+                id=provider_id,
+                role=Roles.PROVIDER,
+                username=f"cohort-{provider_id.hex[:20]}",
+                password=make_password(None),
+            )
+            for provider_id in provider_ids
+        ],
+        profile_model: [
+            profile_model(id=profile_id, user_id=provider_id)
+            for provider_id, profile_id in zip(
+                provider_ids,
+                generate_uuids(rng, providers),
+                strict=True,
+            )
+        ],
+    }
+    for provider_id in provider_ids:
+        for start in range(0, patients_per_provider, batch_size):
+            yield generate_patient_batch(
+                rng,
+                provider_id,
+                min(batch_size, patients_per_provider - start),
+            )
@@ -0,0 +1,119 @@
+import csv
+import json
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Literal
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from gouthelper_ninja.goutdetails.schema import GoutDetailEditSchema
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
+from gouthelper_ninja.users.models import Patient
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from uuid import UUID
+
+    from django.db.models import QuerySet
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Fields of each one-to-one related model that are exported, by relation
+EXPORT_RELATED_FIELDS: dict[str, list[str]] = {
+    "dateofbirth": ["dateofbirth"],
+    "ethnicity": ["ethnicity"],
+    "gender": ["gender"],
+    "goutdetail": list(GoutDetailEditSchema.model_fields),
+    "ckddetail": ["dialysis", "dialysis_duration", "dialysis_type", "stage"],
+}
+
+# Column headers are dotted paths, the same as parse_csv in users.importers
+# reads, so that an export can be imported again
+EXPORT_COLUMNS: list[str] = [
+    "id",
+    *(
+        f"{relation}.{field}"
+        for relation, fields in EXPORT_RELATED_FIELDS.items()
+        for field in fields
+    ),
+    *(f"{mhtype.lower()}.history_of" for mhtype in MHTYPE_BITS),
+]
+
+
+class Echo:
+    """File-like object that returns what is written to it, so that
+    csv.writer can be used to build the rows of a streaming response."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_patients_qs(provider_id: "UUID | None" = None) -> "QuerySet[Patient]":
+    """Returns the Patients to export, with the related models that are
+    exported selected. The MedHistorys are read from medhistorys_mask, so
+    they aren't prefetched, and the QuerySet can be iterated with a
+    server-side cursor."""
+
+    qs = Patient.objects.select_related(*EXPORT_RELATED_FIELDS)
+    if provider_id is not None:
+        qs = qs.filter(provider_id=provider_id)
+    return qs.order_by("created", "id")
+
+
+def get_export_row(patient: Patient) -> dict[str, Any]:
+    """Flattens the Patient into a dict keyed by EXPORT_COLUMNS. Fields of a
+    related model that doesn't exist are None and each MHType is True if
+    the Patient has a history of it."""
+
+    row: dict[str, Any] = {"id": patient.id}
+    for relation, fields in EXPORT_RELATED_FIELDS.items():
+        obj = getattr(patient, relation, None)
+        for field in fields:
+            row[f"{relation}.{field}"] = getattr(obj, field) if obj else None
+    for mhtype, bit in MHTYPE_BITS.items():
+        row[f"{mhtype.lower()}.history_of"] = bool(patient.medhistorys_mask & bit)
+    return row
+
+
+def nest_row(row: dict[str, Any], sep: str = ".") -> dict[str, Any]:
+    """Nests the dotted columns of an export row, like parse_csv does, so
+    that NDJSON exports have the shape of PatientSchema records. sep="__"
+    nests the lookups of a QuerySet.values() row instead."""
+
+    record: dict[str, Any] = {}
+    for column, value in row.items():
+        *parents, field = column.split(sep)
+        nested = record
+        for parent in parents:
+            nested = nested.setdefault(parent, {})
+        nested[field] = value
+    return record
+
+
+def export_patients(
+    qs: "QuerySet[Patient]",
+    export_format: ExportFormat = "ndjson",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> "Iterator[str]":
+    """Yields the Patients in the QuerySet as NDJSON or CSV, one string per
+    chunk_size Patients. The QuerySet is iterated with a server-side cursor
+    and nothing is kept between chunks, so memory use doesn't grow with the
+    number of Patients."""
+
+    rows: Iterable[dict[str, Any]] = (
+        get_export_row(patient) for patient in qs.iterator(chunk_size=chunk_size)
+    )
+    if export_format == "csv":
+        writer = csv.DictWriter(Echo(), fieldnames=EXPORT_COLUMNS)
+        yield writer.writeheader()
+        while chunk := list(islice(rows, chunk_size)):
+            yield "".join(writer.writerow(row) for row in chunk)
+    else:
+        while chunk := list(islice(rows, chunk_size)):
+            yield "".join(
+                json.dumps(nest_row(row), cls=DjangoJSONEncoder) + "\n" for row in chunk
+            )
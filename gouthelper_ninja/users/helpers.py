@@ -1,4 +1,12 @@
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.db.models import F
 from django.urls import reverse
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from gouthelper_ninja.users.models import User
 
 
 def get_user_change(instance, request, **kwargs):  # pylint:disable=W0613
@@ -21,3 +29,17 @@ def get_user_change(instance, request, **kwargs):  # pylint:disable=W0613
                 return None
         return request.user
     return None
+
+
+def get_patient_change_values() -> dict[str, Any]:
+    """Returns the values for a User queryset update() that records a change
+    to a Patient or one of its related models, by incrementing the Patient's
+    version and setting its modified timestamp."""
+    return {"version": F("version") + 1, "modified": timezone.now()}
+
+
+def set_patient_changed(patient: "User", values: dict[str, Any]) -> None:
+    """Updates a loaded Patient after an update() with values from
+    get_patient_change_values. The new version is loaded if it's accessed."""
+    patient.__dict__.pop("version", None)
+    patient.modified = values["modified"]
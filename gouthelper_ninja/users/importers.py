@@ -0,0 +1,169 @@
+import csv
+import json
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Literal
+from typing import Union
+
+from django.db import DatabaseError
+from django.db import transaction
+from pydantic import ValidationError
+
+from gouthelper_ninja.users.loaders import copy_patients
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.schema import PatientEditSchema
+from gouthelper_ninja.users.schema import PatientImportErrorSchema
+from gouthelper_ninja.users.schema import PatientImportSchema
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from uuid import UUID
+
+ImportFormat = Literal["csv", "ndjson"]
+
+IMPORT_CHUNK_SIZE = 500
+
+
+def parse_ndjson(lines: "Iterable[str | bytes]") -> "Iterator[tuple[int, dict]]":
+    """Yields (row number, record) for each non-blank line of an NDJSON
+    stream. Lines that aren't a JSON object are yielded as a ValueError
+    so that they can be reported without aborting the import."""
+
+    for row, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield row, ValueError("Each line must be a JSON object.")
+            continue
+        yield row, record
+
+
+def parse_csv(lines: "Iterable[str]") -> "Iterator[tuple[int, dict]]":
+    """Yields (row number, record) for each row of a CSV stream. Column
+    headers are dotted paths into the PatientEditSchema, for example
+    "dateofbirth.dateofbirth" or "goutdetail.flaring". Empty cells are
+    left out of the record so that the Schema's defaults apply."""
+
+    for row, csv_row in enumerate(csv.DictReader(lines), start=1):
+        record = {}
+        for column, value in csv_row.items():
+            if column is None or value in (None, ""):
+                continue
+            *parents, field = column.strip().split(".")
+            nested = record
+            for parent in parents:
+                nested = nested.setdefault(parent, {})
+            nested[field] = value
+        yield row, record
+
+
+def format_validation_error(error: ValidationError) -> list[str]:
+    """Flattens a pydantic ValidationError into a list of messages."""
+
+    return [
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+        if err["loc"]
+        else err["msg"]
+        for err in error.errors(include_url=False)
+    ]
+
+
+def create_patients(
+    data: list[PatientEditSchema],
+    rows: list[int],
+    provider_id: Union["UUID", None] = None,
+    *,
+    copy: bool = False,
+) -> tuple[list["UUID"], list[PatientImportErrorSchema]]:
+    """Creates the Patients in data, whose row numbers are rows, in a
+    savepoint, and returns their ids and an empty list of errors. If the
+    database rejects them, the rows are split in half and each half is
+    created the same way, so that only the rows that the database rejects
+    on their own are reported, and the others are still created."""
+
+    try:
+        with transaction.atomic():
+            if copy:
+                return copy_patients(data, provider_id=provider_id), []
+            return [
+                patient.id
+                for patient in Patient.objects.gh_bulk_create(
+                    data=data,
+                    provider_id=provider_id,
+                )
+            ], []
+    except DatabaseError as e:
+        if len(data) == 1:
+            return [], [PatientImportErrorSchema(row=rows[0], errors=[str(e)])]
+    half = len(data) // 2
+    first_created, first_errors = create_patients(
+        data[:half],
+        rows[:half],
+        provider_id,
+        copy=copy,
+    )
+    last_created, last_errors = create_patients(
+        data[half:],
+        rows[half:],
+        provider_id,
+        copy=copy,
+    )
+    return first_created + last_created, first_errors + last_errors
+
+
+def import_patients(
+    lines: "Iterable[str | bytes]",
+    import_format: ImportFormat = "ndjson",
+    provider_id: Union["UUID", None] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    *,
+    copy: bool = False,
+) -> PatientImportSchema:
+    """Validates and creates Patients from an NDJSON or CSV stream of
+    PatientEditSchema records. Records are processed chunk_size at a time,
+    each chunk being inserted with Patient.objects.gh_bulk_create, or with
+    users.loaders.copy_patients if copy is True. Invalid rows, and rows that
+    the database rejects, are reported in the result's errors, ordered by
+    row, and don't stop the import."""
+
+    if import_format == "csv":
+        records = parse_csv(
+            line.decode() if isinstance(line, bytes) else line for line in lines
+        )
+    else:
+        records = parse_ndjson(lines)
+
+    result = PatientImportSchema()
+    while chunk := list(islice(records, chunk_size)):
+        rows = []
+        data = []
+        for row, record in chunk:
+            if isinstance(record, ValueError):
+                result.errors.append(
+                    PatientImportErrorSchema(row=row, errors=[str(record)]),
+                )
+                continue
+            try:
+                data.append(PatientEditSchema.model_validate(record))
+            except ValidationError as e:
+                result.errors.append(
+                    PatientImportErrorSchema(
+                        row=row,
+                        errors=format_validation_error(e),
+                    ),
+                )
+                continue
+            rows.append(row)
+        if not data:
+            continue
+        created, errors = create_patients(data, rows, provider_id, copy=copy)
+        result.created.extend(created)
+        result.errors.extend(errors)
+    result.errors.sort(key=lambda error: error.row)
+    return result
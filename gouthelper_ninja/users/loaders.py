@@ -0,0 +1,129 @@
+"""Fast path for loading large numbers of Patients, such as synthetic cohorts
+for capacity testing or migrated data. Rows, and the historical records that
+django-simple-history would create for them, are written with PostgreSQL's
+COPY FROM STDIN instead of INSERTs, in one transaction. As with bulk_create,
+save() isn't called and no signals are sent, so objects must be complete,
+with their UUIDs and any denormalized fields such as medhistorys_mask set,
+before they are loaded."""
+
+from enum import Enum
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.apps import apps
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+from simple_history.utils import get_change_reason_from_object
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from uuid import UUID
+
+    from django.db.models import Field
+    from django.db.models import Model
+
+    from gouthelper_ninja.users.schema import PatientEditSchema
+
+COPY_BATCH_SIZE = 10_000
+
+
+def get_copy_fields(model: type["Model"]) -> list["Field"]:
+    """Returns the model's columns that are written, which excludes those
+    the database generates, such as the history_id of historical models."""
+
+    return [
+        field
+        for field in model._meta.concrete_fields  # noqa: SLF001
+        if not field.db_returning
+    ]
+
+
+def _get_copy_value(field: "Field", obj: "Model") -> Any:
+    value = field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+    # psycopg writes Enums by name, but the Choices are stored by value
+    return value.value if isinstance(value, Enum) else value
+
+
+def copy_objects(cursor, model: type["Model"], objs: list["Model"]) -> None:
+    """Writes the objects to the model's table with COPY FROM STDIN, setting
+    fields such as created and modified as an INSERT would."""
+
+    fields = get_copy_fields(model)
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(quote_name(field.column) for field in fields)
+    sql = f"COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN"  # noqa: SLF001
+    # Raise Django's DatabaseErrors, as cursor.execute() does
+    with connection.wrap_database_errors, cursor.copy(sql) as copy:
+        for obj in objs:
+            copy.write_row([_get_copy_value(field, obj) for field in fields])
+
+
+def get_history_objects(model: type["Model"], objs: list["Model"]) -> list["Model"]:
+    """Returns the creation ("+") historical records that
+    bulk_create_with_history would create for the saved objects."""
+
+    history_model = model.history.model
+    history_date = timezone.now()
+    return [
+        history_model(
+            history_date=history_date,
+            history_user=history_model.get_default_history_user(obj),
+            history_change_reason=get_change_reason_from_object(obj),
+            history_type="+",
+            **{
+                field.attname: getattr(obj, field.attname)
+                for field in history_model.tracked_fields
+            },
+        )
+        for obj in objs
+    ]
+
+
+def copy_models(batches: "Iterable[dict[type[Model], list[Model]]]") -> int:
+    """Writes each batch, a dict of objects by model in the order they must
+    be written, and the objects' historical records, in one transaction.
+    Batches are consumed one at a time, so they can be generated lazily to
+    load any number of objects in constant memory. Returns the number of
+    objects written, not counting historical records."""
+
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for batch in batches:
+            for model, objs in batch.items():
+                if not objs:
+                    continue
+                copy_objects(cursor, model, objs)
+                copy_objects(
+                    cursor,
+                    model.history.model,
+                    get_history_objects(model, objs),
+                )
+                count += len(objs)
+    return count
+
+
+def copy_patients(
+    data: "Iterable[PatientEditSchema]",
+    provider_id: "UUID | None" = None,
+    batch_size: int = COPY_BATCH_SIZE,
+) -> list["UUID"]:
+    """Creates the same Patients, related models, and historical records as
+    Patient.objects.gh_bulk_create, with COPY, in one transaction, building
+    batch_size Patients at a time. Returns the ids of the Patients."""
+
+    patient_model = apps.get_model("users.Patient")
+    user_model = apps.get_model("users.User")
+    ids: list[UUID] = []
+
+    def batches() -> "Iterator[dict[type[Model], list[Model]]]":
+        records = iter(data)
+        while chunk := list(islice(records, batch_size)):
+            batch = patient_model.objects.gh_build(chunk, provider_id=provider_id)
+            ids.extend(patient.id for patient in batch[user_model])
+            yield batch
+
+    copy_models(batches())
+    return ids
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from gouthelper_ninja.users.exporters import EXPORT_CHUNK_SIZE
+from gouthelper_ninja.users.exporters import export_patients
+from gouthelper_ninja.users.exporters import export_patients_qs
+from gouthelper_ninja.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Export Patients, with their related models flattened into columns, "
+        "to an NDJSON or CSV file. Rows are streamed from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help='File to export to, or "-" to write to stdout.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Format of the file. Inferred from its extension if omitted.",
+        )
+        parser.add_argument(
+            "--provider",
+            help="Username of the Provider whose Patients to export. "
+            "Exports every Patient if omitted.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="Number of Patients to fetch from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        export_format = options["format"]
+        if export_format is None:
+            export_format = "csv" if path.lower().endswith(".csv") else "ndjson"
+
+        provider_id = None
+        if options["provider"]:
+            try:
+                provider_id = User.objects.get(username=options["provider"]).id
+            except User.DoesNotExist as e:
+                msg = f"Provider with username: {options['provider']} not found."
+                raise CommandError(msg) from e
+
+        chunks = export_patients(
+            export_patients_qs(provider_id),
+            export_format=export_format,
+            chunk_size=options["chunk_size"],
+        )
+        if path == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+        else:
+            with Path(path).open("w", newline="", encoding="utf-8") as f:
+                f.writelines(chunks)
+            self.stdout.write(self.style.SUCCESS(f"Exported patients to {path}."))
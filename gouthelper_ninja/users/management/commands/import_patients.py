@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from gouthelper_ninja.users.importers import IMPORT_CHUNK_SIZE
+from gouthelper_ninja.users.importers import import_patients
+from gouthelper_ninja.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Import Patients from an NDJSON or CSV file of PatientEditSchema "
+        "records. Invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help='File to import, or "-" to read from stdin.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Format of the file. Inferred from its extension if omitted.",
+        )
+        parser.add_argument(
+            "--provider",
+            help="Username of the Provider to create the Patients for.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help="Number of records to validate and insert at a time.",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Insert with PostgreSQL COPY, which is much faster for large files.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = options["format"]
+        if import_format is None:
+            import_format = "csv" if path.lower().endswith(".csv") else "ndjson"
+
+        provider_id = None
+        if options["provider"]:
+            try:
+                provider_id = User.objects.get(username=options["provider"]).id
+            except User.DoesNotExist as e:
+                msg = f"Provider with username: {options['provider']} not found."
+                raise CommandError(msg) from e
+
+        if path == "-":
+            result = self._import(sys.stdin, import_format, provider_id, options)
+        else:
+            try:
+                with Path(path).open(newline="", encoding="utf-8") as f:
+                    result = self._import(f, import_format, provider_id, options)
+            except FileNotFoundError as e:
+                msg = f"File not found: {path}"
+                raise CommandError(msg) from e
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error.row}: {'; '.join(error.errors)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(result.created)} patients "
+                f"({len(result.errors)} rows with errors).",
+            ),
+        )
+
+    def _import(self, lines, import_format, provider_id, options):
+        return import_patients(
+            lines,
+            import_format=import_format,
+            provider_id=provider_id,
+            chunk_size=options["chunk_size"],
+            copy=options["copy"],
+        )
@@ -1,21 +1,33 @@
+from collections import defaultdict
 from typing import TYPE_CHECKING
 from typing import Union
 from uuid import uuid4
 
 from django.apps import apps
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
+from simple_history.models import HistoricalRecords
+from simple_history.utils import bulk_create_with_history
 
-from gouthelper_ninja.profiles.helpers import get_provider_alias
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
+from gouthelper_ninja.profiles.helpers import get_provider_aliases
 from gouthelper_ninja.profiles.models import AdminProfile
 from gouthelper_ninja.profiles.models import PatientProfile
 from gouthelper_ninja.profiles.models import ProviderProfile
 from gouthelper_ninja.users.choices import Roles
+from gouthelper_ninja.users.helpers import get_user_change
+from gouthelper_ninja.users.querysets import PatientQuerySet
 from gouthelper_ninja.users.schema import PatientEditSchema
 from gouthelper_ninja.utils.helpers import age_calc
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from django.db.models import Model
+
+    from gouthelper_ninja.users.models import Patient
+
 
 class GoutHelperUserManager(BaseUserManager):
     """Custom User model manager for GoutHelper.
@@ -65,7 +77,7 @@ class AdminManager(GoutHelperUserManager):
         return user
 
 
-class PatientManager(GoutHelperUserManager):
+class PatientManager(GoutHelperUserManager.from_queryset(PatientQuerySet)):
     def get_queryset(self, *args, **kwargs):
         results = super().get_queryset(*args, **kwargs)
         return results.filter(role=Roles.PSEUDOPATIENT)
@@ -75,59 +87,145 @@ class PatientManager(GoutHelperUserManager):
         data: PatientEditSchema,
         provider_id: Union["UUID", None] = None,
     ):
-        dateofbirth = data.dateofbirth.dateofbirth
-        gender = data.gender.gender
+        (patient,) = self.gh_bulk_create(data=[data], provider_id=provider_id)
+        return patient
 
-        patient = super().create(
-            role=Roles.PSEUDOPATIENT,
-            username=uuid4().hex[:30],
-        )
+    def gh_build(
+        self,
+        data: list[PatientEditSchema],
+        provider_id: Union["UUID", None] = None,
+    ) -> dict[type["Model"], list["Model"]]:
+        """Builds, without saving, a User, with its PatientProfile and related
+        models, for each PatientEditSchema in data. Returns the unsaved
+        objects by model, in the order that they must be inserted."""
+
+        user_model = apps.get_model("users.User")
+        dateofbirth_model = apps.get_model("dateofbirths.DateOfBirth")
+        ethnicity_model = apps.get_model("ethnicitys.Ethnicity")
+        gender_model = apps.get_model("genders.Gender")
+        goutdetail_model = apps.get_model("goutdetails.GoutDetail")
+        medhistory_model = apps.get_model("medhistorys.MedHistory")
 
-        PatientProfile.objects.create(
-            provider_id=provider_id,
-            user=patient,
-            provider_alias=get_provider_alias(
+        patients = [
+            user_model(
+                role=Roles.PSEUDOPATIENT,
+                username=uuid4().hex[:30],
                 provider_id=provider_id,
-                age=age_calc(dateofbirth),
-                gender=gender,
+            )
+            for _ in data
+        ]
+
+        request = getattr(HistoricalRecords.context, "request", None)
+        provider_aliases = (
+            get_provider_aliases(
+                provider_id=provider_id,
+                ages_genders=[
+                    (
+                        age_calc(patient_data.dateofbirth.dateofbirth),
+                        patient_data.gender.gender,
+                    )
+                    for patient_data in data
+                ],
             )
             if provider_id
-            else None,
+            else [None] * len(data)
         )
 
-        # Create related models
-        apps.get_model("dateofbirths.DateOfBirth").objects.create(
-            patient=patient,
-            dateofbirth=dateofbirth,
-        )
-        apps.get_model("ethnicitys.Ethnicity").objects.create(
-            patient=patient,
-            ethnicity=data.ethnicity.ethnicity,
-        )
-        apps.get_model("genders.Gender").objects.create(
-            patient=patient,
-            gender=gender,
-        )
-        apps.get_model("medhistorys.Gout").objects.create(
-            patient=patient,
-            history_of=data.gout.history_of,
-        )
-        apps.get_model("goutdetails.GoutDetail").objects.create(
-            patient=patient,
-            at_goal=data.goutdetail.at_goal,
-            at_goal_long_term=data.goutdetail.at_goal_long_term,
-            flaring=data.goutdetail.flaring,
-            on_ppx=data.goutdetail.on_ppx,
-            on_ult=data.goutdetail.on_ult,
-            starting_ult=data.goutdetail.starting_ult,
-        )
-        menopause = data.menopause
-        if menopause:
-            apps.get_model("medhistorys.Menopause").objects.create(
-                patient=patient,
-                history_of=menopause.history_of,
+        related: defaultdict[type[Model], list[Model]] = defaultdict(list)
+        related[user_model] = patients
+        for patient, patient_data, provider_alias in zip(
+            patients,
+            data,
+            provider_aliases,
+            strict=True,
+        ):
+            related[PatientProfile].append(
+                PatientProfile(
+                    # Record the same User that django-simple-history sets as
+                    # the history_user of the Patient's first history record
+                    creator=get_user_change(patient, request),
+                    provider_id=provider_id,
+                    user=patient,
+                    provider_alias=provider_alias,
+                ),
             )
-        return patient
+            related[dateofbirth_model].append(
+                dateofbirth_model(
+                    patient=patient,
+                    dateofbirth=patient_data.dateofbirth.dateofbirth,
+                ),
+            )
+            related[ethnicity_model].append(
+                ethnicity_model(
+                    patient=patient,
+                    ethnicity=patient_data.ethnicity.ethnicity,
+                ),
+            )
+            related[gender_model].append(
+                gender_model(
+                    patient=patient,
+                    gender=patient_data.gender.gender,
+                ),
+            )
+            related[medhistory_model].append(
+                medhistory_model(
+                    mhtype=MHTypes.GOUT,
+                    patient=patient,
+                    history_of=patient_data.gout.history_of,
+                ),
+            )
+            related[goutdetail_model].append(
+                goutdetail_model(
+                    patient=patient,
+                    at_goal=patient_data.goutdetail.at_goal,
+                    at_goal_long_term=patient_data.goutdetail.at_goal_long_term,
+                    flaring=patient_data.goutdetail.flaring,
+                    on_ppx=patient_data.goutdetail.on_ppx,
+                    on_ult=patient_data.goutdetail.on_ult,
+                    starting_ult=patient_data.goutdetail.starting_ult,
+                ),
+            )
+            menopause = patient_data.menopause
+            if menopause:
+                related[medhistory_model].append(
+                    medhistory_model(
+                        mhtype=MHTypes.MENOPAUSE,
+                        patient=patient,
+                        history_of=menopause.history_of,
+                    ),
+                )
+
+        # Set the medhistorys_mask that MedHistory.save would maintain
+        for medhistory in related[medhistory_model]:
+            if medhistory.history_of:
+                medhistory.patient.medhistorys_mask |= MHTYPE_BITS[medhistory.mhtype]
+
+        return related
+
+    def gh_bulk_create(
+        self,
+        data: list[PatientEditSchema],
+        provider_id: Union["UUID", None] = None,
+    ) -> list["Patient"]:
+        """Creates a Patient, with its PatientProfile and related models, for
+        each PatientEditSchema in data. Each model's rows and their historical
+        records are inserted with bulk_create, so the number of queries is
+        fixed regardless of how many Patients are created. The historical
+        records are identical to those that saving each object would create."""
+
+        related = self.gh_build(data=data, provider_id=provider_id)
+        with transaction.atomic():
+            for model, objs in related.items():
+                bulk_create_with_history(objs, model)
+
+        # Swap the classes to the proxy models, as User.save and
+        # MedHistory.save do
+        patients = related[apps.get_model("users.User")]
+        for patient in patients:
+            patient.__class__ = self.model
+        for medhistory in related[apps.get_model("medhistorys.MedHistory")]:
+            medhistory.__class__ = apps.get_model(f"medhistorys.{medhistory.mhtype}")
+        return patients
 
     def create_user(self, username, email, password, role=Roles.PSEUDOPATIENT):
         """Create a provider user."""
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.9 on 2026-10-17 23:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+
+def backfill_provider(apps, schema_editor):
+    """Copies each PatientProfile's provider to its User."""
+    PatientProfile = apps.get_model("profiles", "PatientProfile")
+    User = apps.get_model("users", "User")
+    User.objects.filter(
+        id__in=PatientProfile.objects.filter(
+            provider__isnull=False,
+        ).values("user_id"),
+    ).update(
+        provider_id=Subquery(
+            PatientProfile.objects.filter(user_id=OuterRef("id")).values(
+                "provider_id",
+            )[:1],
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_remove_patientprofile_patientprofile_alias_required_for_provider_and_more'),
+        ('users', '0003_remove_historicalpatient_history_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='provider',
+            field=models.ForeignKey(blank=True, db_index=False, default=None, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_provider, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['provider', 'created', 'id'], name='user_provider_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.9 on 2026-10-18 00:08
+
+import django.db.models.expressions
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_user_provider'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='medhistorys_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(django.db.models.lookups.GreaterThan(django.db.models.expressions.CombinedExpression(models.F('medhistorys_mask'), '&', models.Value(3147801)), 0)), fields=['id'], name='user_cv_diseases_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(django.db.models.lookups.GreaterThan(django.db.models.expressions.CombinedExpression(models.F('medhistorys_mask'), '&', models.Value(557574)), 0)), fields=['id'], name='user_other_nsaid_contras_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.9 on 2026-10-18 00:10
+
+from collections import defaultdict
+
+from django.db import migrations
+
+# Copy of medhistorys.lists.MHTYPE_BITS when this migration was written, so
+# that the backfill doesn't change if the live mapping does
+MHTYPE_BITS = {
+    "ANGINA": 1 << 0,
+    "ANTICOAGULATION": 1 << 1,
+    "BLEED": 1 << 2,
+    "CAD": 1 << 3,
+    "CHF": 1 << 4,
+    "CKD": 1 << 5,
+    "COLCHICINEINTERACTION": 1 << 6,
+    "DIABETES": 1 << 7,
+    "EROSIONS": 1 << 8,
+    "GASTRICBYPASS": 1 << 9,
+    "GOUT": 1 << 10,
+    "HEARTATTACK": 1 << 11,
+    "HEPATITIS": 1 << 12,
+    "HYPERTENSION": 1 << 13,
+    "HYPERURICEMIA": 1 << 14,
+    "IBD": 1 << 15,
+    "MENOPAUSE": 1 << 16,
+    "ORGANTRANSPLANT": 1 << 17,
+    "OSTEOPOROSIS": 1 << 18,
+    "PUD": 1 << 19,
+    "PAD": 1 << 20,
+    "STROKE": 1 << 21,
+    "TOPHI": 1 << 22,
+    "URATESTONES": 1 << 23,
+    "XOIINTERACTION": 1 << 24,
+}
+
+
+def backfill_medhistorys_mask(apps, schema_editor):
+    """Sets each User's medhistorys_mask from its MedHistorys with
+    history_of True."""
+    MedHistory = apps.get_model("medhistorys", "MedHistory")
+    User = apps.get_model("users", "User")
+    masks = defaultdict(int)
+    for patient_id, mhtype in MedHistory.objects.filter(
+        history_of=True,
+    ).values_list("patient_id", "mhtype"):
+        masks[patient_id] |= MHTYPE_BITS[mhtype]
+    User.objects.bulk_update(
+        [User(id=patient_id, medhistorys_mask=mask) for patient_id, mask in masks.items()],
+        ["medhistorys_mask"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medhistorys', '0003_delete_pvd_pad_and_more'),
+        ('users', '0005_user_medhistorys_mask'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_medhistorys_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.9 on 2026-10-18 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['provider', 'modified', 'id'], name='user_provider_modified_idx'),
+        ),
+    ]
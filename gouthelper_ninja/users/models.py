@@ -3,10 +3,17 @@ from typing import Union
 
 from django.apps import apps
 from django.contrib.auth.models import AbstractUser
+from django.db.models import SET_NULL
+from django.db.models import BigIntegerField
 from django.db.models import CharField
 from django.db.models import CheckConstraint
+from django.db.models import F
+from django.db.models import ForeignKey
+from django.db.models import Index
 from django.db.models import IntegerField
+from django.db.models import PositiveBigIntegerField
 from django.db.models import Q
+from django.db.models.lookups import GreaterThan
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -14,7 +21,9 @@ from django_extensions.db.models import TimeStampedModel
 from simple_history.models import HistoricalRecords
 
 from gouthelper_ninja.medhistorys.choices import MHTypes
-from gouthelper_ninja.medhistorys.helpers import search_medhistorys_by_mhtype
+from gouthelper_ninja.medhistorys.helpers import index_medhistorys_by_mhtype
+from gouthelper_ninja.medhistorys.lists import CV_DISEASES_MASK
+from gouthelper_ninja.medhistorys.lists import OTHER_NSAID_CONTRAS_MASK
 from gouthelper_ninja.users.choices import Roles
 from gouthelper_ninja.users.helpers import get_user_change
 from gouthelper_ninja.users.managers import AdminManager
@@ -52,6 +61,36 @@ class User(
                 condition=(Q(role__in=Roles.values)),
             ),
         ]
+        # Partial indexes for the medhistorys_mask checks used to find cohorts
+        indexes = [
+            Index(
+                fields=["id"],
+                name="user_cv_diseases_idx",
+                condition=Q(
+                    GreaterThan(F("medhistorys_mask").bitand(CV_DISEASES_MASK), 0),
+                ),
+            ),
+            Index(
+                fields=["id"],
+                name="user_other_nsaid_contras_idx",
+                condition=Q(
+                    GreaterThan(
+                        F("medhistorys_mask").bitand(OTHER_NSAID_CONTRAS_MASK),
+                        0,
+                    ),
+                ),
+            ),
+            # Keyset orders of a provider's Patients, for paginating them and
+            # for finding those changed since a sync cursor
+            Index(
+                fields=["provider", "created", "id"],
+                name="user_provider_created_idx",
+            ),
+            Index(
+                fields=["provider", "modified", "id"],
+                name="user_provider_modified_idx",
+            ),
+        ]
         rules_permissions = {
             "change": change_user,
             "delete": delete_user,
@@ -66,10 +105,32 @@ class User(
     last_name = None  # type: ignore[assignment]
     # GoutHelper specific fields
     role = IntegerField(_("Role"), choices=Roles.choices, default=Roles.PROVIDER)
+    # Bitmask of the MHTypes (see medhistorys.lists.MHTYPE_BITS) of the
+    # Patient's MedHistorys with history_of True, maintained by MedHistory
+    medhistorys_mask = BigIntegerField(default=0, editable=False)
+    # Incremented, in the same transaction, by every write to the Patient or
+    # one of its related models, so that caches and clients can check if
+    # anything about the Patient changed by comparing a single integer. The
+    # same writes set modified, see users.helpers.get_patient_change_values
+    version = PositiveBigIntegerField(default=1, editable=False)
+    # Copy of the Patient's PatientProfile.provider, kept in sync by
+    # PatientManager.gh_build and users.signals, so that a provider's Patients
+    # can be filtered and ordered with an index on this table alone
+    provider = ForeignKey(
+        "self",
+        on_delete=SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        db_index=False,
+    )
     # GoutHelper managers and other attributes
     objects = GoutHelperUserManager()
     history = HistoricalRecords(
         get_user=get_user_change,
+        excluded_fields=["medhistorys_mask", "provider", "version"],
     )
 
     def get_absolute_url(self) -> str:
@@ -90,8 +151,37 @@ class User(
         # Swap the class back to User to trigger saving the
         # history model correctly (HistoricalUser)
         # and then change it back to the specific role model
+        # medhistorys_mask, provider, and version are updated in the database
+        # by MedHistory and the related models, so don't overwrite them with
+        # possibly stale values when updating the User
+        updating = not self._state.adding and not kwargs.get("force_insert")
+        # Deferred fields weren't loaded, so they aren't saved either, as
+        # Model.save does for deferred instances
+        if updating and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in {"medhistorys_mask", "provider", "version"}
+            ]
+        bump_version = updating and self.role in {
+            Roles.PATIENT,
+            Roles.PSEUDOPATIENT,
+        }
+        if bump_version:
+            self.version = F("version") + 1
+            kwargs["update_fields"] = [
+                *kwargs["update_fields"],
+                "version",
+                *(() if "modified" in kwargs["update_fields"] else ("modified",)),
+            ]
         self.__class__ = User
         super().save(*args, **kwargs)
+        if bump_version:
+            # Deferred, so that the new version is loaded if it's accessed
+            del self.version
         # The Pseudopatient role does not have a separate model,
         # so we need to change the class to Patient if the role is Pseudopatient.
         role = (
@@ -103,8 +193,12 @@ class User(
 
     @cached_property
     def creator(self) -> Union["User", None]:
-        """Returns the first history's history_user, which if
-        present, is the user that created this User instance."""
+        """Returns the User that created this User instance. For Patients,
+        this is recorded on the PatientProfile. Otherwise, it's the first
+        history's history_user, if present."""
+        profile = getattr(self, "patientprofile", None)
+        if profile is not None:
+            return profile.creator
         return (
             self.history.select_related(
                 "history_user",
@@ -149,16 +243,22 @@ class User(
             raise AttributeError(
                 msg,
             )
-        return (
-            search_medhistorys_by_mhtype(
-                self.medhistorys_qs,
-                mhtype,
-            )
+        return self.medhistorys_by_mhtype.get(mhtype)
+
+    def has_any_medhistorys(self, mask: int) -> bool:
+        """Whether the Patient has history_of any of the MHTypes in mask,
+        for example medhistorys.lists.OTHER_NSAID_CONTRAS_MASK."""
+        return bool(self.medhistorys_mask & mask)
+
+    @cached_property
+    def medhistorys_by_mhtype(self) -> dict["MHTypes", "MedHistory"]:
+        """Index of the Patient's MedHistorys by mhtype. Built once, from the
+        prefetched medhistorys_qs if present, otherwise with a single query.
+        Cleared when one of the Patient's MedHistorys is saved or deleted."""
+        return index_medhistorys_by_mhtype(
+            self.medhistorys_qs
             if hasattr(self, "medhistorys_qs")
-            else search_medhistorys_by_mhtype(
-                self.medhistory_set.all(),
-                mhtype,
-            )
+            else self.medhistory_set.all(),
         )
 
 
@@ -1,17 +1,39 @@
 from typing import TYPE_CHECKING
+from typing import Self
 
-if TYPE_CHECKING:
-    from django.db.models import QuerySet
+from django.apps import apps
+from django.db.models import F
+from django.db.models import Prefetch
+from django.db.models import QuerySet
+from django.db.models.lookups import Exact
+from django.db.models.lookups import GreaterThan
+
+from gouthelper_ninja.dateofbirths.querysets import age_range_filter
 
+if TYPE_CHECKING:
     from gouthelper_ninja.genders.choices import Genders
 
 
+class PatientQuerySet(QuerySet):
+    """QuerySet for Patients, filterable by their medhistorys_mask."""
+
+    def with_all_medhistorys(self, mask: int) -> Self:
+        """Filters to Patients with history_of all of the MHTypes in mask."""
+
+        return self.filter(Exact(F("medhistorys_mask").bitand(mask), mask))
+
+    def with_any_medhistorys(self, mask: int) -> Self:
+        """Filters to Patients with history_of any of the MHTypes in mask,
+        for example medhistorys.lists.CV_DISEASES_MASK."""
+
+        return self.filter(GreaterThan(F("medhistorys_mask").bitand(mask), 0))
+
+
 def age_gender_filter(qs: "QuerySet", age: int, gender: "Genders") -> "QuerySet":
-    """Filters a queryset of Patients by age and gender. Requires
-    that the queryset has been annotated with age"""
+    """Filters a queryset of Patients by age and gender. The age is
+    filtered as a range of dates of birth, so no age annotation is needed."""
 
-    return qs.filter(
-        age=age,
+    return age_range_filter(qs, min_age=age, max_age=age).filter(
         gender__gender=gender,
     )
 
@@ -39,3 +61,30 @@ def patient_qs(qs: "QuerySet") -> "QuerySet":
         "ethnicity",
         "gender",
     )
+
+
+def patient_medhistorys_prefetch() -> Prefetch:
+    """Returns the Prefetch of a Patient's MedHistory instances into the
+    medhistorys_qs attribute, from which User.medhistorys_by_mhtype builds
+    its index rather than querying the database."""
+
+    return Prefetch(
+        "medhistory_set",
+        queryset=apps.get_model("medhistorys.MedHistory").objects.all(),
+        to_attr="medhistorys_qs",
+    )
+
+
+def patient_medhistorys_qs(qs: "QuerySet") -> "QuerySet":
+    """Prefetches a Patient queryset's MedHistory instances, see
+    patient_medhistorys_prefetch."""
+
+    return qs.prefetch_related(patient_medhistorys_prefetch())
+
+
+def patient_schema_qs(qs: "QuerySet") -> "QuerySet":
+    """Selects and prefetches every related model required to serialize
+    a Patient queryset with PatientSchema, so that the number of queries
+    doesn't scale with the number of Patients."""
+
+    return patient_medhistorys_qs(patient_qs(qs).select_related("goutdetail"))
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 import rules
 
+from gouthelper_ninja.rules import get_creator_id
 from gouthelper_ninja.rules import user_id_is_obj
 from gouthelper_ninja.rules import user_is_admin
 from gouthelper_ninja.rules import user_is_anonymous
@@ -27,7 +28,7 @@ def obj_without_creator(_, obj: "User") -> bool:
     """Returns True if the object (Patient) does not have a creator.
     Need to ensure that the object is a Patient first."""
 
-    return getattr(obj, "creator", None) is None
+    return get_creator_id(obj) is None
 
 
 @rules.predicate
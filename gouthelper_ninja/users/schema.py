@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from ninja import Schema
 from pydantic import model_validator
 
@@ -40,3 +42,26 @@ class PatientEditSchema(
 
 class PatientSchema(PatientEditSchema, IdSchema):
     pass
+
+
+class PatientPageSchema(Schema):
+    items: list[PatientSchema]
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+
+class PatientChangesSchema(Schema):
+    patients: list[PatientSchema]
+    removed: list[UUID]
+    cursor: str
+    has_more: bool
+
+
+class PatientImportErrorSchema(Schema):
+    row: int
+    errors: list[str]
+
+
+class PatientImportSchema(Schema):
+    created: list[UUID] = []
+    errors: list[PatientImportErrorSchema] = []
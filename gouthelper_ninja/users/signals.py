@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+
+from gouthelper_ninja.ckddetails.models import CkdDetail
+from gouthelper_ninja.dateofbirths.models import DateOfBirth
+from gouthelper_ninja.ethnicitys.models import Ethnicity
+from gouthelper_ninja.genders.models import Gender
+from gouthelper_ninja.goutdetails.models import GoutDetail
+from gouthelper_ninja.labs.models import BaselineCreatinine
+from gouthelper_ninja.profiles.models import PatientProfile
+from gouthelper_ninja.users.helpers import get_patient_change_values
+from gouthelper_ninja.users.helpers import set_patient_changed
+from gouthelper_ninja.users.models import User
+
+# Models whose saves and deletes change their Patient. The User does so
+# itself in User.save, and MedHistory with its medhistorys_mask update, so
+# neither is connected. Receivers are connected with a sender, rather than
+# for every model, so that deletes of other models can still be fast deletes.
+PATIENT_VERSION_SENDERS = [
+    BaselineCreatinine,
+    CkdDetail,
+    DateOfBirth,
+    Ethnicity,
+    Gender,
+    GoutDetail,
+    PatientProfile,
+]
+
+
+def bump_patient_version(sender, instance, signal, **kwargs) -> None:
+    """Increments the version, and sets the modified timestamp, of the Patient
+    that the saved or deleted instance belongs to, in the same transaction.
+    For a PatientProfile, also copies its provider to the Patient."""
+
+    if kwargs.get("raw"):
+        return
+    values = get_patient_change_values()
+    if isinstance(instance, PatientProfile):
+        patient_id, cache_name = instance.user_id, "user"
+        values["provider_id"] = None if signal is post_delete else instance.provider_id
+    else:
+        patient_id, cache_name = instance.patient_id, "patient"
+    if patient_id is None:
+        return
+    User.objects.filter(id=patient_id).update(**values)
+    patient = instance._state.fields_cache.get(cache_name)  # noqa: SLF001
+    if patient is not None:
+        set_patient_changed(patient, values)
+        if "provider_id" in values:
+            patient.provider_id = values["provider_id"]
+
+
+for model in PATIENT_VERSION_SENDERS:
+    post_save.connect(bump_patient_version, sender=model)
+    post_delete.connect(bump_patient_version, sender=model)
@@ -162,8 +162,8 @@ class PatientFactory(UserFactory):
         extracted: User | UUID | None,
         **kwargs,
     ) -> None:
-        """Post-generation hook to set the creator of the patient, which is a
-        a field on the User's history model.
+        """Post-generation hook to set the creator of the patient, which is
+        a field on the PatientProfile and the User's first history.
 
         args:
             extracted (User | UUID | None): The user who created the patient."""
@@ -178,6 +178,8 @@ class PatientFactory(UserFactory):
                 )
                 last_history.history_user = user
                 last_history.save()
+                self.patientprofile.creator = user
+                self.patientprofile.save()
 
     @post_generation
     def angina(
@@ -3,17 +3,23 @@ from http import HTTPStatus
 from uuid import uuid4
 
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
 from django.test import RequestFactory
 from django.test import TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from gouthelper_ninja.ethnicitys.choices import Ethnicitys
 from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.users.caches import get_patient_schema_cache_stats
 from gouthelper_ninja.users.choices import Roles
 from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.users.tests.factories import PatientFactory
 from gouthelper_ninja.users.tests.factories import UserFactory
+from gouthelper_ninja.utils.etags import get_etag
 
 
 class TestCreatePatient(TestCase):
@@ -49,6 +55,7 @@ class TestCreatePatient(TestCase):
         assert str(patient.id) == response.json()["id"]
         assert patient.patientprofile.provider is None
         assert patient.patientprofile.provider_alias is None
+        assert patient.patientprofile.creator is None
         assert patient.dateofbirth.dateofbirth.strftime("%Y-%m-%d") == "2000-06-12"
         assert patient.ethnicity.ethnicity == "Caucasian"
         assert patient.gender.gender == 0
@@ -69,6 +76,7 @@ class TestCreatePatient(TestCase):
         assert patient.ethnicity.ethnicity == "Caucasian"
         assert patient.gender.gender == 0
         assert patient.creator == self.provider
+        assert patient.patientprofile.creator == self.provider
 
 
 class TestCreateProviderPatient(TestCase):
@@ -193,6 +201,124 @@ class TestCreateProviderPatient(TestCase):
         }
 
 
+class TestImportProviderPatients(TestCase):
+    def setUp(self):
+        self.provider = UserFactory()
+        self.record = {
+            "dateofbirth": {"dateofbirth": "2000-06-12"},
+            "ethnicity": {"ethnicity": "Caucasian"},
+            "gender": {"gender": 0},
+            "gout": {"history_of": True},
+            "goutdetail": {"flaring": False},
+        }
+        self.url = reverse(
+            "api-1.0.0:import_provider_patients",
+            kwargs={"provider_id": self.provider.id},
+        )
+
+    def test__auth_required(self):
+        response = self.client.post(
+            self.url,
+            data=json.dumps(self.record),
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test__ndjson(self):
+        self.client.force_login(self.provider)
+        body = "\n".join(
+            [
+                json.dumps(self.record),
+                json.dumps({**self.record, "gender": {"gender": 7}}),
+                json.dumps(self.record),
+            ],
+        )
+        response = self.client.post(
+            self.url,
+            data=body,
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert len(data["created"]) == 2  # noqa: PLR2004
+        assert [error["row"] for error in data["errors"]] == [2]
+        patients = Patient.objects.filter(id__in=data["created"])
+        assert {p.patientprofile.provider for p in patients} == {self.provider}
+        assert {p.creator for p in patients} == {self.provider}
+
+    def test__csv(self):
+        self.client.force_login(self.provider)
+        body = (
+            "dateofbirth.dateofbirth,ethnicity.ethnicity,gender.gender,"
+            "gout.history_of,goutdetail.flaring\n2000-06-12,Caucasian,0,True,False\n"
+        )
+        response = self.client.post(self.url, data=body, content_type="text/csv")
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()["created"]) == 1
+        assert response.json()["errors"] == []
+
+    def test__permissions(self):
+        other_provider = UserFactory()
+        self.client.force_login(other_provider)
+        response = self.client.post(
+            self.url,
+            data=json.dumps(self.record),
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not Patient.objects.exists()
+
+    def test__invalid_provider_id(self):
+        self.client.force_login(self.provider)
+        response = self.client.post(
+            reverse(
+                "api-1.0.0:import_provider_patients",
+                kwargs={"provider_id": uuid4()},
+            ),
+            data=json.dumps(self.record),
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestExportProviderPatients(TestCase):
+    def setUp(self):
+        self.provider = UserFactory()
+        self.patient = PatientFactory(provider=self.provider)
+        PatientFactory(provider=UserFactory())
+        self.url = reverse("api-1.0.0:export_provider_patients")
+
+    def test__auth_required(self):
+        assert self.client.get(self.url).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test__ndjson(self):
+        self.client.force_login(self.provider)
+        response = self.client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        assert [record["id"] for record in records] == [str(self.patient.id)]
+
+    def test__csv(self):
+        self.client.force_login(self.provider)
+        response = self.client.get(self.url, {"format": "csv"})
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "text/csv"
+        assert "patients.csv" in response["Content-Disposition"]
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 2  # noqa: PLR2004
+        assert lines[1].startswith(str(self.patient.id))
+
+    def test__invalid_format(self):
+        self.client.force_login(self.provider)
+        response = self.client.get(self.url, {"format": "xml"})
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 class TestGetPatient(TestCase):
     def setUp(self):
         self.anon = AnonymousUser()
@@ -291,10 +417,7 @@ class TestGetPatient(TestCase):
 
         # Test user who created a patient (but is not their provider)
         creator_user = UserFactory(role=Roles.PROVIDER)
-        created_patient = PatientFactory()
-        history = created_patient.history.first()
-        history.history_user = creator_user
-        history.save()
+        created_patient = PatientFactory(creator=creator_user)
         self.client.force_login(creator_user)
         created_patient_url = reverse(
             "api-1.0.0:get_patient",
@@ -312,6 +435,62 @@ class TestGetPatient(TestCase):
         assert response.status_code == HTTPStatus.OK
         assert response.json()["id"] == str(self.patient_with_provider.id)
 
+    @override_settings(PATIENT_SCHEMA_CACHE_TIMEOUT=60)
+    def test__cached(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as miss:
+            response = self.client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as hit:
+            cached_response = self.client.get(self.url)
+        assert cached_response.status_code == HTTPStatus.OK
+        assert cached_response.json() == response.json()
+        # The Patient is loaded once, and its MedHistorys only on a miss
+        hit_selects = [
+            query for query in hit.captured_queries if query["sql"].startswith("SELECT")
+        ]
+        miss_selects = [
+            query
+            for query in miss.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        assert len(hit_selects) == 1
+        assert len(miss_selects) == 2  # noqa: PLR2004
+        assert get_patient_schema_cache_stats() == {"hits": 1, "misses": 1}
+
+        ethnicity = self.patient.ethnicity
+        ethnicity.ethnicity = next(
+            value for value in Ethnicitys.values if value != ethnicity.ethnicity
+        )
+        ethnicity.save()
+        response = self.client.get(self.url)
+        assert response.json()["ethnicity"]["ethnicity"] == ethnicity.ethnicity
+
+    @override_settings(PATIENT_SCHEMA_CACHE_TIMEOUT=60)
+    def test__cached_permissions(self):
+        cache.clear()
+        self.client.force_login(self.provider)
+        assert self.client.get(self.provider_patient_url).status_code == HTTPStatus.OK
+        self.client.logout()
+        response = self.client.get(self.provider_patient_url)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test__etag(self):
+        response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        assert etag == get_etag(self.patient)
+
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert not response.content
+
+        # Any change to the Patient's related models changes the ETag
+        self.patient.goutdetail.save()
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["ETag"] != etag
+
 
 class TestGetPatients(TestCase):
     def setUp(self):
@@ -343,6 +522,97 @@ class TestGetPatients(TestCase):
         )
         assert response.status_code == HTTPStatus.OK
 
+    def test__returns_only_provider_patients(self):
+        provider_patient = PatientFactory(provider=self.provider)
+        PatientFactory(provider=UserFactory())
+        self.client.force_login(self.provider)
+
+        response = self.client.get(self.url)
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item["id"] for item in data] == [str(provider_patient.id)]
+        assert data[0]["gout"] == {"history_of": True}
+
+    def test__paginated_when_page_size_passed(self):
+        provider_patient = PatientFactory(provider=self.provider)
+        PatientFactory(provider=UserFactory())
+        self.client.force_login(self.provider)
+
+        response = self.client.get(self.url, {"page_size": 10})
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == [str(provider_patient.id)]
+        assert data["next_cursor"] is None
+        assert data["previous_cursor"] is None
+
+    def test__cursor_pagination(self):
+        patients = [PatientFactory(provider=self.provider) for _ in range(5)]
+        expected = [
+            str(patient.id)
+            for patient in sorted(patients, key=lambda p: (p.created, p.id))
+        ]
+        self.client.force_login(self.provider)
+
+        first = self.client.get(self.url, {"page_size": 2}).json()
+        assert [item["id"] for item in first["items"]] == expected[:2]
+        assert first["previous_cursor"] is None
+
+        second = self.client.get(
+            self.url,
+            {"page_size": 2, "cursor": first["next_cursor"]},
+        ).json()
+        assert [item["id"] for item in second["items"]] == expected[2:4]
+
+        third = self.client.get(
+            self.url,
+            {"page_size": 2, "cursor": second["next_cursor"]},
+        ).json()
+        assert [item["id"] for item in third["items"]] == expected[4:]
+        assert third["next_cursor"] is None
+
+        back = self.client.get(
+            self.url,
+            {"page_size": 2, "cursor": third["previous_cursor"]},
+        ).json()
+        assert [item["id"] for item in back["items"]] == expected[2:4]
+        assert back["next_cursor"] == second["next_cursor"]
+
+        start = self.client.get(
+            self.url,
+            {"page_size": 2, "cursor": back["previous_cursor"]},
+        ).json()
+        assert [item["id"] for item in start["items"]] == expected[:2]
+        assert start["previous_cursor"] is None
+
+    def test__invalid_cursor(self):
+        self.client.force_login(self.provider)
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {"detail": "Invalid cursor."}
+
+    def test__num_queries_does_not_scale_with_page_size(self):
+        for _ in range(2):
+            PatientFactory(provider=self.provider, menopause=True)
+        self.client.force_login(self.provider)
+        with CaptureQueriesContext(connection) as small_list:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(self.url, {"page_size": 10})
+
+        for _ in range(8):
+            PatientFactory(provider=self.provider, menopause=True)
+        with CaptureQueriesContext(connection) as large_list:
+            response = self.client.get(self.url)
+        assert len(response.json()) == 10  # noqa: PLR2004
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(self.url, {"page_size": 10})
+        assert len(response.json()["items"]) == 10  # noqa: PLR2004
+
+        assert len(large_list.captured_queries) == len(small_list.captured_queries)
+        assert len(large_page.captured_queries) == len(small_page.captured_queries)
+
 
 class TestUpdatePatient(TestCase):
     def setUp(self):
@@ -469,3 +739,28 @@ class TestUpdatePatient(TestCase):
         assert patient.goutdetail.on_ppx is True
         assert patient.goutdetail.on_ult is False
         assert patient.goutdetail.starting_ult is True
+
+    def test__if_match(self):
+        etag = self.client.get(
+            reverse("api-1.0.0:get_patient", kwargs={"patient_id": self.patient.id}),
+        ).headers["ETag"]
+        response = self.client.post(
+            self.url,
+            data=json.dumps(self.data),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["ETag"] != etag
+        assert response.headers["ETag"] == get_etag(
+            Patient.objects.get(id=self.patient.id),
+        )
+
+        # The ETag is now stale
+        response = self.client.post(
+            self.url,
+            data=json.dumps(self.data),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.PRECONDITION_FAILED
@@ -0,0 +1,47 @@
+import pytest
+from django.core.cache import cache
+
+from gouthelper_ninja.users.caches import get_cached_patient_schema
+from gouthelper_ninja.users.caches import get_patient_schema_cache_stats
+from gouthelper_ninja.users.caches import get_patient_schema_data
+from gouthelper_ninja.users.caches import get_patient_schema_key
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.querysets import patient_schema_qs
+from gouthelper_ninja.users.tests.factories import PatientFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def patient():
+    cache.clear()
+    patient = PatientFactory()
+    return patient_schema_qs(Patient.objects.filter(id=patient.id)).get()
+
+
+class TestPatientSchemaCache:
+    @pytest.fixture(autouse=True)
+    def _enable_cache(self, settings):
+        settings.PATIENT_SCHEMA_CACHE_TIMEOUT = 60
+
+    def test__read_through(self, patient):
+        data = get_patient_schema_data(patient)
+        assert data["id"] == str(patient.id)
+        assert get_cached_patient_schema(patient) == data
+        assert get_patient_schema_cache_stats() == {"hits": 1, "misses": 1}
+
+    def test__key_includes_version(self, patient):
+        key = get_patient_schema_key(patient)
+        patient.gender.save()
+        assert get_patient_schema_key(patient) != key
+
+    def test__changed_patient_misses(self, patient):
+        get_patient_schema_data(patient)
+        patient.dateofbirth.save()
+        assert get_cached_patient_schema(patient) is None
+
+
+def test__disabled(patient):
+    assert get_cached_patient_schema(patient) is None
+    assert get_patient_schema_data(patient)["id"] == str(patient.id)
+    assert get_patient_schema_cache_stats() == {"hits": 0, "misses": 0}
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+from gouthelper_ninja.users.changes import get_patient_changes
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _no_overlap(monkeypatch):
+    monkeypatch.setattr(
+        "gouthelper_ninja.users.changes.CHANGES_OVERLAP",
+        timedelta(0),
+    )
+
+
+@pytest.fixture
+def provider():
+    return UserFactory()
+
+
+class TestGetPatientChanges:
+    def test__without_cursor_returns_all_patients(self, provider):
+        patients = PatientFactory.create_batch(2, provider=provider)
+        PatientFactory(provider=UserFactory())
+
+        changes = get_patient_changes(provider.id, None, 10)
+
+        assert {patient.id for patient in changes["patients"]} == {
+            patient.id for patient in patients
+        }
+        assert changes["removed"] == []
+        assert not changes["has_more"]
+
+    def test__pages(self, provider):
+        patients = PatientFactory.create_batch(3, provider=provider)
+
+        first = get_patient_changes(provider.id, None, 2)
+        assert first["has_more"]
+        assert len(first["patients"]) == 2  # noqa: PLR2004
+        second = get_patient_changes(provider.id, first["cursor"], 2)
+        assert not second["has_more"]
+        assert {patient.id for patient in first["patients"] + second["patients"]} == {
+            patient.id for patient in patients
+        }
+
+    def test__returns_changed_patients(self, provider):
+        patient, _ = PatientFactory.create_batch(2, provider=provider)
+        cursor = get_patient_changes(provider.id, None, 10)["cursor"]
+
+        assert get_patient_changes(provider.id, cursor, 10)["patients"] == []
+        patient.gender.save()
+        changes = get_patient_changes(provider.id, cursor, 10)
+        assert [patient.id for patient in changes["patients"]] == [patient.id]
+
+    def test__returns_removed_patients(self, provider):
+        deleted, moved, _ = PatientFactory.create_batch(3, provider=provider)
+        cursor = get_patient_changes(provider.id, None, 10)["cursor"]
+
+        deleted_id = deleted.id
+        deleted.delete()
+        moved.patientprofile.provider = UserFactory()
+        moved.patientprofile.save()
+
+        changes = get_patient_changes(provider.id, cursor, 10)
+        assert sorted(changes["removed"]) == sorted([deleted_id, moved.id])
+        assert changes["patients"] == []
+
+    def test__omits_patients_removed_before_the_cursor(self, provider):
+        moved = PatientFactory(provider=provider)
+        moved.patientprofile.provider = UserFactory()
+        moved.patientprofile.save()
+        cursor = get_patient_changes(provider.id, None, 10)["cursor"]
+
+        moved.patientprofile.provider_alias += 1
+        moved.patientprofile.save()
+
+        assert get_patient_changes(provider.id, cursor, 10)["removed"] == []
+
+
+class TestGetPatientChangesAPI:
+    url = reverse("api-1.0.0:get_patient_changes")
+
+    def test__get(self, client, provider):
+        patient = PatientFactory(provider=provider)
+        client.force_login(provider)
+
+        response = client.get(self.url)
+        assert response.status_code == 200  # noqa: PLR2004
+        data = response.json()
+        assert [item["id"] for item in data["patients"]] == [str(patient.id)]
+        assert data["removed"] == []
+
+        response = client.get(self.url, {"since": data["cursor"]})
+        assert response.json()["patients"] == []
+
+    def test__invalid_cursor(self, client, provider):
+        client.force_login(provider)
+        assert client.get(self.url, {"since": "x"}).status_code == 400  # noqa: PLR2004
+
+    def test__unauthenticated(self, client):
+        assert client.get(self.url).status_code == 401  # noqa: PLR2004
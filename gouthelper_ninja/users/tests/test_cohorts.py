@@ -0,0 +1,158 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.ckddetails.models import CkdDetail
+from gouthelper_ninja.constants import MAX_MENOPAUSE_AGE
+from gouthelper_ninja.constants import MIN_MENOPAUSE_AGE
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.labs.helpers import batch_egfr_calculator
+from gouthelper_ninja.labs.helpers import batch_stage_calculator
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
+from gouthelper_ninja.medhistorys.models import MedHistory
+from gouthelper_ninja.profiles.models import ProviderProfile
+from gouthelper_ninja.users.choices import Roles
+from gouthelper_ninja.users.cohorts import generate_cohort
+from gouthelper_ninja.users.loaders import copy_models
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.models import User
+from gouthelper_ninja.users.querysets import patient_qs
+from gouthelper_ninja.utils.helpers import age_calc
+
+pytestmark = pytest.mark.django_db
+
+
+def get_patient_values(batches) -> list[tuple]:
+    users = next(iter(batches[1].values()))
+    return [(user.id, user.username, user.medhistorys_mask) for user in users] + [
+        (type(obj).__name__, obj.id, obj.patient_id)
+        for batch in batches[1:]
+        for objs in list(batch.values())[2:]
+        for obj in objs
+    ]
+
+
+def generate(**kwargs) -> list[dict]:
+    """Generates a cohort without writing it, except for its Providers, which
+    the Patients' provider_aliases need."""
+
+    batches = generate_cohort(**kwargs)
+    providers = next(batches)
+    if not User.objects.filter(id=providers[User][0].id).exists():
+        copy_models([providers])
+    return [providers, *batches]
+
+
+class TestGenerateCohort:
+    def test__reproducible_from_seed(self):
+        first = generate(providers=2, patients_per_provider=50, seed=7)
+        second = generate(providers=2, patients_per_provider=50, seed=7)
+        other = generate(providers=2, patients_per_provider=50, seed=8)
+
+        assert get_patient_values(first) == get_patient_values(second)
+        assert get_patient_values(first) != get_patient_values(other)
+
+    def test__batches(self):
+        batches = generate(providers=2, patients_per_provider=5, seed=1, batch_size=2)
+
+        providers, *patient_batches = batches
+        assert [len(objs) for objs in providers.values()] == [2, 2]
+        assert [len(next(iter(batch.values()))) for batch in patient_batches] == [
+            2,
+            2,
+            1,
+            2,
+            2,
+            1,
+        ]
+
+    def test__patients_are_consistent(self):
+        count = copy_models(
+            generate_cohort(providers=1, patients_per_provider=300, seed=3),
+        )
+
+        provider = User.objects.get(role=Roles.PROVIDER)
+        assert ProviderProfile.objects.filter(user=provider).exists()
+        assert not provider.has_usable_password()
+        patients = list(
+            patient_qs(Patient.objects.all()).select_related(
+                "goutdetail",
+                "ckddetail",
+                "baselinecreatinine",
+            ),
+        )
+        assert len(patients) == 300  # noqa: PLR2004
+        assert count > 300 * 6
+        assert all(patient.patientprofile.provider_alias for patient in patients)
+        medhistorys = {}
+        for medhistory in MedHistory.objects.all():
+            medhistorys.setdefault(medhistory.patient_id, []).append(medhistory)
+        ckd_patients = []
+        for patient in patients:
+            assert patient.patientprofile.provider == provider
+            assert patient.patientprofile.creator == provider
+            patient_medhistorys = {
+                medhistory.mhtype: medhistory for medhistory in medhistorys[patient.id]
+            }
+            assert patient_medhistorys[MHTypes.GOUT].history_of is True
+            assert patient.medhistorys_mask == mhtypes_mask(
+                [
+                    mhtype
+                    for mhtype, medhistory in patient_medhistorys.items()
+                    if medhistory.history_of
+                ],
+            )
+            # Menopause
+            age = age_calc(patient.dateofbirth.dateofbirth)
+            female = patient.gender.gender == Genders.FEMALE
+            menopause = patient_medhistorys.get(MHTypes.MENOPAUSE)
+            if female and MIN_MENOPAUSE_AGE <= age < MAX_MENOPAUSE_AGE:
+                assert menopause is not None
+            elif female and age >= MAX_MENOPAUSE_AGE:
+                assert menopause.history_of is True
+            else:
+                assert menopause is None
+            # GoutDetail
+            goutdetail = patient.goutdetail
+            assert not goutdetail.starting_ult or goutdetail.on_ult
+            assert not goutdetail.at_goal_long_term or goutdetail.at_goal
+            # CKD
+            if MHTypes.CKD in patient_medhistorys:
+                ckddetail = patient.ckddetail
+                if ckddetail.dialysis:
+                    assert ckddetail.stage == Stages.FIVE
+                    assert not hasattr(patient, "baselinecreatinine")
+                else:
+                    ckd_patients.append(patient)
+            else:
+                assert not CkdDetail.objects.filter(patient=patient).exists()
+        assert ckd_patients
+        stages = batch_stage_calculator(
+            batch_egfr_calculator(
+                [patient.baselinecreatinine.value for patient in ckd_patients],
+                [age_calc(patient.dateofbirth.dateofbirth) for patient in ckd_patients],
+                [patient.gender.gender for patient in ckd_patients],
+            ),
+        )
+        assert stages.tolist() == [patient.ckddetail.stage for patient in ckd_patients]
+
+
+class TestGenerateCohortCommand:
+    def test__generates_cohort(self, capsys):
+        call_command(
+            "generate_cohort",
+            providers=2,
+            patients_per_provider=10,
+            seed=5,
+            batch_size=4,
+        )
+
+        assert User.objects.filter(role=Roles.PROVIDER).count() == 2  # noqa: PLR2004
+        assert Patient.objects.count() == 20  # noqa: PLR2004
+        assert "Created 2 providers and 20 patients" in capsys.readouterr().out
+
+    def test__invalid_option(self):
+        with pytest.raises(CommandError, match="--providers must be positive"):
+            call_command("generate_cohort", providers=0)
@@ -0,0 +1,82 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError
+from django.core.management import call_command
+
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+from gouthelper_ninja.users.tests.test_importers import RECORD
+
+pytestmark = pytest.mark.django_db
+
+
+class TestImportPatients:
+    def test__imports_file(self, tmp_path):
+        provider = UserFactory()
+        path = tmp_path / "patients.ndjson"
+        path.write_text(
+            "\n".join([json.dumps(RECORD), "{not json", json.dumps(RECORD)]),
+        )
+        stdout = StringIO()
+        stderr = StringIO()
+
+        call_command(
+            "import_patients",
+            str(path),
+            provider=provider.username,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        assert "Created 2 patients (1 rows with errors)." in stdout.getvalue()
+        assert stderr.getvalue().startswith("Row 2: Invalid JSON")
+        assert (
+            Patient.objects.filter(patientprofile__provider=provider).count() == 2  # noqa: PLR2004
+        )
+
+    def test__unknown_provider(self, tmp_path):
+        path = tmp_path / "patients.ndjson"
+        path.write_text(json.dumps(RECORD))
+
+        with pytest.raises(CommandError, match="not found"):
+            call_command("import_patients", str(path), provider="nobody")
+
+
+class TestExportPatients:
+    def test__exports_file(self, tmp_path):
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+        PatientFactory(provider=UserFactory())
+        path = tmp_path / "patients.csv"
+        stdout = StringIO()
+
+        call_command(
+            "export_patients",
+            str(path),
+            provider=provider.username,
+            stdout=stdout,
+        )
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2  # noqa: PLR2004
+        assert lines[1].startswith(str(patient.id))
+        assert f"Exported patients to {path}." in stdout.getvalue()
+
+    def test__stdout(self):
+        patient = PatientFactory()
+        stdout = StringIO()
+
+        call_command("export_patients", "-", stdout=stdout)
+
+        assert json.loads(stdout.getvalue())["id"] == str(patient.id)
+
+    def test__unknown_provider(self, tmp_path):
+        with pytest.raises(CommandError, match="not found"):
+            call_command(
+                "export_patients",
+                str(tmp_path / "patients.csv"),
+                provider="nobody",
+            )
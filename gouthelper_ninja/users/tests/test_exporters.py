@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import MHTYPE_BITS
+from gouthelper_ninja.users.exporters import EXPORT_COLUMNS
+from gouthelper_ninja.users.exporters import export_patients
+from gouthelper_ninja.users.exporters import export_patients_qs
+from gouthelper_ninja.users.exporters import get_export_row
+from gouthelper_ninja.users.exporters import nest_row
+from gouthelper_ninja.users.importers import import_patients
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def provider():
+    return UserFactory()
+
+
+def test__export_patients_qs(provider):
+    patients = PatientFactory.create_batch(2, provider=provider)
+    PatientFactory(provider=UserFactory())
+
+    assert list(export_patients_qs(provider.id)) == patients
+
+
+def test__get_export_row(provider, django_assert_num_queries):
+    patient = PatientFactory(provider=provider)
+
+    with django_assert_num_queries(1):
+        row = get_export_row(export_patients_qs(provider.id).get())
+    assert list(row) == EXPORT_COLUMNS
+    assert row["id"] == patient.id
+    assert row["dateofbirth.dateofbirth"] == patient.dateofbirth.dateofbirth
+    assert row["gender.gender"] == patient.gender.gender
+    assert row["goutdetail.flaring"] == patient.goutdetail.flaring
+    assert row["ckddetail.stage"] is None
+    assert row["gout.history_of"] == bool(
+        patient.medhistorys_mask & MHTYPE_BITS[MHTypes.GOUT],
+    )
+
+
+def test__nest_row():
+    assert nest_row({"id": 1, "gout.history_of": True}) == {
+        "id": 1,
+        "gout": {"history_of": True},
+    }
+
+
+class TestExportPatients:
+    def test__ndjson(self, provider):
+        patients = PatientFactory.create_batch(3, provider=provider)
+
+        chunks = list(export_patients(export_patients_qs(provider.id), chunk_size=2))
+        assert len(chunks) == 2  # noqa: PLR2004
+        records = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert [record["id"] for record in records] == [
+            str(patient.id) for patient in patients
+        ]
+
+    def test__csv(self, provider):
+        PatientFactory.create_batch(3, provider=provider)
+
+        chunks = list(
+            export_patients(
+                export_patients_qs(provider.id),
+                export_format="csv",
+                chunk_size=2,
+            ),
+        )
+        assert chunks[0] == ",".join(EXPORT_COLUMNS) + "\r\n"
+        assert len("".join(chunks[1:]).splitlines()) == 3  # noqa: PLR2004
+
+    @pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+    def test__can_be_imported(self, provider, export_format):
+        PatientFactory.create_batch(2, provider=provider)
+        other_provider = UserFactory()
+
+        lines = "".join(
+            export_patients(
+                export_patients_qs(provider.id),
+                export_format=export_format,
+            ),
+        ).splitlines(keepends=True)
+        result = import_patients(
+            lines,
+            import_format=export_format,
+            provider_id=other_provider.id,
+        )
+
+        assert result.errors == []
+        assert (
+            Patient.objects.filter(patientprofile__provider=other_provider).count() == 2  # noqa: PLR2004
+        )
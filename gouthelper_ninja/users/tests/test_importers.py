@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from gouthelper_ninja.ethnicitys.choices import Ethnicitys
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.users.importers import import_patients
+from gouthelper_ninja.users.importers import parse_csv
+from gouthelper_ninja.users.importers import parse_ndjson
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+RECORD = {
+    "dateofbirth": {"dateofbirth": "1980-06-12"},
+    "ethnicity": {"ethnicity": Ethnicitys.CAUCASIAN},
+    "gender": {"gender": Genders.MALE},
+    "gout": {"history_of": True},
+    "goutdetail": {"flaring": True, "on_ult": True},
+}
+
+CSV_HEADER = (
+    "dateofbirth.dateofbirth,ethnicity.ethnicity,gender.gender,gout.history_of,"
+    "goutdetail.flaring,goutdetail.on_ult,menopause.history_of"
+)
+
+
+class TestParseNdjson:
+    def test__parses_records(self):
+        assert list(parse_ndjson([json.dumps(RECORD), "", json.dumps(RECORD)])) == [
+            (1, RECORD),
+            (3, RECORD),
+        ]
+
+    def test__invalid_lines(self):
+        rows = list(parse_ndjson(["{not json", "[1, 2]"]))
+        assert [row for row, _ in rows] == [1, 2]
+        assert all(isinstance(error, ValueError) for _, error in rows)
+
+
+class TestParseCsv:
+    def test__nests_dotted_columns(self):
+        rows = list(
+            parse_csv([CSV_HEADER, "1980-06-12,Caucasian,0,True,True,True,"]),
+        )
+        assert rows == [
+            (
+                1,
+                {
+                    "dateofbirth": {"dateofbirth": "1980-06-12"},
+                    "ethnicity": {"ethnicity": "Caucasian"},
+                    "gender": {"gender": "0"},
+                    "gout": {"history_of": "True"},
+                    "goutdetail": {"flaring": "True", "on_ult": "True"},
+                },
+            ),
+        ]
+
+
+class TestImportPatients:
+    def test__ndjson(self):
+        provider = UserFactory()
+        lines = [json.dumps(RECORD)] * 3
+
+        result = import_patients(lines, provider_id=provider.id, chunk_size=2)
+
+        assert result.errors == []
+        assert len(result.created) == 3  # noqa: PLR2004
+        patients = Patient.objects.filter(id__in=result.created)
+        assert {patient.patientprofile.provider for patient in patients} == {provider}
+        assert sorted(
+            patient.patientprofile.provider_alias for patient in patients
+        ) == [1, 2, 3]
+        assert all(patient.goutdetail.flaring for patient in patients)
+
+    def test__csv(self):
+        result = import_patients(
+            [
+                CSV_HEADER,
+                "1980-06-12,Caucasian,0,True,True,True,",
+                "1970-06-12,Korean,1,False,False,False,True",
+            ],
+            import_format="csv",
+        )
+
+        assert result.errors == []
+        assert len(result.created) == 2  # noqa: PLR2004
+        patient = Patient.objects.get(id=result.created[1])
+        assert patient.ethnicity.ethnicity == Ethnicitys.KOREAN
+        assert patient.gender.gender == Genders.FEMALE
+        assert patient.menopause.history_of is True
+
+    def test__reports_row_errors_without_aborting(self):
+        female_without_menopause = {**RECORD, "gender": {"gender": Genders.FEMALE}}
+        female_without_menopause["dateofbirth"] = {"dateofbirth": "1975-01-01"}
+        lines = [
+            json.dumps(RECORD),
+            json.dumps({**RECORD, "ethnicity": {"ethnicity": "Martian"}}),
+            "{not json",
+            json.dumps(female_without_menopause),
+            json.dumps(RECORD),
+        ]
+
+        result = import_patients(lines, chunk_size=2)
+
+        assert len(result.created) == 2  # noqa: PLR2004
+        assert [error.row for error in result.errors] == [2, 3, 4]
+        assert result.errors[0].errors[0].startswith("ethnicity.ethnicity:")
+        assert "menopause" in result.errors[2].errors[0]
+        assert Patient.objects.count() == 2  # noqa: PLR2004
+
+    @pytest.mark.parametrize("copy", [False, True])
+    def test__reports_database_errors_without_aborting(self, copy):
+        # Passes validation, but violates the DateOfBirth check constraint
+        too_young = {**RECORD, "dateofbirth": {"dateofbirth": "2020-01-01"}}
+        lines = [json.dumps(RECORD)] * 3 + [json.dumps(too_young)]
+        lines += [json.dumps(RECORD)] * 2
+
+        result = import_patients(lines, chunk_size=5, copy=copy)
+
+        assert len(result.created) == 5  # noqa: PLR2004
+        assert [error.row for error in result.errors] == [4]
+        assert Patient.objects.count() == 5  # noqa: PLR2004
+        assert set(Patient.objects.values_list("id", flat=True)) == set(
+            result.created,
+        )
+
+    def test__copy(self):
+        provider = UserFactory()
+        lines = [json.dumps(RECORD)] * 3
+
+        result = import_patients(lines, provider_id=provider.id, copy=True)
+
+        assert result.errors == []
+        assert (
+            Patient.objects.filter(
+                id__in=result.created,
+                patientprofile__provider=provider,
+            ).count()
+            == 3  # noqa: PLR2004
+        )
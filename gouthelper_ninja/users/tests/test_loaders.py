@@ -0,0 +1,101 @@
+import pytest
+from django.db import IntegrityError
+
+from gouthelper_ninja.ckddetails.choices import Stages
+from gouthelper_ninja.ckddetails.models import CkdDetail
+from gouthelper_ninja.dateofbirths.schema import DateOfBirthEditSchema
+from gouthelper_ninja.ethnicitys.choices import Ethnicitys
+from gouthelper_ninja.ethnicitys.schema import EthnicityEditSchema
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.genders.schema import GenderEditSchema
+from gouthelper_ninja.goutdetails.schema import GoutDetailEditSchema
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
+from gouthelper_ninja.medhistorys.schema import MedHistoryEditSchema
+from gouthelper_ninja.profiles.models import PatientProfile
+from gouthelper_ninja.users.loaders import copy_models
+from gouthelper_ninja.users.loaders import copy_patients
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.schema import PatientEditSchema
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+PATIENT_DATA = PatientEditSchema(
+    dateofbirth=DateOfBirthEditSchema(dateofbirth="1970-03-01"),
+    ethnicity=EthnicityEditSchema(ethnicity=Ethnicitys.KOREAN),
+    gender=GenderEditSchema(gender=Genders.FEMALE),
+    gout=MedHistoryEditSchema(history_of=True),
+    goutdetail=GoutDetailEditSchema(flaring=True),
+    menopause=MedHistoryEditSchema(history_of=True),
+)
+
+
+class TestCopyPatients:
+    def test__creates_patients(self):
+        provider = UserFactory()
+
+        ids = copy_patients([PATIENT_DATA] * 3, provider_id=provider.id, batch_size=2)
+
+        assert len(ids) == 3  # noqa: PLR2004
+        patients = list(Patient.objects.filter(id__in=ids))
+        assert sorted(
+            patient.patientprofile.provider_alias for patient in patients
+        ) == [1, 2, 3]
+        for patient in patients:
+            assert patient.patientprofile.provider == provider
+            assert str(patient.dateofbirth.dateofbirth) == "1970-03-01"
+            assert patient.ethnicity.ethnicity == Ethnicitys.KOREAN
+            assert patient.gender.gender == Genders.FEMALE
+            assert patient.gout.history_of is True
+            assert patient.menopause.history_of is True
+            assert patient.goutdetail.flaring is True
+            assert patient.medhistorys_mask == mhtypes_mask(
+                [MHTypes.GOUT, MHTypes.MENOPAUSE],
+            )
+            assert patient.version == 1
+            assert patient.created is not None
+            # Each object has a single creation history record
+            for obj in [
+                patient,
+                patient.patientprofile,
+                patient.dateofbirth,
+                patient.ethnicity,
+                patient.gender,
+                patient.gout,
+                patient.menopause,
+                patient.goutdetail,
+            ]:
+                assert obj.history.filter(history_type="+").count() == 1
+                assert obj.history.count() == 1
+
+    def test__history_matches_gh_bulk_create(self):
+        (copied,) = copy_patients([PATIENT_DATA])
+        (created,) = Patient.objects.gh_bulk_create([PATIENT_DATA])
+
+        fields = ["ethnicity", "history_type", "history_user_id"]
+        assert list(
+            Patient.objects.get(id=copied).ethnicity.history.values(*fields),
+        ) == list(created.ethnicity.history.values(*fields))
+
+    def test__rolls_back_on_error(self):
+        patient = PatientFactory()
+        batches = [
+            Patient.objects.gh_build([PATIENT_DATA]),
+            {PatientProfile: [PatientProfile(user=patient)]},
+        ]
+        count = Patient.objects.count()
+
+        with pytest.raises(IntegrityError):
+            copy_models(batches)
+        assert Patient.objects.count() == count
+
+
+def test__copy_models():
+    patient = PatientFactory()
+    ckddetail = CkdDetail(patient=patient, stage=Stages.THREE)
+
+    assert copy_models([{CkdDetail: [ckddetail]}]) == 1
+    assert CkdDetail.objects.get(patient=patient).stage == Stages.THREE
+    assert ckddetail.history.get().history_type == "+"
@@ -1,5 +1,7 @@
 import pytest
 from django.contrib.auth.hashers import check_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from gouthelper_ninja.dateofbirths.models import DateOfBirth
 from gouthelper_ninja.dateofbirths.schema import DateOfBirthEditSchema
@@ -10,6 +12,8 @@ from gouthelper_ninja.genders.choices import Genders
 from gouthelper_ninja.genders.models import Gender
 from gouthelper_ninja.genders.schema import GenderEditSchema
 from gouthelper_ninja.goutdetails.schema import GoutDetailEditSchema
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
 from gouthelper_ninja.medhistorys.schema import MedHistoryEditSchema
 from gouthelper_ninja.profiles.models import AdminProfile
 from gouthelper_ninja.profiles.models import PatientProfile
@@ -234,6 +238,80 @@ class TestPatientManager:
         expected_alias = 2
         assert profile2.provider_alias == expected_alias
 
+    def test_gh_bulk_create(self):
+        provider = UserFactory()
+        patient_data = PatientEditSchema(
+            dateofbirth=DateOfBirthEditSchema(dateofbirth="1970-03-01"),
+            ethnicity=EthnicityEditSchema(ethnicity=Ethnicitys.KOREAN),
+            gender=GenderEditSchema(gender=Genders.FEMALE),
+            gout=MedHistoryEditSchema(history_of=True),
+            goutdetail=GoutDetailEditSchema(flaring=True),
+            menopause=MedHistoryEditSchema(history_of=True),
+        )
+        num_patients = 3
+
+        patients = Patient.objects.gh_bulk_create(
+            data=[patient_data] * num_patients,
+            provider_id=provider.id,
+        )
+
+        assert len(patients) == num_patients
+        assert all(isinstance(patient, Patient) for patient in patients)
+        assert [patient.patientprofile.provider_alias for patient in patients] == [
+            1,
+            2,
+            3,
+        ]
+        for patient in Patient.objects.filter(id__in=[p.id for p in patients]):
+            assert patient.patientprofile.provider == provider
+            assert patient.dateofbirth.dateofbirth.strftime("%Y-%m-%d") == "1970-03-01"
+            assert patient.ethnicity.ethnicity == Ethnicitys.KOREAN
+            assert patient.gender.gender == Genders.FEMALE
+            assert patient.gout.history_of is True
+            assert patient.menopause.history_of is True
+            assert patient.goutdetail.flaring is True
+            assert patient.medhistorys_mask == mhtypes_mask(
+                [MHTypes.GOUT, MHTypes.MENOPAUSE],
+            )
+            # Each object has a single creation history record
+            for obj in [
+                patient,
+                patient.patientprofile,
+                patient.dateofbirth,
+                patient.ethnicity,
+                patient.gender,
+                patient.gout,
+                patient.menopause,
+                patient.goutdetail,
+            ]:
+                assert obj.history.filter(history_type="+").count() == 1
+                assert obj.history.count() == 1
+
+    def test_gh_bulk_create_empty(self):
+        provider = UserFactory()
+
+        assert Patient.objects.gh_bulk_create(data=[], provider_id=provider.id) == []
+        assert not Patient.objects.exists()
+
+    def test_gh_bulk_create_num_queries_does_not_scale(self):
+        provider = UserFactory()
+        patient_data = PatientEditSchema(
+            dateofbirth=DateOfBirthEditSchema(dateofbirth="1990-03-01"),
+            ethnicity=EthnicityEditSchema(ethnicity=Ethnicitys.KOREAN),
+            gender=GenderEditSchema(gender=Genders.MALE),
+            gout=MedHistoryEditSchema(history_of=True),
+            goutdetail=GoutDetailEditSchema(),
+        )
+
+        with CaptureQueriesContext(connection) as single:
+            Patient.objects.gh_bulk_create(data=[patient_data], provider_id=provider.id)
+        with CaptureQueriesContext(connection) as many:
+            Patient.objects.gh_bulk_create(
+                data=[patient_data] * 25,
+                provider_id=provider.id,
+            )
+        assert len(many) == len(single)
+
 
 class TestProviderManager:
     def test_get_queryset(self):
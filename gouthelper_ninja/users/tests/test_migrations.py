@@ -0,0 +1,46 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
+from gouthelper_ninja.users.models import User
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+mask_migration = import_module(
+    "gouthelper_ninja.users.migrations.0006_backfill_user_medhistorys_mask",
+)
+
+provider_migration = import_module(
+    "gouthelper_ninja.users.migrations.0004_user_provider",
+)
+
+
+def test__backfill_medhistorys_mask():
+    patient = PatientFactory(menopause="OMIT", stroke=True, diabetes=False)
+    patient_without_gout = PatientFactory(gout=False, menopause="OMIT")
+    User.objects.update(medhistorys_mask=0)
+
+    mask_migration.backfill_medhistorys_mask(apps, None)
+
+    assert User.objects.get(id=patient.id).medhistorys_mask == mhtypes_mask(
+        [MHTypes.GOUT, MHTypes.STROKE],
+    )
+    assert User.objects.get(id=patient_without_gout.id).medhistorys_mask == 0
+
+
+def test__backfill_provider():
+    provider = UserFactory()
+    patient = PatientFactory(provider=provider)
+    patient_without_provider = PatientFactory()
+    User.objects.update(provider=None)
+
+    provider_migration.backfill_provider(apps, None)
+
+    assert User.objects.get(id=patient.id).provider_id == provider.id
+    assert User.objects.get(id=patient_without_provider.id).provider_id is None
+    assert User.objects.get(id=provider.id).provider_id is None
@@ -1,5 +1,7 @@
 import pytest
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from gouthelper_ninja.ethnicitys.choices import Ethnicitys
 from gouthelper_ninja.genders.choices import Genders
@@ -10,6 +12,7 @@ from gouthelper_ninja.users.models import Admin
 from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.users.models import Provider
 from gouthelper_ninja.users.models import User
+from gouthelper_ninja.users.querysets import patient_schema_qs
 from gouthelper_ninja.users.schema import PatientEditSchema
 from gouthelper_ninja.users.tests.factories import PatientFactory
 from gouthelper_ninja.users.tests.factories import UserFactory
@@ -42,6 +45,27 @@ class TestPatient(TestCase):
         assert patient.ethnicity.ethnicity == Ethnicitys.KOREAN
         assert patient.gender.gender == Genders.FEMALE
 
+    def test__update_only_changed_related_models(self):
+        patient = patient_schema_qs(Patient.objects.filter(id=self.patient.id)).get()
+        data = PatientEditSchema.model_validate(
+            {
+                "dateofbirth": {"dateofbirth": patient.dateofbirth.dateofbirth},
+                "ethnicity": {"ethnicity": patient.ethnicity.ethnicity},
+                "gender": {"gender": patient.gender.gender},
+                "gout": {"history_of": patient.gout.history_of},
+                "goutdetail": {"flaring": not patient.goutdetail.flaring},
+                "menopause": (
+                    {"history_of": patient.menopause.history_of}
+                    if patient.menopause
+                    else None
+                ),
+            },
+        )
+        # The GoutDetail UPDATE, its historical record INSERT, and the
+        # Patient's version UPDATE
+        with self.assertNumQueries(3):
+            patient.gh_update(data=data)
+
 
 class TestUser(TestCase):
     """Tests for the User model."""
@@ -101,6 +125,18 @@ class TestUser(TestCase):
         delattr(patient_with_creator, "creator")  # Remove cached property
         assert patient_with_creator.creator == self.user
 
+    def test__save_deferred_instance(self):
+        """Saving an instance loaded with only() updates only its loaded
+        fields, rather than loading and saving each deferred field."""
+        user = User.objects.only("id", "role", "name").get(id=self.user.id)
+        user.name = "Bill"
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        update = queries.captured_queries[0]["sql"]
+        assert update.startswith('UPDATE "users_user" SET "name"')
+        assert '"email"' not in update
+        assert User.objects.get(id=self.user.id).name == "Bill"
+
     def test_role_change_updates_class(self):
         """Tests that changing a user's role correctly updates
         the proxy model class after saving."""
@@ -161,3 +197,17 @@ class TestUser(TestCase):
         self.patient.medhistorys_qs = self.patient.medhistory_set.all()
         result = self.patient.get_medhistory(MHTypes.DIABETES)
         assert result == medhistory
+
+    def test_get_medhistory_queries_once(self):
+        MedHistoryFactory(patient=self.patient, mhtype=MHTypes.DIABETES)
+        with self.assertNumQueries(1):
+            for mhtype in MHTypes:
+                self.patient.get_medhistory(mhtype)
+            self.patient.get_medhistory(MHTypes.DIABETES)
+
+    def test_get_medhistory_index_cleared_on_save_and_delete(self):
+        assert self.patient.get_medhistory(MHTypes.DIABETES) is None
+        medhistory = MedHistoryFactory(patient=self.patient, mhtype=MHTypes.DIABETES)
+        assert self.patient.get_medhistory(MHTypes.DIABETES) == medhistory
+        medhistory.delete()
+        assert self.patient.get_medhistory(MHTypes.DIABETES) is None
@@ -0,0 +1,48 @@
+import pytest
+
+from gouthelper_ninja.genders.choices import Genders
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.lists import CV_DISEASES_MASK
+from gouthelper_ninja.medhistorys.lists import mhtypes_mask
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.querysets import age_gender_filter
+from gouthelper_ninja.users.tests.factories import PatientFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test__age_gender_filter():
+    patient = PatientFactory(dateofbirth__dateofbirth=40, gender__gender=Genders.MALE)
+    PatientFactory(dateofbirth__dateofbirth=41, gender__gender=Genders.MALE)
+    PatientFactory(
+        dateofbirth__dateofbirth=40,
+        gender__gender=Genders.FEMALE,
+        menopause=True,
+    )
+
+    assert list(
+        age_gender_filter(Patient.objects.all(), age=40, gender=Genders.MALE),
+    ) == [patient]
+
+
+def test__with_any_medhistorys():
+    angina = PatientFactory(angina=True)
+    stroke = PatientFactory(stroke=True, diabetes=True)
+    PatientFactory(stroke=False, diabetes=True)
+
+    assert set(Patient.objects.with_any_medhistorys(CV_DISEASES_MASK)) == {
+        angina,
+        stroke,
+    }
+
+
+def test__with_all_medhistorys():
+    stroke_diabetes = PatientFactory(stroke=True, diabetes=True)
+    PatientFactory(stroke=True)
+    PatientFactory(diabetes=True)
+
+    assert list(
+        Patient.objects.with_all_medhistorys(
+            mhtypes_mask([MHTypes.STROKE, MHTypes.DIABETES]),
+        ),
+    ) == [stroke_diabetes]
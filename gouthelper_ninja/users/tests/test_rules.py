@@ -3,6 +3,7 @@ from django.contrib.auth.models import AnonymousUser
 from django.test import TestCase
 
 from gouthelper_ninja.users.choices import Roles
+from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.users.rules import add_provider_patient
 from gouthelper_ninja.users.rules import change_patient
 from gouthelper_ninja.users.rules import change_user
@@ -65,10 +66,8 @@ class TestPatientPredicates(TestCase):
         assert obj_without_creator(None, self.provider)
         assert obj_without_creator(None, self.anon)
 
-        delattr(self.patient, "creator")
-        last_patient_history = self.patient.history.last()
-        last_patient_history.history_user = self.patient
-        last_patient_history.save()
+        self.patient.patientprofile.creator = self.patient
+        self.patient.patientprofile.save()
 
         assert not obj_without_creator(None, self.patient)
 
@@ -80,15 +79,23 @@ class TestPatientPredicates(TestCase):
         assert not user_is_obj_creator(self.patient, self.provider_patient)
         assert not user_is_obj_creator(self.anon, self.provider_patient)
 
-        delattr(self.provider_patient, "creator")
-        last_provider_patient_history = self.provider_patient.history.last()
-        last_provider_patient_history.history_user = self.provider
-        last_provider_patient_history.save()
+        self.provider_patient.patientprofile.creator = self.provider
+        self.provider_patient.patientprofile.save()
         assert user_is_obj_creator(self.provider, self.provider_patient)
         assert not user_is_obj_creator(self.admin, self.provider_patient)
         assert not user_is_obj_creator(self.patient, self.provider_patient)
         assert not user_is_obj_creator(self.anon, self.provider_patient)
 
+    def test__creator_predicates_read_patientprofile(self):
+        """Test that the creator predicates use the PatientProfile's creator
+        column rather than querying the Patient's history."""
+        patient = Patient.objects.select_related("patientprofile").get(
+            id=self.patient.id,
+        )
+        with self.assertNumQueries(0):
+            assert obj_without_creator(None, patient)
+            assert not user_is_obj_creator(self.provider, patient)
+
     def test__obj_is_patient_or_pseudopatient(self):
         """Test that obj_is_patient_or_pseudopatient returns True for Patients
         and False for all other Users."""
@@ -229,14 +236,10 @@ class TestPatientPredicates(TestCase):
         assert not change_patient(self.anon, self.admin)
         assert not change_patient(self.anon, self.provider)
 
-        # Set the patient's last history_user to the patient,
-        # which makes them the creator. This should prevent other
-        # non-admin Users from changing the patient.
-        patients_last_history = self.patient.history.last()
-        patients_last_history.history_user = self.patient
-        patients_last_history.save()
-
-        delattr(self.patient, "creator")
+        # Set the patient's creator to the patient. This should prevent
+        # other non-admin Users from changing the patient.
+        self.patient.patientprofile.creator = self.patient
+        self.patient.patientprofile.save()
 
         assert not change_patient(self.provider, self.patient)
         assert change_patient(self.admin, self.patient)
@@ -268,12 +271,10 @@ class TestPatientPredicates(TestCase):
         assert not delete_patient(self.anon, self.admin)
         assert not delete_patient(self.anon, self.provider)
 
-        # Set the patient's last history_user to the patient,
-        # which makes them the creator. This should prevent other
-        # non-admin Users from deleting the patient.
-        patients_last_history = self.patient.history.last()
-        patients_last_history.history_user = self.patient
-        patients_last_history.save()
+        # Set the patient's creator to the patient. This should prevent
+        # other non-admin Users from deleting the patient.
+        self.patient.patientprofile.creator = self.patient
+        self.patient.patientprofile.save()
 
         assert not delete_patient(self.provider, self.patient)
         assert delete_patient(self.admin, self.patient)
@@ -302,14 +303,10 @@ class TestPatientPredicates(TestCase):
         assert not view_patient(self.anon, self.admin)
         assert not view_patient(self.anon, self.provider)
 
-        # Set the patient's last history_user to the patient,
-        # which makes them the creator. This should prevent other
-        # non-admin Users from viewing the patient.
-        patients_last_history = self.patient.history.last()
-        patients_last_history.history_user = self.patient
-        patients_last_history.save()
-
-        delattr(self.patient, "creator")
+        # Set the patient's creator to the patient. This should prevent
+        # other non-admin Users from viewing the patient.
+        self.patient.patientprofile.creator = self.patient
+        self.patient.patientprofile.save()
 
         assert not view_patient(self.provider, self.patient)
         assert view_patient(self.admin, self.patient)
@@ -0,0 +1,91 @@
+import pytest
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+
+from gouthelper_ninja.exports.models import ExportJob
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.models import MedHistory
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.querysets import patient_schema_qs
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def get_version(patient: Patient) -> int:
+    return Patient.objects.values_list("version", flat=True).get(id=patient.id)
+
+
+class TestBumpPatientVersion:
+    @pytest.fixture
+    def patient(self):
+        patient = PatientFactory()
+        return patient_schema_qs(Patient.objects.filter(id=patient.id)).get()
+
+    def test__related_save_and_delete(self, patient):
+        for obj in [
+            patient.patientprofile,
+            patient.dateofbirth,
+            patient.ethnicity,
+            patient.gender,
+            patient.goutdetail,
+        ]:
+            version = get_version(patient)
+            obj.save()
+            assert get_version(patient) == version + 1
+        version = get_version(patient)
+        patient.goutdetail.delete()
+        assert get_version(patient) == version + 1
+
+    def test__cached_patient_reloads_version(self, patient):
+        version = patient.version
+        patient.gender.save()
+        assert patient.version == version + 1
+
+    def test__medhistory_save_and_delete(self, patient):
+        version = get_version(patient)
+        patient.gout.save()
+        assert get_version(patient) == version + 1
+        patient.gout.delete()
+        assert get_version(patient) == version + 2
+
+    def test__medhistory_bulk_upsert(self, patient):
+        version = patient.version
+        MedHistory.objects.bulk_upsert(patient, {MHTypes.DIABETES: True})
+        assert patient.version == version + 1
+        # Unchanged MedHistorys don't increment it
+        MedHistory.objects.bulk_upsert(patient, {MHTypes.DIABETES: True})
+        assert patient.version == version + 1
+
+    def test__patient_save(self, patient):
+        version = patient.version
+        patient.save()
+        assert patient.version == version + 1
+        assert get_version(patient) == version + 1
+
+    def test__provider_save(self):
+        provider = UserFactory()
+        provider.save()
+        assert provider.version == 1
+
+    def test__gh_update(self, patient):
+        data = patient.edit_schema.from_orm(patient).model_dump()
+        data["goutdetail"]["flaring"] = not data["goutdetail"]["flaring"]
+        version = patient.version
+        patient.gh_update(data=patient.edit_schema(**data))
+        assert get_version(patient) == version + 1
+
+    def test__patientprofile_provider_copied_to_patient(self, patient):
+        provider = UserFactory()
+        patient.patientprofile.provider = provider
+        patient.patientprofile.provider_alias = 1
+        patient.patientprofile.save()
+        assert Patient.objects.get(id=patient.id).provider_id == provider.id
+        patient.patientprofile.delete()
+        assert Patient.objects.get(id=patient.id).provider_id is None
+
+    def test__only_connected_to_patient_models(self):
+        """Models without receivers can be deleted without fetching them."""
+        assert not post_save.has_listeners(ExportJob)
+        assert not post_delete.has_listeners(ExportJob)
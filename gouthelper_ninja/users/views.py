@@ -27,6 +27,7 @@ from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.users.models import User
 from gouthelper_ninja.users.querysets import patient_qs
 from gouthelper_ninja.users.schema import PatientSchema
+from gouthelper_ninja.utils.identitymap import get_patient
 from gouthelper_ninja.utils.views import GoutHelperCreateMixin
 from gouthelper_ninja.utils.views import GoutHelperUpdateMixin
 
@@ -146,8 +147,6 @@ class PatientMixin:
         duplicate database queries and still work with Django CBVs
         without re-writing several methods."""
         if not hasattr(self, "object"):
-            if queryset is None:
-                queryset = self.get_queryset()
             patient_id = self.kwargs.get("patient", None)
             if patient_id is None:
                 class_name = self.__class__.__name__
@@ -156,15 +155,18 @@ class PatientMixin:
                     + " must be called with a Patient uuid in the patient kwarg "
                     "in the URLconf.",
                 )
-            queryset = queryset.filter(
-                pk=patient_id,
-            )
             try:
-                obj = queryset.get()
-            except queryset.model.DoesNotExist as e:
+                # Load the Patient through the request's identity map, so that
+                # it's shared with the rules predicates and forms
+                obj = (
+                    get_patient(patient_id)
+                    if queryset is None
+                    else queryset.filter(pk=patient_id).get()
+                )
+            except self.model.DoesNotExist as e:
                 raise Http404(
                     _("No %(verbose_name)s found matching the query")
-                    % {"verbose_name": queryset.model._meta.verbose_name},  # noqa: SLF001
+                    % {"verbose_name": self.model._meta.verbose_name},  # noqa: SLF001
                 ) from e
         else:
             obj = self.object
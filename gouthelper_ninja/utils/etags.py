@@ -0,0 +1,82 @@
+"""Strong ETags and conditional requests (If-None-Match and If-Match) for
+the API. A Patient's ETag is derived from its version, which changes
+whenever the Patient or one of its related models does, and other objects'
+ETags are derived from their modified timestamps."""
+
+from hashlib import sha256
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.utils.text import capfirst
+from ninja.errors import HttpError
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+    from django.http import HttpRequest
+    from django.http import HttpResponse
+
+
+def _etag_field(obj: "Model") -> str:
+    return "version" if isinstance(obj, get_user_model()) else "modified"
+
+
+def get_etag(obj: "Model") -> str:
+    """Returns the quoted, strong ETag of the object's current version."""
+
+    value = getattr(obj, _etag_field(obj))
+    label = obj._meta.concrete_model._meta.label  # noqa: SLF001
+    return f'"{sha256(f"{label}:{obj.pk}:{value}".encode()).hexdigest()[:32]}"'
+
+
+def set_etag(response: "HttpResponse", obj: "Model") -> None:
+    """Sets the ETag header of the response to the object's ETag."""
+
+    response.headers["ETag"] = get_etag(obj)
+
+
+def get_not_modified(
+    request: "HttpRequest",
+    obj: "Model",
+) -> HttpResponseNotModified | None:
+    """Returns a 304 response if the request's If-None-Match header matches
+    the object's ETag, otherwise None. Uses the weak comparison that RFC 9110
+    requires for If-None-Match."""
+
+    header = request.headers.get("If-None-Match")
+    if header is None:
+        return None
+    etag = get_etag(obj)
+    etags = [etag.removeprefix("W/") for etag in parse_etags(header)]
+    if "*" not in etags and etag not in etags:
+        return None
+    response = HttpResponseNotModified()
+    response.headers["ETag"] = etag
+    return response
+
+
+def check_if_match(request: "HttpRequest", obj: "Model") -> None:
+    """Raises a 412 HttpError if the request has an If-Match header that
+    doesn't match the object's ETag. If it matches, the object's row is
+    checked again with an UPDATE that changes nothing but only matches the
+    loaded version, which holds the row until the request's transaction
+    ends, so that a concurrent update can't be overwritten."""
+
+    header = request.headers.get("If-Match")
+    if header is None:
+        return
+    etags = parse_etags(header)
+    if "*" in etags:
+        return
+    verbose_name = capfirst(obj._meta.verbose_name)  # noqa: SLF001
+    msg = f"{verbose_name} has changed since it was fetched."
+    if get_etag(obj) not in etags:
+        raise HttpError(412, msg)
+    field = _etag_field(obj)
+    value = getattr(obj, field)
+    if not obj._meta.concrete_model._base_manager.filter(  # noqa: SLF001
+        pk=obj.pk,
+        **{field: value},
+    ).update(**{field: value}):
+        raise HttpError(412, msg)
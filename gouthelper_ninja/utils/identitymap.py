@@ -0,0 +1,172 @@
+"""Request-scoped identity map, so that a row is loaded from the database at
+most once per request and every view mixin, rules predicate, and form that
+needs it shares the same instance. IdentityMapMiddleware opens a map for each
+request. Outside of a request, for example in management commands, there is
+no map and the loaders below query the database as usual.
+
+When duplicate checking is on, which it is by default in DEBUG, every
+GoutHelperModel row loaded from the database is recorded by
+GoutHelperModel.from_db, whether or not the query went through the map, and
+loading a row a second time in the same request is logged as a warning, or
+raises DuplicateLoadError if the map is strict. Requests are never strict, as
+joins such as patientprofile__provider legitimately load request.user again;
+tests open identity_map_scope(strict=True) to assert that a code path loads
+each row once."""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Union
+
+from django.apps import apps
+from django.conf import settings
+
+from gouthelper_ninja.users.querysets import patient_qs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from uuid import UUID
+
+    from django.db.models import Model
+
+    from gouthelper_ninja.users.models import Patient
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateLoadError(AssertionError):
+    """Raised, by a strict IdentityMap, if a row that was already loaded in
+    the current request is loaded from the database again."""
+
+
+class IdentityMap:
+    """Instances loaded in the current request, keyed by (model label, pk).
+    Proxy models share their concrete model's key."""
+
+    def __init__(self, *, check_duplicates: bool = False, strict: bool = False):
+        self.check_duplicates = check_duplicates or strict
+        self.strict = strict
+        self.objects: dict[tuple[str, Any], Model] = {}
+        # Keys of every row loaded from the database, if checking duplicates
+        self.loaded: set[tuple[str, Any]] = set()
+        # Results of rules predicates, see utils.permissions.check_predicate
+        self.permissions: dict[str, bool] = {}
+
+    @staticmethod
+    def key(model: type["Model"], pk: Any) -> tuple[str, Any]:
+        return (model._meta.concrete_model._meta.label, str(pk))  # noqa: SLF001
+
+    def get(self, model: type["Model"], pk: Any) -> Union["Model", None]:
+        return self.objects.get(self.key(model, pk))
+
+    def add(self, obj: "Model") -> "Model":
+        """Adds an instance that was just loaded from the database."""
+
+        self.objects[self.key(type(obj), obj.pk)] = obj
+        return obj
+
+    def record_load(self, obj: "Model") -> None:
+        """Records that the instance's row was loaded from the database. If
+        duplicate checking is on and it was already loaded, because a query
+        didn't use the map, logs a warning, or raises DuplicateLoadError if
+        the map is strict."""
+
+        if not self.check_duplicates:
+            return
+        key = self.key(type(obj), obj.pk)
+        if key in self.loaded:
+            msg = f"{key[0]} {key[1]} was loaded more than once in this request."
+            if self.strict:
+                raise DuplicateLoadError(msg)
+            logger.warning(msg)
+        self.loaded.add(key)
+
+    def get_or_load(
+        self,
+        model: type["Model"],
+        pk: Any,
+        load: "Callable[[], Model]",
+    ) -> "Model":
+        """Returns the instance from the map, or calls load and adds its
+        result."""
+
+        obj = self.get(model, pk)
+        return obj if obj is not None else self.add(load())
+
+
+_identity_map: ContextVar[IdentityMap | None] = ContextVar(
+    "identity_map",
+    default=None,
+)
+
+
+def get_identity_map() -> IdentityMap | None:
+    """Returns the current request's IdentityMap, or None outside of one."""
+
+    return _identity_map.get()
+
+
+@contextmanager
+def identity_map_scope(
+    *,
+    check_duplicates: bool | None = None,
+    strict: bool = False,
+) -> "Iterator[IdentityMap]":
+    """Opens an IdentityMap for the duration of the block. Duplicate
+    checking defaults to settings.DEBUG. A strict map raises
+    DuplicateLoadError instead of logging duplicate loads."""
+
+    token = _identity_map.set(
+        IdentityMap(
+            check_duplicates=(
+                settings.DEBUG if check_duplicates is None else check_duplicates
+            ),
+            strict=strict,
+        ),
+    )
+    try:
+        yield _identity_map.get()
+    finally:
+        _identity_map.reset(token)
+
+
+def remember(obj: "Model") -> "Model":
+    """Adds an instance that was loaded from the database to the current
+    IdentityMap, if there is one, and returns it."""
+
+    identity_map = get_identity_map()
+    return identity_map.add(obj) if identity_map is not None else obj
+
+
+def get_patient(patient_id: Union["UUID", str]) -> "Patient":
+    """Returns the Patient, with its PatientProfile, provider, DateOfBirth,
+    Ethnicity, Gender, and GoutDetail, loading it with a single query the
+    first time it's needed in the request. Raises Patient.DoesNotExist."""
+
+    patient_model = apps.get_model("users.Patient")
+
+    def load() -> "Patient":
+        return (
+            patient_qs(patient_model.objects.filter(pk=patient_id))
+            .select_related("goutdetail")
+            .get()
+        )
+
+    identity_map = get_identity_map()
+    if identity_map is None:
+        return load()
+    return identity_map.get_or_load(patient_model, patient_id, load)
+
+
+class IdentityMapMiddleware:
+    """Opens an IdentityMap for each request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with identity_map_scope():
+            return self.get_response(request)
@@ -1,10 +1,14 @@
 import uuid
 from typing import TYPE_CHECKING
 from typing import Self
+from typing import Union
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
 from django.db.models import Manager
 from django.db.models import Model
 from django.db.models import UUIDField
+from django_extensions.db.fields import ModificationDateTimeField
 from rules.contrib.models import RulesModelBase
 from rules.contrib.models import RulesModelMixin
 
@@ -12,6 +16,7 @@ from gouthelper_ninja.rules import add_object
 from gouthelper_ninja.rules import change_object
 from gouthelper_ninja.rules import delete_object
 from gouthelper_ninja.rules import view_object
+from gouthelper_ninja.utils.identitymap import get_identity_map
 
 if TYPE_CHECKING:
     from django.db.models import Field  # pragma: no_cover
@@ -60,33 +65,98 @@ class GoutHelperModel(RulesModelMixin, Model, metaclass=RulesModelBase):
         self.delete_needed = False
         super().delete(*args, **kwargs)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Overwritten to record the load in the request's IdentityMap, which
+        reports the row if it was already loaded and duplicate checking is
+        on."""
+        instance = super().from_db(db, field_names, values)
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            identity_map.record_load(instance)
+        return instance
+
+    def gh_changes(self, data: dict) -> dict:
+        """Returns the items of data, a Schema's model_dump(), that differ from
+        the Model instance. Related models are compared field by field and
+        included only if something in them changed. Related models whose data
+        is None aren't fetched, because there is nothing to update."""
+
+        changes = {}
+        for attr_name, attr_data in data.items():
+            field = self._gh_concrete_field(attr_name)
+            if attr_data is None:
+                if field is None:
+                    continue
+                # Compare the column, so a ForeignKey isn't fetched
+                if getattr(self, field.attname) is not None:
+                    changes[attr_name] = attr_data
+                continue
+            attr = getattr(self, attr_name, None)
+            if isinstance(attr, Model) and isinstance(attr_data, dict):
+                if attr.gh_changes(attr_data):
+                    changes[attr_name] = attr_data
+            elif attr != attr_data:
+                changes[attr_name] = attr_data
+        return changes
+
     def gh_update(self, data: "Schema") -> Self:
         """Updates the Model instance and related models using
         data via a Pydantic Schema. Schema fields are Model fields
-        or related models with their respective editing Schema."""
-
-        # Loop over the Schema fields
-        for attr_name, attr_data in data.model_dump().items():
-            # Check if the Schema field is a Model or Field
-            attr: Model | Field = getattr(self, attr_name)
-            # If it's a Model, update it with the Schema data
-            if isinstance(attr, Model) and attr_data is not None:
-                attr.gh_update(data=attr.edit_schema(**attr_data))
-            # Otherwise, it's a Field, so set the value directly
-            else:
-                attr_val = getattr(self, attr_name, None)
-                # If the value is different, set it and mark the model as
-                # needing to be saved
-                if attr_val != attr_data:
+        or related models with their respective editing Schema.
+
+        Only changed fields are validated and saved, with update_fields,
+        and related models are only updated if their data changed. Unique
+        and constraint validation, which query the database, are left to
+        the Schema and the database's constraints. Each save increments the
+        Patient's version, in the same transaction."""
+
+        # The related models and the Patient's version are updated together
+        with transaction.atomic(savepoint=False):
+            update_fields = []
+            for attr_name, attr_data in self.gh_changes(data.model_dump()).items():
+                attr: Model | Field = getattr(self, attr_name)
+                # If it's a Model, update it with the Schema data
+                if isinstance(attr, Model) and attr_data is not None:
+                    attr.gh_update(data=attr.edit_schema(**attr_data))
+                # Otherwise, it's a Field, so set the value directly
+                else:
                     setattr(self, attr_name, attr_data)
-                    self.save_needed = True
-
-        if self.save_needed:
-            self.full_clean()
-            self.save()
+                    if self._gh_concrete_field(attr_name) is not None:
+                        update_fields.append(attr_name)
+
+            if update_fields:
+                self.save_needed = True
+                self.full_clean(
+                    exclude=[
+                        field.name
+                        for field in self._meta.concrete_fields
+                        if field.name not in update_fields
+                    ],
+                    validate_unique=False,
+                    validate_constraints=False,
+                )
+                # Fields set on save, like TimeStampedModel.modified, must be
+                # included in update_fields to be saved
+                update_fields.extend(
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if isinstance(field, ModificationDateTimeField)
+                )
+                self.save(update_fields=update_fields)
 
         return self
 
+    def _gh_concrete_field(self, name: str) -> Union["Field", None]:
+        """Returns the concrete Field with the name, or None if name is
+        something else, like a reverse relation or a property."""
+
+        try:
+            field = self._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        return field if field.concrete else None
+
 
 class GetStrAttrsMixin:
     """Adds methods for setting str_attrs to any object and fetching them
@@ -0,0 +1,150 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+from uuid import UUID
+
+from django.db.models import Q
+from ninja import Field
+from ninja import Schema
+from ninja.conf import settings
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+    from django.db.models import QuerySet
+
+
+class Cursor(NamedTuple):
+    """Position in a keyset-ordered QuerySet. created and id are the
+    ordering values of the row the cursor points at and reverse indicates
+    whether the page should be fetched backwards from that row."""
+
+    created: datetime
+    id: UUID
+    reverse: bool = False
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encodes a Cursor into an opaque, URL-safe string."""
+
+    payload = json.dumps(
+        [cursor.created.isoformat(), str(cursor.id), cursor.reverse],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Cursor:
+    """Decodes a string created by encode_cursor back into a Cursor.
+    Raises a 400 HttpError if the string is not a valid cursor."""
+
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        created, obj_id, reverse = json.loads(base64.urlsafe_b64decode(padded))
+        return Cursor(
+            created=datetime.fromisoformat(created),
+            id=UUID(obj_id),
+            reverse=bool(reverse),
+        )
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise HttpError(400, "Invalid cursor.") from e
+
+
+def cursor_for(obj: "Model", *, reverse: bool = False) -> str:
+    """Returns an encoded cursor pointing at the given object."""
+
+    return encode_cursor(Cursor(created=obj.created, id=obj.id, reverse=reverse))
+
+
+class CursorPagination(PaginationBase):
+    """Keyset pagination over the (created, id) ordering of a QuerySet of
+    TimeStampedModels. No COUNT is issued, and if an index covers the
+    QuerySet's equality filters followed by (created, id), as
+    user_provider_created_idx does for a provider's Patients, each page is a
+    single indexed range query regardless of how deep into the QuerySet it
+    is. Clients walk the results with the opaque next_cursor and
+    previous_cursor values."""
+
+    ordering = ("created", "id")
+
+    class Input(Schema):
+        cursor: str | None = None
+        page_size: int | None = Field(None, ge=1)
+
+    class Output(Schema):
+        items: list[Any]
+        next_cursor: str | None = None
+        previous_cursor: str | None = None
+
+    def __init__(
+        self,
+        page_size: int = settings.PAGINATION_PER_PAGE,
+        max_page_size: int = settings.PAGINATION_MAX_PER_PAGE_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        super().__init__(**kwargs)
+
+    def _get_page_size(self, requested_page_size: int | None) -> int:
+        if requested_page_size is None:
+            return self.page_size
+        return min(requested_page_size, self.max_page_size)
+
+    @staticmethod
+    def _after(cursor: Cursor) -> Q:
+        """Q object for rows that come after the cursor in the page's
+        direction of travel."""
+
+        lookup = "lt" if cursor.reverse else "gt"
+        return Q(**{f"created__{lookup}": cursor.created}) | Q(
+            created=cursor.created,
+            **{f"id__{lookup}": cursor.id},
+        )
+
+    def paginate_queryset(
+        self,
+        queryset: "QuerySet",
+        pagination: Input,
+        **params: Any,
+    ) -> dict[str, Any]:
+        page_size = self._get_page_size(pagination.page_size)
+        cursor = decode_cursor(pagination.cursor) if pagination.cursor else None
+        reverse = cursor.reverse if cursor else False
+
+        queryset = queryset.order_by(
+            *(f"-{field}" if reverse else field for field in self.ordering),
+        )
+        if cursor:
+            queryset = queryset.filter(self._after(cursor))
+
+        # Fetch one extra row to find out if there is another page
+        items = list(queryset[: page_size + 1])
+        has_more = len(items) > page_size
+        items = items[:page_size]
+        if reverse:
+            items.reverse()
+
+        # A backwards page was reached from a later row, so there is always
+        # a next page, and vice versa for a forwards page reached via a cursor
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        next_cursor = previous_cursor = None
+        if items:
+            if has_next:
+                next_cursor = cursor_for(items[-1])
+            if has_previous:
+                previous_cursor = cursor_for(items[0], reverse=True)
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "previous_cursor": previous_cursor,
+        }
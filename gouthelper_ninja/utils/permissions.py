@@ -0,0 +1,112 @@
+"""Memoized evaluation of the rules predicates. Results are cached for the
+request in the IdentityMap, and across requests in the default cache if
+settings.PERMISSION_CACHE_TIMEOUT is set. Cache keys include the modified
+timestamps of the User, the object, and the object's Patient, which saving
+its PatientProfile also updates, so saving any of them invalidates the
+cached results."""
+
+from hashlib import sha256
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Model
+from rules.permissions import ObjectPermissionBackend
+from rules.permissions import permissions
+
+from gouthelper_ninja.rules import user_is_anonymous
+from gouthelper_ninja.utils.identitymap import get_identity_map
+
+if TYPE_CHECKING:
+    from rules import Predicate
+
+    from gouthelper_ninja.users.models import User
+
+
+def _version(obj: Model) -> str:
+    modified = getattr(obj, "modified", None)
+    return f"{obj.pk}@{modified.isoformat() if modified else ''}"
+
+
+def get_user_key(user: "User") -> str:
+    """Returns the part of a permission cache key for the User."""
+
+    return "anonymous" if user_is_anonymous(user) else _version(user)
+
+
+def _get_loaded_patient(obj: Model) -> Model | None:
+    """Returns the object's Patient if it's the Patient or its Patient is
+    already loaded, without querying for it."""
+
+    if isinstance(obj, get_user_model()):
+        return obj
+    return obj._state.fields_cache.get("patient")  # noqa: SLF001
+
+
+def get_object_key(obj: Any) -> str:
+    """Returns the part of a permission cache key for the object, which is
+    a Model instance, a provider username or id kwarg, or None. Results
+    for a Model instance depend on its Patient's PatientProfile, and saving
+    the PatientProfile changes the Patient's modified timestamp, so the
+    key includes the Patient's version if it's loaded, otherwise its id."""
+
+    if not isinstance(obj, Model):
+        return repr(obj)
+    parts = [
+        obj._meta.concrete_model._meta.label,  # noqa: SLF001
+        _version(obj),
+    ]
+    patient = _get_loaded_patient(obj)
+    if patient is not None and patient is not obj:
+        parts.append(_version(patient))
+    elif patient is None and getattr(obj, "patient_id", None) is not None:
+        parts.append(str(obj.patient_id))
+    return ":".join(parts)
+
+
+def get_permission_key(predicate: "Predicate", user: "User", obj: Any) -> str:
+    """Returns the cache key for the result of predicate(user, obj). The
+    key uses the predicate's name, so aliased predicates such as view_patient
+    and change_patient share results."""
+
+    name = sha256(predicate.name.encode()).hexdigest()[:32]
+    return f"perm:{name}:{get_user_key(user)}:{get_object_key(obj)}"
+
+
+def check_predicate(predicate: "Predicate", user: "User", obj: Any = None) -> bool:
+    """Returns the result of predicate(user, obj), evaluating it at most
+    once per request, or once per PERMISSION_CACHE_TIMEOUT if set, for the
+    same versions of the user and object. Results for an object whose
+    Patient isn't loaded aren't versioned by it, so they're only cached for
+    the request."""
+
+    identity_map = get_identity_map()
+    timeout = settings.PERMISSION_CACHE_TIMEOUT
+    if timeout and isinstance(obj, Model) and _get_loaded_patient(obj) is None:
+        timeout = None
+    if identity_map is None and not timeout:
+        return predicate.test(user, obj)
+    key = get_permission_key(predicate, user, obj)
+    if identity_map is not None and key in identity_map.permissions:
+        return identity_map.permissions[key]
+    result = cache.get(key) if timeout else None
+    if result is None:
+        result = predicate.test(user, obj)
+        if timeout:
+            cache.set(key, result, timeout)
+    if identity_map is not None:
+        identity_map.permissions[key] = result
+    return result
+
+
+class CachedObjectPermissionBackend(ObjectPermissionBackend):
+    """rules' ObjectPermissionBackend, with the predicates evaluated by
+    check_predicate so that user.has_perm() is memoized too."""
+
+    def has_perm(self, user: "User", perm: str, *args, **kwargs) -> bool:
+        if perm not in permissions:
+            return False
+        obj = args[0] if args else kwargs.get("obj")
+        return check_predicate(permissions[perm], user, obj)
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import RequestFactory
+from ninja.errors import HttpError
+
+from gouthelper_ninja.genders.models import Gender
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.utils.etags import check_if_match
+from gouthelper_ninja.utils.etags import get_etag
+from gouthelper_ninja.utils.etags import get_not_modified
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def gender():
+    return PatientFactory().gender
+
+
+class TestGetEtag:
+    def test__strong_and_quoted(self, gender):
+        etag = get_etag(gender)
+        assert etag.startswith('"')
+        assert etag.endswith('"')
+
+    def test__changes_with_modified(self, gender):
+        etag = get_etag(gender)
+        gender.save()
+        assert get_etag(gender) != etag
+
+    def test__patient_changes_with_version(self, gender):
+        patient = gender.patient
+        etag = get_etag(patient)
+        gender.save()
+        assert get_etag(patient) != etag
+
+
+class TestGetNotModified:
+    def test__matches(self, gender):
+        request = RequestFactory().get("/", headers={"If-None-Match": get_etag(gender)})
+        response = get_not_modified(request, gender)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == get_etag(gender)
+
+    def test__weak_comparison(self, gender):
+        request = RequestFactory().get(
+            "/",
+            headers={"If-None-Match": f'"other", W/{get_etag(gender)}'},
+        )
+        assert get_not_modified(request, gender) is not None
+
+    def test__no_match(self, gender):
+        request = RequestFactory().get("/", headers={"If-None-Match": '"other"'})
+        assert get_not_modified(request, gender) is None
+        assert get_not_modified(RequestFactory().get("/"), gender) is None
+
+
+class TestCheckIfMatch:
+    def test__no_header(self, gender):
+        check_if_match(RequestFactory().post("/"), gender)
+
+    def test__matches(self, gender):
+        request = RequestFactory().post("/", headers={"If-Match": get_etag(gender)})
+        check_if_match(request, gender)
+
+    def test__weak_etag_does_not_match(self, gender):
+        request = RequestFactory().post(
+            "/",
+            headers={"If-Match": f"W/{get_etag(gender)}"},
+        )
+        with pytest.raises(HttpError) as exc:
+            check_if_match(request, gender)
+        assert exc.value.status_code == HTTPStatus.PRECONDITION_FAILED
+
+    def test__concurrent_update(self, gender):
+        request = RequestFactory().post("/", headers={"If-Match": get_etag(gender)})
+        # Another request updates the Gender after this one loaded it
+        Gender.objects.get(id=gender.id).save()
+        with pytest.raises(HttpError) as exc:
+            check_if_match(request, gender)
+        assert exc.value.status_code == HTTPStatus.PRECONDITION_FAILED
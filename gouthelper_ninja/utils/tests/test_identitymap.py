@@ -0,0 +1,106 @@
+import pytest
+from django.test import RequestFactory
+from django.urls import reverse
+
+from gouthelper_ninja.medhistorys.choices import MHTypes
+from gouthelper_ninja.medhistorys.models import MedHistory
+from gouthelper_ninja.medhistorys.tests.factories import MedHistoryFactory
+from gouthelper_ninja.users.models import Patient
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+from gouthelper_ninja.utils.identitymap import DuplicateLoadError
+from gouthelper_ninja.utils.identitymap import IdentityMapMiddleware
+from gouthelper_ninja.utils.identitymap import get_identity_map
+from gouthelper_ninja.utils.identitymap import get_patient
+from gouthelper_ninja.utils.identitymap import identity_map_scope
+from gouthelper_ninja.utils.identitymap import remember
+
+pytestmark = pytest.mark.django_db
+
+
+class TestIdentityMap:
+    def test__get_patient_loads_once_per_scope(self, django_assert_num_queries):
+        patient = PatientFactory()
+
+        with identity_map_scope(), django_assert_num_queries(1):
+            loaded = get_patient(patient.id)
+            assert get_patient(str(patient.id)) is loaded
+            assert loaded.patientprofile
+            assert loaded.dateofbirth
+            assert loaded.gender
+            assert loaded.goutdetail
+
+    def test__get_patient_without_scope(self, django_assert_num_queries):
+        patient = PatientFactory()
+
+        assert get_identity_map() is None
+        with django_assert_num_queries(2):
+            assert get_patient(patient.id) is not get_patient(patient.id)
+
+    def test__get_patient_does_not_exist(self):
+        with identity_map_scope(), pytest.raises(Patient.DoesNotExist):
+            get_patient(UserFactory().id)
+
+    def test__duplicate_load_raises(self):
+        patient = PatientFactory()
+
+        with identity_map_scope(strict=True):
+            get_patient(patient.id)
+            with pytest.raises(DuplicateLoadError):
+                Patient.objects.get(id=patient.id)
+
+    def test__duplicate_related_load_raises(self):
+        patient = PatientFactory()
+
+        with identity_map_scope(strict=True):
+            get_patient(patient.id)
+            with pytest.raises(DuplicateLoadError):
+                MedHistory.objects.select_related("patient").get(
+                    patient=patient,
+                    mhtype=MHTypes.GOUT,
+                )
+
+    def test__duplicate_load_logged(self, caplog):
+        patient = PatientFactory()
+
+        with identity_map_scope(check_duplicates=True):
+            get_patient(patient.id)
+            Patient.objects.get(id=patient.id)
+        assert "was loaded more than once" in caplog.text
+
+    def test__duplicate_load_allowed_without_check(self, caplog):
+        patient = PatientFactory()
+
+        with identity_map_scope(check_duplicates=False) as identity_map:
+            get_patient(patient.id)
+            reloaded = remember(Patient.objects.get(id=patient.id))
+            assert identity_map.get(Patient, patient.id) is reloaded
+        assert not caplog.text
+
+    def test__middleware_scopes_map_to_request(self):
+        maps = []
+
+        def get_response(request):
+            maps.append(get_identity_map())
+            return "response"
+
+        middleware = IdentityMapMiddleware(get_response)
+        assert middleware(RequestFactory().get("/")) == "response"
+        assert maps[0] is not None
+        assert get_identity_map() is None
+
+    def test__view_shares_patient_with_rules(self, client, settings):
+        # The middleware's map checks for duplicate loads in DEBUG
+        settings.DEBUG = True
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider, menopause="OMIT")
+        medhistory = MedHistoryFactory(patient=patient, mhtype=MHTypes.DIABETES)
+        client.force_login(provider)
+
+        response = client.get(
+            reverse("medhistorys:update", kwargs={"pk": medhistory.id}),
+        )
+
+        assert response.status_code == 200  # noqa: PLR2004
+        view = response.context["view"]
+        assert view.object.patient is view.patient
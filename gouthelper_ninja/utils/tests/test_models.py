@@ -181,6 +181,48 @@ class TestGoutHelperModel(TestCase):
         with pytest.raises(ValueError, match="Cannot assign"):
             obj.gh_update(data=new_data)
 
+    def test_update_saves_only_changed_fields(self):
+        obj = DummyModel.objects.create(name="Main", value=1)
+
+        with patch.object(obj, "save", wraps=obj.save) as mock_save:
+            obj.gh_update(data=DummySchema(name="Main", value=2))
+            mock_save.assert_called_once_with(update_fields=["value"])
+        obj.refresh_from_db()
+        assert obj.value == 2  # noqa: PLR2004
+
+    def test_update_does_not_query_for_validation(self):
+        obj = DummyModel.objects.create(name="Main", value=1)
+
+        with self.assertNumQueries(1):
+            obj.gh_update(data=DummySchema(name="Main Updated", value=2))
+
+    def test_update_skips_unchanged_related_model(self):
+        related_obj = DummyRelatedModel.objects.create(name="Related")
+        obj = DummyModel.objects.create(name="Main", value=1, related_model=related_obj)
+
+        with patch.object(related_obj, "gh_update") as mock_related_update:
+            obj.gh_update(
+                data=DummySchema(
+                    name="Main Updated",
+                    value=1,
+                    related_model=DummyRelatedSchema(name="Related"),
+                ),
+            )
+            mock_related_update.assert_not_called()
+
+    def test_gh_changes(self):
+        related_obj = DummyRelatedModel.objects.create(name="Related")
+        obj = DummyModel.objects.create(name="Main", value=1, related_model=related_obj)
+
+        assert obj.gh_changes({"name": "Main", "value": 1}) == {}
+        assert obj.gh_changes(
+            {"name": "Main", "value": 2, "related_model": {"name": "Related"}},
+        ) == {"value": 2}
+        assert obj.gh_changes({"related_model": {"name": "New"}}) == {
+            "related_model": {"name": "New"},
+        }
+        assert obj.gh_changes({"related_model": None}) == {"related_model": None}
+
 
 class TestGetStrAttrsMixin(TestCase):
     def test_get_str_attrs_success(self):
@@ -0,0 +1,28 @@
+from datetime import UTC
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from ninja.errors import HttpError
+
+from gouthelper_ninja.utils.pagination import Cursor
+from gouthelper_ninja.utils.pagination import decode_cursor
+from gouthelper_ninja.utils.pagination import encode_cursor
+
+
+class TestCursorEncoding:
+    def test__round_trip(self):
+        cursor = Cursor(
+            created=datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=UTC),
+            id=uuid4(),
+            reverse=True,
+        )
+        encoded = encode_cursor(cursor)
+        assert "=" not in encoded
+        assert decode_cursor(encoded) == cursor
+
+    @pytest.mark.parametrize("value", ["", "not-a-cursor", "W10", "WzEsMiwzXQ"])
+    def test__invalid_cursor_raises_400(self, value):
+        with pytest.raises(HttpError) as exc:
+            decode_cursor(value)
+        assert exc.value.status_code == 400  # noqa: PLR2004
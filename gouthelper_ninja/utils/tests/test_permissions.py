@@ -0,0 +1,153 @@
+import pytest
+import rules
+from django.core.cache import cache
+from django.test import override_settings
+
+from gouthelper_ninja.dateofbirths.models import DateOfBirth
+from gouthelper_ninja.rules import change_object
+from gouthelper_ninja.users.rules import change_patient
+from gouthelper_ninja.users.rules import view_patient
+from gouthelper_ninja.users.tests.factories import PatientFactory
+from gouthelper_ninja.users.tests.factories import UserFactory
+from gouthelper_ninja.utils.identitymap import get_patient
+from gouthelper_ninja.utils.identitymap import identity_map_scope
+from gouthelper_ninja.utils.permissions import check_predicate
+from gouthelper_ninja.utils.permissions import get_object_key
+from gouthelper_ninja.utils.permissions import get_permission_key
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def counted_predicate():
+    calls = []
+
+    @rules.predicate
+    def user_is_obj_provider_counted(user, obj) -> bool:
+        calls.append((user, obj))
+        return obj.patientprofile.provider_id == user.id
+
+    user_is_obj_provider_counted.calls = calls
+    return user_is_obj_provider_counted
+
+
+class TestCheckPredicate:
+    def test__evaluated_once_per_request(self, counted_predicate):
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+
+        with identity_map_scope():
+            assert check_predicate(counted_predicate, provider, patient)
+            assert check_predicate(counted_predicate, provider, patient)
+        assert len(counted_predicate.calls) == 1
+
+    def test__evaluated_every_time_outside_of_request(self, counted_predicate):
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+
+        assert check_predicate(counted_predicate, provider, patient)
+        assert check_predicate(counted_predicate, provider, patient)
+        assert len(counted_predicate.calls) == 2  # noqa: PLR2004
+
+    def test__aliased_predicates_share_results(self):
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+
+        assert get_permission_key(
+            view_patient,
+            provider,
+            patient,
+        ) == get_permission_key(change_patient, provider, patient)
+        assert get_permission_key(
+            change_patient,
+            provider,
+            patient,
+        ) != get_permission_key(change_object, provider, patient)
+
+    def test__saving_profile_invalidates_result(self, counted_predicate):
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+
+        with identity_map_scope():
+            assert check_predicate(counted_predicate, provider, patient)
+            patient.patientprofile.provider = None
+            patient.patientprofile.save()
+            assert not check_predicate(counted_predicate, provider, patient)
+        assert len(counted_predicate.calls) == 2  # noqa: PLR2004
+
+    @override_settings(PERMISSION_CACHE_TIMEOUT=60)
+    def test__shared_cache(self, counted_predicate):
+        cache.clear()
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+
+        with identity_map_scope():
+            assert check_predicate(counted_predicate, provider, patient)
+        with identity_map_scope():
+            assert check_predicate(counted_predicate, provider, patient)
+        assert len(counted_predicate.calls) == 1
+
+
+class TestGetObjectKey:
+    def test__unloaded_patient_is_not_queried(self, django_assert_num_queries):
+        patient = PatientFactory(provider=UserFactory())
+        dateofbirth = DateOfBirth.objects.get(patient=patient)
+
+        with django_assert_num_queries(0):
+            key = get_object_key(dateofbirth)
+        assert key.endswith(str(patient.id))
+
+    def test__saving_patients_profile_changes_key(self):
+        patient = PatientFactory(provider=UserFactory())
+        dateofbirth = DateOfBirth.objects.select_related("patient").get(
+            patient=patient,
+        )
+        key = get_object_key(dateofbirth)
+
+        patient.patientprofile.provider = None
+        patient.patientprofile.save()
+        dateofbirth = DateOfBirth.objects.select_related("patient").get(
+            patient=patient,
+        )
+
+        assert get_object_key(dateofbirth) != key
+
+    @override_settings(PERMISSION_CACHE_TIMEOUT=60)
+    def test__unloaded_patient_is_not_cached_across_requests(self):
+        cache.clear()
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+        dateofbirth = DateOfBirth.objects.get(patient=patient)
+
+        with identity_map_scope():
+            assert check_predicate(change_object, provider, dateofbirth)
+        assert (
+            cache.get(get_permission_key(change_object, provider, dateofbirth)) is None
+        )
+
+
+class TestCachedObjectPermissionBackend:
+    def test__has_perm(self):
+        provider = UserFactory()
+        patient = PatientFactory(provider=provider)
+
+        with identity_map_scope():
+            assert provider.has_perm("users.change_patient", get_patient(patient.id))
+
+    def test__has_perm_is_memoized(self, django_assert_num_queries):
+        provider = UserFactory()
+        patient = PatientFactory(provider=UserFactory())
+
+        with identity_map_scope():
+            patient = get_patient(patient.id)
+            assert not provider.has_perm("users.change_patient", patient)
+            with django_assert_num_queries(0):
+                assert not provider.has_perm("users.change_patient", patient)
+
+    def test__denied_object_perm_returns_false(self):
+        patient = PatientFactory(provider=UserFactory())
+
+        assert not UserFactory().has_perm("users.view_patient", patient)
+
+    def test__unknown_perm(self):
+        assert not UserFactory().has_perm("users.unknown_perm")
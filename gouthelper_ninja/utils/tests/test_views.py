@@ -139,36 +139,35 @@ def test_request_user_returns_request_user():
 
 @pytest.mark.django_db
 def test_patient_kwarg_mixin():
-    class DummyPatient:
-        objects = MagicMock()
-
-    DummyPatient.objects.select_related.return_value = DummyPatient.objects
-    DummyPatient.objects.filter.return_value = DummyPatient.objects
-    DummyPatient.objects.get.return_value = "thepatient"
-
     class View(PatientKwargMixin):
         kwargs = {"patient": 1}
-        # Do not set Patient here; rely on patch
 
-    with patch("gouthelper_ninja.utils.views.Patient", DummyPatient):
+    with patch(
+        "gouthelper_ninja.utils.views.get_patient",
+        return_value="thepatient",
+    ) as mock_get_patient:
         v = View()
         assert v.patient == "thepatient"
+        mock_get_patient.assert_called_once_with(1)
 
 
 @pytest.mark.django_db
 def test_patient_object_mixin():
-    class DummyPatient:
-        objects = MagicMock()
-        objects.select_related.filter.return_value.get.return_value = "thepatient"
-
     class DummyObj:
-        patient = DummyPatient()
+        patient_id = 1
+        patient = None
 
     class View(PatientObjectMixin):
         object = DummyObj()
 
-    v = View()
-    assert v.patient == v.object.patient
+    with patch(
+        "gouthelper_ninja.utils.views.get_patient",
+        return_value="thepatient",
+    ) as mock_get_patient:
+        v = View()
+        assert v.patient == "thepatient"
+        assert v.object.patient == "thepatient"
+        mock_get_patient.assert_called_once_with(1)
 
 
 @pytest.mark.django_db
@@ -15,6 +15,8 @@ from rules.contrib.views import AutoPermissionRequiredMixin
 
 from gouthelper_ninja.users.models import Patient
 from gouthelper_ninja.utils.helpers import get_str_attrs_dict
+from gouthelper_ninja.utils.identitymap import get_patient
+from gouthelper_ninja.utils.identitymap import remember
 from gouthelper_ninja.utils.models import GetStrAttrsMixin
 
 if TYPE_CHECKING:
@@ -236,13 +238,7 @@ class PatientKwargMixin:
         """Returns the Patient whose pk is equal to the patient kwarg,
         which is passed in the URL."""
 
-        return (
-            Patient.objects.select_related(
-                "patientprofile__provider",
-            )
-            .filter(pk=self.kwargs.get("patient"))
-            .get()
-        )
+        return get_patient(self.kwargs.get("patient"))
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         """Overwritten to add the patient to the context data."""
@@ -276,14 +272,20 @@ class PatientObjectMixin(AutoPermissionRequiredMixin):
 
     @cached_property
     def patient(self) -> "User":
-        """Returns the view's object's patient."""
-        return self.object.patient
+        """Returns the view's object's patient, from the request's identity
+        map, and sets it on the object so that the rules predicates use it."""
+        patient = get_patient(self.object.patient_id)
+        self.object.patient = patient
+        return patient
 
     def dispatch(self, request, *args, **kwargs):
         """Overwritten to set the object attribute on the view,
         which is used by the patient cached_property, which is
         then used to check object-level permissions."""
         self.object = self.get_object()
+        # Set the patient on the object before the rules predicates
+        # check the object's patient
+        self.patient  # noqa: B018
         return super().dispatch(request, *args, **kwargs)
 
     def get_object(self, queryset=None) -> Patient | None:
@@ -306,7 +308,7 @@ class PatientObjectMixin(AutoPermissionRequiredMixin):
                 pk=pk,
             )
             try:
-                obj = queryset.get()
+                obj = remember(queryset.get())
             except queryset.model.DoesNotExist as e:
                 raise Http404(
                     _("No %(verbose_name)s found matching the query")